@@ -7,6 +7,12 @@ from app import models
 from app.api import deps
 from app.schemas.response import APIResponse
 from app.utils.response import success_response, error_response
+from app.services.nav_snapshot import nav_snapshot
+from app.services.fund_scores import refresh_fund_scores
+from app.services.nav_scheduler import acquire_refresh_lock, release_refresh_lock
+from app.services.response_cache import api_cache
+from app.services.portfolio_history import take_portfolio_snapshot
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -393,4 +399,74 @@ def update_record(table_name: str, record_id: str, data: Dict[str, Any], db: Ses
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unable to update record"
-        )
\ No newline at end of file
+        )
+
+@router.get("/nav-snapshot", response_model=APIResponse,
+            dependencies=[Depends(deps.get_current_active_superuser)])
+def get_nav_snapshot_stats():
+    """
+    Get the state of the in-process NAV snapshot.
+
+    Returns the number of cached schemes, when the snapshot was loaded,
+    its age in seconds and whether it is past its TTL.
+    """
+    return success_response(data=nav_snapshot.stats(), message="NAV snapshot status retrieved successfully")
+
+
+
+@router.get("/api-cache", response_model=APIResponse,
+            dependencies=[Depends(deps.get_current_active_superuser)])
+def get_api_cache_stats():
+    """
+    Get hit/miss counters and memory/disk usage of the external API response cache.
+    """
+    return success_response(data=api_cache.stats(), message="API cache status retrieved successfully")
+
+
+# Background admin jobs, referenced so they aren't garbage collected mid-run.
+_admin_jobs: set = set()
+
+
+@router.post("/fund-scores/refresh", response_model=APIResponse, status_code=status.HTTP_202_ACCEPTED,
+             responses={409: {"description": "A NAV or score refresh is already running"}},
+             dependencies=[Depends(deps.get_current_active_superuser)])
+async def refresh_recommendation_scores(full: bool = False):
+    """
+    Start recomputing the precomputed recommendation scores in the background.
+
+    Normally this runs automatically after each NAV ingestion. The job takes
+    the same advisory lock as the scheduled refresh, so the two never
+    overlap; if a refresh is already running this returns 409. Only funds
+    with a new NAV are rescored unless `full` is set.
+    """
+    lock_conn = await acquire_refresh_lock()
+    if lock_conn is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A NAV or score refresh is already running")
+
+    async def run():
+        try:
+            stats = await refresh_fund_scores(full=full)
+            logger.info(f"Admin fund score refresh finished: {stats}")
+        except Exception as e:
+            logger.error(f"Admin fund score refresh failed: {e}")
+        finally:
+            await release_refresh_lock(lock_conn)
+
+    task = asyncio.create_task(run(), name="fund-score-refresh")
+    _admin_jobs.add(task)
+    task.add_done_callback(_admin_jobs.discard)
+    return success_response(data={"full": full}, message="Fund score refresh started")
+
+
+@router.post("/portfolio-snapshots", response_model=APIResponse,
+             dependencies=[Depends(deps.get_current_active_superuser)])
+def take_portfolio_snapshots(db: Session = Depends(deps.get_db)):
+    """
+    Snapshot every user's per-asset-type totals now, dated today.
+
+    Normally this runs automatically after the NAV refresh. Re-running it
+    overwrites today's snapshot; past days can't be rewritten because the
+    totals are always the current ones.
+    """
+    stats = take_portfolio_snapshot(db)
+    return success_response(data=stats, message="Portfolio snapshot taken successfully")
@@ -1,93 +1,81 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from app.api import deps
-from app import models
-from app.models.investment import Investment
+from app import crud, models
 from app.utils.response import success_response
 from app.schemas.response import APIResponse
+from app.services.portfolio_xirr import get_portfolio_xirr
+from app.services.user_cache import dashboard_cache
 
 router = APIRouter()
 
-@router.get("/dashboard", response_model=APIResponse)
-def get_analytics_dashboard(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user)
-):
-    """
-    Get comprehensive analytics dashboard data.
-    """
-    # 1. Portfolio Summary
-    total_invested, total_current = db.query(
-        func.sum(Investment.invested_amount),
-        func.sum(Investment.current_value)
-    ).filter(Investment.owner_id == current_user.id).one()
 
-    total_invested = total_invested or 0
-    total_current = total_current or 0
+def build_dashboard(db: Session, owner_id: int) -> dict:
+    # 1. Summary, allocation and performers in one query
+    stats = crud.investment.get_dashboard_stats(db, owner_id=owner_id)
+    total_invested = stats["total_invested"]
+    total_current = stats["total_current"]
     total_returns = total_current - total_invested
     return_percentage = (total_returns / total_invested * 100) if total_invested > 0 else 0
 
     # 2. Asset Allocation
-    breakdown = db.query(
-        Investment.investment_type,
-        func.sum(Investment.current_value).label("total_current")
-    ).filter(Investment.owner_id == current_user.id).group_by(Investment.investment_type).all()
-
-    asset_allocation = []
-    for asset in breakdown:
-        asset_allocation.append({
-            "type": asset.investment_type,
-            "value": asset.total_current or 0,
-            "percentage": (asset.total_current / total_current * 100) if total_current > 0 else 0
-        })
+    asset_allocation = [
+        {
+            "type": asset["type"],
+            "value": asset["value"],
+            "percentage": (asset["value"] / float(total_current) * 100) if total_current > 0 else 0
+        }
+        for asset in stats["allocation"]
+    ]
 
     # 3. Performance (Best/Worst)
-    # Fetch all investments to calculate individual returns
-    investments = db.query(Investment).filter(Investment.owner_id == current_user.id).all()
-    
-    performers = []
-    for inv in investments:
-        if inv.invested_amount and inv.invested_amount > 0:
-            ret_pct = ((inv.current_value - inv.invested_amount) / inv.invested_amount) * 100
-            performers.append({
-                "name": inv.fund_name,
-                "type": inv.investment_type,
-                "return_percentage": ret_pct,
-                "absolute_return": inv.current_value - inv.invested_amount
-            })
-    
-    performers.sort(key=lambda x: x["return_percentage"], reverse=True)
-    
-    best_performer = performers[0] if performers else None
-    worst_performer = performers[-1] if performers else None
-    top_gainers = performers[:3] if performers else []
-    
+    top_gainers = stats["top_gainers"]
+
+    # Money-weighted returns from the transaction ledger
+    xirr = get_portfolio_xirr(db, owner_id)
+
     # 4. Risk & Diversification
-    unique_types = len(set(inv.investment_type for inv in investments))
-    diversification_score = min(100, (unique_types / 6) * 100)
-    
+    diversification_score = min(100, (stats["type_count"] / 6) * 100)
+
     risk_level = "Low"
     if return_percentage > 15:
         risk_level = "High"
     elif return_percentage > 8:
         risk_level = "Moderate"
 
-    return success_response(data={
+    return {
         "summary": {
             "total_invested": total_invested,
             "total_current": total_current,
             "total_returns": total_returns,
-            "return_percentage": return_percentage
+            "return_percentage": return_percentage,
+            "xirr": xirr["portfolio"]
         },
         "asset_allocation": asset_allocation,
+        "xirr_by_type": xirr["by_type"],
         "performance": {
-            "best": best_performer,
-            "worst": worst_performer,
+            "best": top_gainers[0] if top_gainers else None,
+            "worst": stats["worst"],
             "top_gainers": top_gainers
         },
         "insights": {
             "risk_level": risk_level,
             "diversification_score": diversification_score
         }
-    }, message="Analytics dashboard data retrieved successfully")
+    }
+
+
+@router.get("/dashboard", response_model=APIResponse)
+def get_analytics_dashboard(
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user)
+):
+    """
+    Get comprehensive analytics dashboard data.
+
+    Cached per user until one of the user's investments or transactions
+    changes, in every worker: the cache is keyed by the user's data version.
+    """
+    version = crud.user_data_version.get_version(db, owner_id=current_user.id)
+    data = dashboard_cache.get_or_compute(current_user.id, lambda: build_dashboard(db, current_user.id), version=version)
+    return success_response(data=data, message="Analytics dashboard data retrieved successfully")
@@ -1,18 +1,23 @@
 """Portfolio management routes."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import date
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.api import deps
 from app.schemas.response import APIResponse
 from app.utils.response import success_response, error_response
 from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
 import logging
-from sqlalchemy import func
 from app.models.investment import Investment
 from app.models.mutual_fund import MutualFund
-import requests
-from app.utils.fund_classifier import classify_fund
+from app.utils.amfi import extract_scheme_code
+from app.services.nav_ingestion import ingest_nav_records, sync_all_mutual_funds
+from app.services.nav_snapshot import nav_snapshot
+from app.services.portfolio_xirr import get_portfolio_xirr
+from app.services.portfolio_history import portfolio_history
+from app.services.downsampling import DEFAULT_POINTS, RESOLUTIONS
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -33,13 +38,14 @@ def get_funds(db: Session = Depends(deps.get_db), current_user: models.User = De
 @router.post("/funds", response_model=APIResponse, responses={
     400: {"description": "Invalid input data"},
 })
-def add_fund(fund_data: schemas.InvestmentCreate, db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_active_user)):
+async def add_fund(fund_data: schemas.InvestmentCreate, db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_active_user)):
     """
     Add a new investment to the portfolio for the current user.
     """
-    fund = crud.investment.create_with_owner(db, obj_in=fund_data, owner_id=current_user.id)
-    if fund.investment_type == 'mutual_fund':
-        update_mutual_fund_data(db, fund.fund_name)
+    # Load the fund into the catalog first so the investment can reference it by scheme code.
+    if fund_data.investment_type == 'mutual_fund':
+        await update_mutual_fund_data(db, fund_data.fund_name)
+    fund = await run_in_threadpool(crud.investment.create_with_owner, db, obj_in=fund_data, owner_id=current_user.id)
     return success_response(data={"id": fund.id}, message="Investment added successfully")
 
 
@@ -47,11 +53,11 @@ def add_fund(fund_data: schemas.InvestmentCreate, db: Session = Depends(deps.get
     403: {"description": "Not enough permissions"},
     404: {"description": "Investment not found"},
 })
-def update_fund(fund_id: int, fund_data: schemas.InvestmentUpdate, db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_active_user)):
+async def update_fund(fund_id: int, fund_data: schemas.InvestmentUpdate, db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_active_user)):
     """
     Update an existing investment for the current user.
     """
-    fund = crud.investment.get(db, id=fund_id)
+    fund = await run_in_threadpool(crud.investment.get, db, id=fund_id)
     if not fund:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,7 +68,9 @@ def update_fund(fund_id: int, fund_data: schemas.InvestmentUpdate, db: Session =
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    fund = crud.investment.update(db, db_obj=fund, obj_in=fund_data)
+    if fund_data.investment_type == 'mutual_fund' and fund_data.fund_name != fund.fund_name:
+        await update_mutual_fund_data(db, fund_data.fund_name)
+    fund = await run_in_threadpool(crud.investment.update, db, db_obj=fund, obj_in=fund_data)
     return success_response(message="Investment updated successfully")
 
 
@@ -89,6 +97,82 @@ def delete_fund(fund_id: int, db: Session = Depends(deps.get_db), current_user:
     return success_response(message="Investment deleted successfully")
 
 
+def get_owned_investment(db: Session, fund_id: int, owner_id: int) -> Investment:
+    fund = crud.investment.get(db, id=fund_id)
+    if not fund:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Investment not found"
+        )
+    if fund.owner_id != owner_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return fund
+
+
+@router.get("/funds/{fund_id}/transactions", response_model=APIResponse, responses={
+    403: {"description": "Not enough permissions"},
+    404: {"description": "Investment not found"},
+})
+def get_fund_transactions(fund_id: int, db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_active_user)):
+    """
+    List the buy/sell/SIP/dividend transactions of an investment, oldest first.
+    """
+    get_owned_investment(db, fund_id, current_user.id)
+    transactions = crud.investment_transaction.get_multi_by_investment(db, investment_id=fund_id)
+    return success_response(
+        data=[schemas.InvestmentTransaction.model_validate(t) for t in transactions],
+        message="Transactions retrieved successfully"
+    )
+
+
+@router.post("/funds/{fund_id}/transactions", response_model=APIResponse, responses={
+    403: {"description": "Not enough permissions"},
+    404: {"description": "Investment not found"},
+})
+def add_fund_transaction(fund_id: int, transaction_data: schemas.InvestmentTransactionCreate, db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_active_user)):
+    """
+    Record a transaction against an investment for the current user.
+    """
+    fund = get_owned_investment(db, fund_id, current_user.id)
+    transaction = crud.investment_transaction.create_for_investment(db, obj_in=transaction_data, investment=fund)
+    return success_response(data={"id": transaction.id}, message="Transaction added successfully")
+
+
+@router.delete("/funds/{fund_id}/transactions/{transaction_id}", response_model=APIResponse, responses={
+    403: {"description": "Not enough permissions"},
+    404: {"description": "Transaction not found"},
+})
+def delete_fund_transaction(fund_id: int, transaction_id: int, db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_active_user)):
+    """
+    Delete a transaction of an investment for the current user.
+    """
+    get_owned_investment(db, fund_id, current_user.id)
+    transaction = crud.investment_transaction.get(db, id=transaction_id)
+    if not transaction or transaction.investment_id != fund_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    crud.investment_transaction.remove(db, id=transaction_id)
+    return success_response(message="Transaction deleted successfully")
+
+
+@router.get("/xirr", response_model=APIResponse, responses={
+    500: {"description": "Internal server error"}
+})
+def get_portfolio_xirr_breakdown(db: Session = Depends(deps.get_db), current_user: models.User = Depends(deps.get_current_active_user)):
+    """
+    Get XIRR per holding, per asset type and for the whole portfolio from the transaction ledger.
+    """
+    return success_response(
+        data=jsonable_encoder(get_portfolio_xirr(db, current_user.id)),
+        message="Portfolio XIRR retrieved successfully"
+    )
+
+
 @router.get("/summary", response_model=APIResponse, responses={
     500: {"description": "Internal server error"}
 })
@@ -96,13 +180,9 @@ def get_portfolio_summary(db: Session = Depends(deps.get_db), current_user: mode
     """
     Get portfolio summary statistics for the current user.
     """
-    total_invested, total_current = db.query(
-        func.sum(Investment.invested_amount),
-        func.sum(Investment.current_value)
-    ).filter(Investment.owner_id == current_user.id).one()
-
-    total_invested = total_invested or 0
-    total_current = total_current or 0
+    aggregates = crud.portfolio_aggregate.get_by_owner(db, owner_id=current_user.id)
+    total_invested = sum(row.total_invested for row in aggregates)
+    total_current = sum(row.total_current for row in aggregates)
     total_returns = total_current - total_invested
     
     return success_response(
@@ -110,7 +190,8 @@ def get_portfolio_summary(db: Session = Depends(deps.get_db), current_user: mode
             "total_invested": total_invested,
             "total_current": total_current,
             "total_returns": total_returns,
-            "return_percentage": (total_returns / total_invested * 100) if total_invested > 0 else 0
+            "return_percentage": (total_returns / total_invested * 100) if total_invested > 0 else 0,
+            "xirr": get_portfolio_xirr(db, current_user.id)["portfolio"]
         },
         message="Portfolio summary retrieved successfully"
     )
@@ -123,11 +204,7 @@ def get_asset_breakdown(db: Session = Depends(deps.get_db), current_user: models
     """
     Get portfolio breakdown by asset type for the current user.
     """
-    breakdown = db.query(
-        Investment.investment_type,
-        func.sum(Investment.invested_amount).label("total_invested"),
-        func.sum(Investment.current_value).label("total_current")
-    ).filter(Investment.owner_id == current_user.id).group_by(Investment.investment_type).order_by(Investment.investment_type).all()
+    breakdown = crud.portfolio_aggregate.get_by_owner(db, owner_id=current_user.id)
     
     result = []
     for asset in breakdown:
@@ -147,6 +224,31 @@ def get_asset_breakdown(db: Session = Depends(deps.get_db), current_user: models
     return success_response(data=result, message="Asset breakdown retrieved successfully")
 
 
+@router.get("/history", response_model=APIResponse, responses={
+    400: {"description": "Invalid date range or resolution"},
+})
+def get_portfolio_history(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    resolution: str = "lttb",
+    points: int = Query(DEFAULT_POINTS, ge=3, le=5000),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Get the portfolio's invested and current value over time from daily snapshots.
+
+    Defaults to the last year. `resolution` is one of raw, lttb (about
+    `points` points), weekly or monthly.
+    """
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    history = portfolio_history(db, current_user.id, start_date, end_date, resolution, points)
+    return success_response(data=jsonable_encoder(history), message="Portfolio history retrieved successfully")
+
+
 @router.get("/mutual-funds-nav", response_model=APIResponse, responses={
     500: {"description": "Internal server error"}
 })
@@ -158,7 +260,7 @@ def get_user_mutual_funds_nav(db: Session = Depends(deps.get_db), current_user:
         MutualFund
     ).join(
         Investment,
-        Investment.fund_name.like('%(' + MutualFund.scheme_code + ')%')
+        Investment.scheme_code == MutualFund.scheme_code
     ).filter(
         Investment.investment_type == 'mutual_fund'
     ).filter(Investment.owner_id == current_user.id).distinct().order_by(
@@ -170,87 +272,53 @@ def get_user_mutual_funds_nav(db: Session = Depends(deps.get_db), current_user:
     return success_response(data=funds_serialized, message="Mutual funds NAV data retrieved successfully")
 
 
-def update_mutual_fund_data(db: Session, fund_name: str):
+async def update_mutual_fund_data(db: Session, fund_name: str):
     """Update mutual fund NAV data for a specific fund."""
     try:
-        scheme_code = None
-        if '(' in fund_name and ')' in fund_name:
-            code = fund_name.split('(')[-1].split(')')[0]
-            if code.isdigit():
-                scheme_code = code
-        
+        scheme_code = extract_scheme_code(fund_name)
         if not scheme_code:
             return
-        
-        url = "https://www.amfiindia.com/spages/NAVAll.txt"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code != 200:
-            return
-        
-        lines = response.text.strip().split('\n')
-        
-        for line in lines[1:]:
-            if ';' in line:
-                parts = line.split(';')
-                if len(parts) >= 6 and parts[0] == scheme_code:
-                    try:
-                        scheme_name = parts[3]
-                        category, sub_category = classify_fund(scheme_name)
-                        fund_in = schemas.MutualFundCreate(
-                            scheme_code=parts[0],
-                            scheme_name=scheme_name,
-                            nav=float(parts[4]),
-                            nav_date=parts[5],
-                            fund_house=parts[2] if len(parts) > 2 else "Unknown",
-                            category=category,
-                            sub_category=sub_category
-                        )
-                        crud.mutual_fund.upsert(db, obj_in=fund_in)
-                        break
-                    except ValueError:
-                        continue
+
+        record = await nav_snapshot.get(scheme_code)
+        if record:
+            await run_in_threadpool(ingest_nav_records, db, [record], source="add_fund")
     except Exception as e:
         logger.error(f"Update mutual fund data error: {str(e)}")
 
 @router.post("/sync-mutual-funds", response_model=APIResponse)
-def sync_mutual_funds(db: Session = Depends(deps.get_db)):
-    """Manually sync mutual fund data for common scheme codes."""
+async def sync_mutual_funds(db: Session = Depends(deps.get_db)):
+    """Sync NAV data for every scheme in the AMFI feed."""
     try:
-        scheme_codes = ['145137', '147946', '120503', '119551', '120716', '118989', '119226']
-        
-        url = "https://www.amfiindia.com/spages/NAVAll.txt"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code != 200:
-            return success_response(data=[], message="Unable to fetch NAV data from AMFI")
-        
-        lines = response.text.strip().split('\n')
-        updated_count = 0
-        
-        for line in lines[1:]:
-            if ';' in line:
-                parts = line.split(';')
-                if len(parts) >= 6 and parts[0] in scheme_codes:
-                    try:
-                        scheme_name = parts[3]
-                        category, sub_category = classify_fund(scheme_name)
-                        fund_in = schemas.MutualFundCreate(
-                            scheme_code=parts[0],
-                            scheme_name=scheme_name,
-                            nav=float(parts[4]),
-                            nav_date=parts[5],
-                            fund_house=parts[2] if len(parts) > 2 else "Unknown",
-                            category=category,
-                            sub_category=sub_category
-                        )
-                        crud.mutual_fund.upsert(db, obj_in=fund_in)
-                        updated_count += 1
-                    except ValueError:
-                        continue
-        
-        return success_response(data={"updated_count": updated_count}, message=f"Synced {updated_count} mutual funds")
-        
+        stats = await sync_all_mutual_funds(db)
+        synced = stats["inserted"] + stats["updated"]
+        return success_response(data=stats, message=f"Synced {synced} mutual funds")
     except Exception as e:
         logger.error(f"Sync mutual funds error: {str(e)}")
-        return success_response(data={"updated_count": 0}, message="Failed to sync mutual funds")
+        return success_response(
+            data={"inserted": 0, "updated": 0, "unchanged": 0},
+            message="Failed to sync mutual funds"
+        )
+
+
+@router.get("/nav-changes", response_model=APIResponse)
+def get_nav_changes(
+    since: int = 0,
+    limit: int = Query(1000, ge=1, le=10000),
+    scheme_code: Optional[List[str]] = Query(None),
+    db: Session = Depends(deps.get_db),
+):
+    """
+    Get NAV changes journaled after the `since` cursor, oldest first.
+
+    Pass the returned `next_cursor` as `since` to continue from where the
+    previous call stopped.
+    """
+    changes = crud.nav_change.get_since(db, cursor=since, limit=limit, scheme_codes=scheme_code)
+    return success_response(
+        data={
+            "changes": [schemas.NavChange.model_validate(change) for change in changes],
+            "next_cursor": changes[-1].id if changes else since,
+            "has_more": len(changes) == limit,
+        },
+        message=f"Retrieved {len(changes)} NAV changes"
+    )
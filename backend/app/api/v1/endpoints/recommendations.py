@@ -1,142 +1,91 @@
-from typing import List
-from fastapi import APIRouter
-from app.schemas.models import MutualFund
-from app.schemas.response import APIResponse
-
-router = APIRouter()
-
-import requests
-import concurrent.futures
-from datetime import datetime, timedelta
+import asyncio
+import logging
 from typing import List, Dict, Optional
-from fastapi import APIRouter, HTTPException
-from app.schemas.models import MutualFund
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.core.config import settings
+from app import crud
+from app.crud.crud_fund_score import DEFAULT_RANKING_METRIC, RANKING_METRICS
+from app.schemas.models import FundComparisonRequest, FundScore
 from app.schemas.response import APIResponse
+from app.db.session import SessionLocal
+from app.services.downsampling import DEFAULT_POINTS, RESOLUTIONS, to_chart_rows
+from app.services.fund_comparison import ComparisonError, compare_series, load_nav_series
+from app.services.fund_scores import get_fund_risk_metrics
+from app.services.fund_search import fund_search_index
+from app.services.http_client import market_data_client
+from app.services.response_cache import api_cache
+from app.services.nav_history import get_fund_payload, is_fresh
+from app.services.nav_series import NavSeries
+from app.utils.http_cache import etag_matches, nav_etag, not_modified, set_nav_cache_headers
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# Selected Universe of Funds to Analyze
-FUNDS_UNIVERSE = {
-    "Large Cap": [
-        "122639", # Parag Parikh Flexi Cap Fund - Direct Plan - Growth (Flexi, but large bias)
-        "106235", # Nippon india large cap Direct Growth
-    ],
-    "Mid Cap": [
-        "140228", # Edelweiss Mid Cap Fund - Direct Plan - Growth
-        "150584", # WhiteOak Capital Mid Cap Fund Direct Plan Growth
-    ],
-    "Small Cap": [
-        "147946", # Bandhan Small Cap Fund - Direct Plan - Growth
-        "145137", # Invesco India Small Cap Fund - Direct Plan - Growth
-    ],
-    "Hybrid": [
-        "120334", # ICIC Pru Multi Asset Fund - Direct Plan - Growth
-        "152056", # DSP Multi Asset Allocation Fund Direct Growth
-    ]
-    ,
-    "MultiCap": [
-        "101161", # Nippon india Multi cap Fund Direct Growth
-        "149185", # Kotak Multicap Fund - Direct Growth
-    ]
-    ,
-    "Debt": [
-        "120754", # ICICI Prudential Short Term Fund - Direct Plan - Growth Option
-        "119016", # HDFC Short Term debt Fund - Direct Plan - Growth Option
-    ]
-}
-
-def fetch_fund_data(scheme_code: str) -> Optional[Dict]:
+def load_fund_houses() -> Optional[Dict[str, str]]:
+    """{scheme_code: fund_house} from the AMFI catalog, or None if the database is unavailable."""
+    db = SessionLocal()
     try:
-        response = requests.get(f"https://api.mfapi.in/mf/{scheme_code}", timeout=10)
-        if response.status_code == 200:
-            return response.json()
-    except Exception as e:
-        print(f"Error fetching {scheme_code}: {e}")
-    return None
+        return crud.mutual_fund.get_fund_houses(db)
+    except SQLAlchemyError as e:
+        logger.warning(f"Fund houses unavailable, indexing without facets: {e}")
+        return None
+    finally:
+        db.close()
 
-def parse_date(date_str: str) -> datetime:
-    return datetime.strptime(date_str, "%d-%m-%Y")
+# The last fund-house mapping loaded; kept while the database is unavailable.
+_fund_houses: Dict[str, str] = {}
 
-def calculate_rolling_returns(nav_data: List[Dict], years: int = 3) -> float:
-    """
-    Calculate average rolling returns for the given period (in years).
+def index_funds(funds: List[Dict]) -> bool:
     """
-    if not nav_data:
-        return 0.0
-    
-    # Sort data by date ascending
-    sorted_data = sorted(nav_data, key=lambda x: parse_date(x['date']))
-    
-    # Convert to a more accessible format: [(date, nav)]
-    history = []
-    for entry in sorted_data:
-        try:
-            d = parse_date(entry['date'])
-            n = float(entry['nav'])
-            history.append((d, n))
-        except ValueError:
-            continue
-            
-    if not history:
-        return 0.0
-
-    window_days = years * 365
-    rolling_returns = []
-    
-    # Create a lookup for faster access or just iterate
-    # Since data is daily, we can look back approx index. 
-    # But dates might have gaps.
-    
-    # Efficient approach: Two pointers
-    start_idx = 0
-    for end_idx in range(len(history)):
-        end_date, end_nav = history[end_idx]
-        
-        # Move start_idx until we find a date >= end_date - window_days
-        target_date = end_date - timedelta(days=window_days)
-        
-        while start_idx < end_idx and history[start_idx][0] < target_date:
-            start_idx += 1
-            
-        # Check if we found a valid start date (within a small margin, e.g., 7 days)
-        if start_idx < end_idx:
-            start_date, start_nav = history[start_idx]
-            days_diff = (end_date - start_date).days
-            
-            # Allow some tolerance (e.g., +/- 7 days from target window)
-            if abs(days_diff - window_days) <= 7 and start_nav > 0 and days_diff > 0:
-                # Calculate CAGR
-                cagr = ((end_nav / start_nav) ** (365 / days_diff)) - 1
-                rolling_returns.append(cagr * 100)
-
-    if not rolling_returns:
-        return 0.0
-        
-    return sum(rolling_returns) / len(rolling_returns)
-
-# Cache for all funds list
-ALL_FUNDS_CACHE = []
-LAST_CACHE_UPDATE = None
+    Sync the search index with a downloaded scheme list; fund houses come from the AMFI catalog.
 
-def get_all_funds_list() -> List[Dict]:
-    global ALL_FUNDS_CACHE, LAST_CACHE_UPDATE
-    
-    # Refresh cache if empty or older than 24 hours
-    if not ALL_FUNDS_CACHE or (LAST_CACHE_UPDATE and datetime.now() - LAST_CACHE_UPDATE > timedelta(hours=24)):
-        try:
-            response = requests.get("https://api.mfapi.in/mf", timeout=10)
-            if response.status_code == 200:
-                ALL_FUNDS_CACHE = response.json()
-                LAST_CACHE_UPDATE = datetime.now()
-        except Exception as e:
-            print(f"Error fetching all funds list: {e}")
+    Search must not fail with the database, so if the fund houses can't be
+    loaded the previous ones (initially none) are used. Returns whether the
+    fund houses were loaded.
+    """
+    global _fund_houses
+
+    fund_houses = load_fund_houses()
+    if fund_houses is not None:
+        _fund_houses = fund_houses
+    fund_search_index.update(funds, _fund_houses)
+    return fund_houses is not None
+
+# The list object last fed to the search index; a new object means the cache refreshed.
+_indexed_funds: Optional[List[Dict]] = None
+# Set when the last indexing went without fund houses, so the next call retries them.
+_facets_pending = False
+_index_lock = asyncio.Lock()
+
+async def get_all_funds_list() -> List[Dict]:
+    global _indexed_funds, _facets_pending
+
+    funds = await api_cache.get_or_load(
+        "mfapi:list",
+        lambda: market_data_client.get_json(settings.MFAPI_BASE_URL),
+        ttl=settings.MFAPI_LIST_TTL_HOURS * 3600,
+        stale_ttl=settings.MFAPI_LIST_STALE_HOURS * 3600,
+    ) or []
+    if funds is not _indexed_funds or _facets_pending:
+        async with _index_lock:
+            if funds is not _indexed_funds or _facets_pending:
+                _facets_pending = not await run_in_threadpool(index_funds, funds)
+                _indexed_funds = funds
             
-    return ALL_FUNDS_CACHE
+    return funds
 
 @router.get("/search", response_model=APIResponse[Dict])
-def search_mutual_funds(query: str, limit: int = 20, offset: int = 0):
+async def search_mutual_funds(query: str, limit: int = 20, offset: int = 0, fund_house: Optional[str] = None):
     """
     Search for mutual funds by name with pagination.
+
+    Matches every query word as a prefix of a name word, falling back to
+    typo-tolerant matching, ranks Direct/Growth plans first and returns
+    fund-house facet counts. `fund_house` narrows results to one house.
     """
     if len(query) < 3:
         return APIResponse(
@@ -145,17 +94,12 @@ def search_mutual_funds(query: str, limit: int = 20, offset: int = 0):
             data={"results": [], "total": 0, "has_more": False}
         )
         
-    all_funds = get_all_funds_list()
+    await get_all_funds_list()
     
-    query = query.lower()
-    # Filter funds
-    matching_funds = [
-        fund for fund in all_funds 
-        if query in fund.get('schemeName', '').lower()
-    ]
+    matches = fund_search_index.search(query, limit=limit, offset=offset, fund_house=fund_house)
     
-    total_matches = len(matching_funds)
-    paginated_results = matching_funds[offset : offset + limit]
+    total_matches = matches["total"]
+    paginated_results = matches["results"]
     has_more = (offset + limit) < total_matches
     
     return APIResponse(
@@ -164,191 +108,136 @@ def search_mutual_funds(query: str, limit: int = 20, offset: int = 0):
         data={
             "results": paginated_results,
             "total": total_matches,
-            "has_more": has_more
+            "has_more": has_more,
+            "facets": {"fund_house": matches["facets"]}
         }
     )
 
-@router.get("/mutual-funds", response_model=APIResponse[List[MutualFund]])
-def get_recommended_mutual_funds():
+@router.get("/mutual-funds", response_model=APIResponse[List[FundScore]])
+def get_recommended_mutual_funds(
+    category: Optional[str] = None,
+    top_n: int = Query(5, ge=1, le=100),
+    metric: str = DEFAULT_RANKING_METRIC,
+    db: Session = Depends(deps.get_db),
+):
     """
-    Get a list of recommended mutual funds based on 3-year rolling returns.
+    Get the best funds per category by a ranking metric.
+
+    `category` is a broad category (Equity, Debt) or a sub-category
+    (Large Cap, Mid Cap, ...); without it the top `top_n` of every
+    sub-category are returned. Scores are precomputed into fund_scores after
+    each NAV ingestion, so this never waits on an external source.
     """
-    recommendations = []
-    
-    # Flatten the list of codes to fetch
-    all_codes = []
-    for codes in FUNDS_UNIVERSE.values():
-        all_codes.extend(codes)
-        
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_code = {executor.submit(fetch_fund_data, code): code for code in all_codes}
-        for future in concurrent.futures.as_completed(future_to_code):
-            data = future.result()
-            if data:
-                results.append(data)
-    
-    # Process results
-    processed_funds = []
-    
-    for data in results:
-        if not data or 'meta' not in data or 'data' not in data:
-            continue
-            
-        meta = data['meta']
-        nav_data = data['data']
-        
-        # Determine category from our universe mapping
-        scheme_code = meta['scheme_code']
-        category = "Equity" # Default
-        sub_category = "Other"
-        
-        for cat, codes in FUNDS_UNIVERSE.items():
-            if str(scheme_code) in codes:
-                sub_category = cat
-                break
-        
-        # Calculate Rolling Returns (3 Years)
-        rolling_return = calculate_rolling_returns(nav_data, years=3)
-        
-        # Get latest NAV
-        latest_nav = float(nav_data[0]['nav']) if nav_data else 0.0
-        latest_date = nav_data[0]['date'] if nav_data else ""
-        
-        processed_funds.append({
-            "scheme_code": str(scheme_code),
-            "scheme_name": meta['scheme_name'],
-            "nav": latest_nav,
-            "nav_date": latest_date,
-            "fund_house": meta['fund_house'],
-            "category": "Equity",
-            "sub_category": sub_category,
-            "rolling_return": rolling_return
-        })
+    if metric not in RANKING_METRICS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown metric '{metric}'. Choose one of: {', '.join(RANKING_METRICS)}"
+        )
 
-    # Sort by rolling return descending
-    processed_funds.sort(key=lambda x: x['rolling_return'], reverse=True)
-    
-    # Convert to model
-    for fund in processed_funds:
-        recommendations.append(MutualFund(
-            scheme_code=fund['scheme_code'],
-            scheme_name=fund['scheme_name'],
-            nav=fund['nav'],
-            nav_date=fund['nav_date'],
-            fund_house=fund['fund_house'],
-            category=fund['category'],
-            sub_category=fund['sub_category'],
-            rolling_return=fund['rolling_return']
-        ))
+    recommendations = []
+    for score, value in crud.fund_score.get_top(db, category=category, top_n=top_n, metric=metric):
+        fund = FundScore.model_validate(score)
+        fund.score = value
+        recommendations.append(fund)
 
     return APIResponse(
         success=True,
-        message="Recommended mutual funds based on 3-year rolling returns",
+        message=f"Recommended mutual funds ranked by {metric}",
         data=recommendations
     )
 
+@router.post("/compare", response_model=APIResponse[Dict])
+async def compare_mutual_funds(request: FundComparisonRequest, db: Session = Depends(deps.get_db)):
+    """
+    Compare several funds over a date range in one response.
+
+    Returns NAV series aligned on common dates and rebased to 100, the
+    correlation matrix of daily returns, and trailing/rolling statistics
+    for each fund.
+    """
+    if request.start_date and request.end_date and request.start_date > request.end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+
+    scheme_codes = list(dict.fromkeys(request.scheme_codes))
+    loaded = await asyncio.gather(*(load_nav_series(code) for code in scheme_codes))
+    missing = [code for code, (_, series) in zip(scheme_codes, loaded) if series is None]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Mutual funds not found: {', '.join(missing)}")
+
+    names = await run_in_threadpool(crud.mutual_fund.get_names, db, scheme_codes=scheme_codes)
+    names.update({code: name for code, (name, _) in zip(scheme_codes, loaded) if name})
+    try:
+        comparison = await run_in_threadpool(
+            compare_series, [series for _, series in loaded], names,
+            request.start_date, request.end_date, request.resolution, request.points
+        )
+    except ComparisonError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return APIResponse(
+        success=True,
+        message=f"Compared {len(scheme_codes)} mutual funds",
+        data=comparison
+    )
+
 @router.get("/mutual-funds/{scheme_code}", response_model=APIResponse[Dict])
-def get_mutual_fund_details(scheme_code: str):
+async def get_mutual_fund_details(
+    scheme_code: str,
+    response: Response,
+    resolution: str = "raw",
+    points: int = Query(DEFAULT_POINTS, ge=3, le=5000),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(deps.get_db),
+):
     """
     Get full details for a specific mutual fund.
+
+    `resolution` thins the NAV history for charts: "lttb" keeps `points`
+    shape-preserving points, "weekly"/"monthly" return one OHLC row per
+    period. Returns and risk metrics always use the full daily history.
+
+    The response carries a strong ETag for the scheme's latest NAV date,
+    resolution and point count, and is cacheable until the next NAV is
+    due. A matching If-None-Match gets a 304 after a single index lookup,
+    without loading the history.
     """
-    data = fetch_fund_data(scheme_code)
-    if not data:
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+
+    variant = (resolution, points)
+    latest = await run_in_threadpool(crud.nav_history.get_latest_date, db, scheme_code=scheme_code)
+    if is_fresh(latest) and etag_matches(if_none_match, nav_etag(scheme_code, latest, variant)):
+        return not_modified(scheme_code, latest, variant)
+
+    payload = await get_fund_payload(db, scheme_code)
+    if not payload:
         raise HTTPException(status_code=404, detail="Mutual fund not found")
         
     # Calculate returns for different periods
-    nav_data = data.get('data', [])
-    returns = {
-        "1W": calculate_trailing_return(nav_data, "1W"),
-        "1M": calculate_trailing_return(nav_data, "1M"),
-        "3M": calculate_trailing_return(nav_data, "3M"),
-        "6M": calculate_trailing_return(nav_data, "6M"),
-        "1Y": calculate_trailing_return(nav_data, "1Y"),
-        "3Y": calculate_trailing_return(nav_data, "3Y"),
-        "5Y": calculate_trailing_return(nav_data, "5Y"),
-        "Inception": calculate_trailing_return(nav_data, "Inception")
+    series = await run_in_threadpool(NavSeries.from_mfapi, payload.get('data', []), scheme_code)
+    if series.latest_date:
+        if etag_matches(if_none_match, nav_etag(scheme_code, series.latest_date, variant)):
+            return not_modified(scheme_code, series.latest_date, variant)
+        set_nav_cache_headers(response, scheme_code, series.latest_date, variant)
+
+    # The payload may be the response cache's own object, so build a new dict rather than editing it.
+    data = {
+        **payload,
+        'meta': {
+            **payload.get('meta', {}),
+            # Mock Expense Ratio as it's not available in this API
+            # In a real app, this would come from a database or premium API
+            'expense_ratio': "0.75%",
+        },
+        'returns': series.trailing_returns(),
+        'risk_metrics': await get_fund_risk_metrics(db, series),
+        'resolution': resolution,
     }
-    
-    # Add calculated returns to the response
-    data['returns'] = returns
-    
-    # Mock Expense Ratio as it's not available in this API
-    # In a real app, this would come from a database or premium API
-    data['meta']['expense_ratio'] = "0.75%" 
+    if resolution != "raw":
+        data['data'] = await run_in_threadpool(to_chart_rows, series.days, series.navs, resolution, points)
     
     return APIResponse(
         success=True,
         message="Mutual fund details retrieved successfully",
         data=data
     )
-
-def calculate_trailing_return(nav_data: List[Dict], period: str) -> Optional[float]:
-    if not nav_data:
-        return None
-    
-    # Sort data: latest last
-    sorted_data = sorted(nav_data, key=lambda x: parse_date(x['date']))
-    
-    if not sorted_data:
-        return None
-
-    latest_entry = sorted_data[-1]
-    latest_date = parse_date(latest_entry['date'])
-    latest_nav = float(latest_entry['nav'])
-    
-    target_date = latest_date
-    
-    if period == '1W':
-        target_date = latest_date - timedelta(weeks=1)
-    elif period == '1M':
-        target_date = latest_date - timedelta(days=30)
-    elif period == '3M':
-        target_date = latest_date - timedelta(days=90)
-    elif period == '6M':
-        target_date = latest_date - timedelta(days=180)
-    elif period == '1Y':
-        target_date = latest_date - timedelta(days=365)
-    elif period == '3Y':
-        target_date = latest_date - timedelta(days=365*3)
-    elif period == '5Y':
-        target_date = latest_date - timedelta(days=365*5)
-    elif period == 'Inception':
-        target_date = parse_date(sorted_data[0]['date'])
-    
-    # Check if we have enough history
-    first_date = parse_date(sorted_data[0]['date'])
-    if period != 'Inception' and (latest_date - first_date).days < (latest_date - target_date).days:
-        return None
-
-    # Find closest entry to target_date
-    # We want the entry closest to target_date but preferably <= target_date to capture the full period
-    closest_entry = None
-    min_diff = float('inf')
-    
-    for entry in sorted_data:
-        d = parse_date(entry['date'])
-        # We look for date close to target_date. 
-        # Simple approach: find absolute closest
-        diff = abs((d - target_date).days)
-        if diff < min_diff:
-            min_diff = diff
-            closest_entry = entry
-            
-    if closest_entry:
-        start_nav = float(closest_entry['nav'])
-        start_date = parse_date(closest_entry['date'])
-        
-        days_diff = (latest_date - start_date).days
-        if days_diff == 0: return 0.0
-        
-        # For periods > 1 year, use CAGR. For < 1 year, use Absolute Return.
-        # Standard practice: 1Y and above is CAGR.
-        if days_diff >= 365:
-             # CAGR
-             return (((latest_nav / start_nav) ** (365 / days_diff)) - 1) * 100
-        else:
-             # Absolute Return
-             return ((latest_nav - start_nav) / start_nav) * 100
-             
-    return None
@@ -1,8 +1,12 @@
+import asyncio
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app import models, schemas
+from app import crud, models, schemas
 from app.api import deps
+from app.services.fund_comparison import load_nav_series
+from app.services.sip_backtest import backtest_sip, rolling_sip_backtest
 
 router = APIRouter()
 
@@ -45,6 +49,66 @@ def create_sip_estimation(
     db.refresh(sip)
     return {"success": True, "data": sip, "message": "SIP estimation saved successfully"}
 
+async def _load_backtest_series(db: Session, scheme_codes: List[str]):
+    """Load NAV series for the requested schemes; 404 if any is unknown."""
+    loaded = await asyncio.gather(*(load_nav_series(code) for code in scheme_codes))
+    missing = [code for code, (_, series) in zip(scheme_codes, loaded) if series is None]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Mutual funds not found: {', '.join(missing)}")
+    names = await run_in_threadpool(crud.mutual_fund.get_names, db, scheme_codes=scheme_codes)
+    names.update({code: name for code, (name, _) in zip(scheme_codes, loaded) if name})
+    return [series for _, series in loaded], names
+
+@router.post("/backtest", response_model=schemas.APIResponse[List[dict]])
+async def backtest_sip_history(
+    *,
+    db: Session = Depends(deps.get_db),
+    backtest_in: schemas.SIPBacktestRequest,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Backtest a SIP into each scheme over its actual NAV history.
+    """
+    if backtest_in.start_date and backtest_in.end_date and backtest_in.start_date > backtest_in.end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    scheme_codes = list(dict.fromkeys(backtest_in.scheme_codes))
+    series, names = await _load_backtest_series(db, scheme_codes)
+
+    def run():
+        return [
+            backtest_sip(
+                s, backtest_in.amount, backtest_in.frequency,
+                backtest_in.start_date, backtest_in.end_date, backtest_in.sip_day
+            )
+            for s in series
+        ]
+
+    results = []
+    for code, result in zip(scheme_codes, await run_in_threadpool(run)):
+        if result is None:
+            raise HTTPException(status_code=400, detail=f"No NAV history for {code} in the requested period")
+        results.append({**result, "scheme_name": names.get(code)})
+    return {"success": True, "data": results, "message": "SIP backtest completed successfully"}
+
+@router.post("/backtest/rolling", response_model=schemas.APIResponse[List[dict]])
+async def rolling_backtest_sip_history(
+    *,
+    db: Session = Depends(deps.get_db),
+    backtest_in: schemas.SIPRollingBacktestRequest,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Backtest a SIP of a fixed duration from every possible start month.
+    """
+    scheme_codes = list(dict.fromkeys(backtest_in.scheme_codes))
+    series, names = await _load_backtest_series(db, scheme_codes)
+    results = await run_in_threadpool(
+        rolling_sip_backtest, series, backtest_in.amount, backtest_in.duration_years,
+        backtest_in.frequency, backtest_in.sip_day, backtest_in.include_points
+    )
+    data = [{**result, "scheme_name": names.get(code)} for code, result in zip(scheme_codes, results)]
+    return {"success": True, "data": data, "message": "Rolling SIP backtest completed successfully"}
+
 @router.delete("/{id}", response_model=schemas.APIResponse)
 def delete_sip_estimation(
     *,
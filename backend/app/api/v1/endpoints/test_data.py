@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from app import crud
 from app.api import deps
 from app.models.user import User
 from app.models.investment import Investment
@@ -11,6 +12,8 @@ from app.models.swp_estimation import SWPEstimation
 from app.models.budget import Budget, BudgetItem
 from app.models.goal import Goal
 from app.utils.fund_classifier import classify_fund
+from app.utils.amfi import parse_amfi_date
+from app.services.user_cache import dashboard_cache
 import random
 from datetime import date, timedelta
 
@@ -100,7 +103,7 @@ def populate_test_data(
             scheme_code=mf["scheme_code"],
             scheme_name=mf["scheme_name"],
             nav=mf["nav"],
-            nav_date="01-Dec-2024",
+            nav_date=parse_amfi_date("01-Dec-2024"),
             fund_house=mf["fund_house"],
             category=category,
             sub_category=sub_category
@@ -204,6 +207,9 @@ def populate_test_data(
         )
         db.add(goal)
 
+    crud.portfolio_aggregate.rebuild(db, owner_id=current_user.id)
+    crud.user_data_version.bump(db, owner_ids=[current_user.id])
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     
     return success_response(message="Test data populated successfully")
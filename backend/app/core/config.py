@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import validator
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Wealth Management API"
@@ -23,6 +23,56 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: str
     FIRST_SUPERUSER_PASSWORD: str
 
+    # Market data
+    AMFI_NAV_URL: str = "https://www.amfiindia.com/spages/NAVAll.txt"
+    NAV_SYNC_BATCH_SIZE: int = 1000
+    MFAPI_BASE_URL: str = "https://api.mfapi.in/mf"
+    # Stored history younger than this is served without asking mfapi (covers weekends/holidays)
+    NAV_HISTORY_MAX_AGE_DAYS: int = 3
+    NAV_SNAPSHOT_TTL_MINUTES: int = 30
+    # AMFI's daily deadline for publishing NAVs (hour, India time); drives Cache-Control
+    NAV_PUBLISH_HOUR_IST: int = 23
+    # Memory-mapped columnar NAV history, rebuilt by build_nav_archive.py
+    NAV_ARCHIVE_PATH: str = "data/nav_archive.bin"
+
+    # Fund risk metrics
+    RISK_FREE_RATE: float = 0.065
+    RISK_LOOKBACK_YEARS: int = 3
+    # UTI Nifty 50 Index Fund - Direct Growth stands in for the market benchmark
+    RISK_BENCHMARK_SCHEME_CODE: str = "120716"
+
+    # Category-wide fund ranking (nightly, after NAV ingestion)
+    FUND_RANKING_CATEGORIES: List[str] = ["Equity"]
+    FUND_RANKING_WORKERS: int = 4
+    FUND_RANKING_CHUNK_SIZE: int = 64
+
+    # Outbound HTTP (shared market data client)
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 50
+    HTTP_PER_HOST_CONCURRENCY: int = 8
+    HTTP_RETRIES: int = 2
+    HTTP_BACKOFF_SECONDS: float = 0.5
+    HTTP_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    HTTP_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Cache for external API responses (memory LRU + on-disk store shared by workers)
+    HTTP_CACHE_DIR: str = "data/http_cache"
+    HTTP_CACHE_MEMORY_MB: int = 64
+    HTTP_CACHE_DISK_MB: int = 512
+    MFAPI_LIST_TTL_HOURS: int = 24
+    MFAPI_LIST_STALE_HOURS: int = 24 * 7
+    MFAPI_DETAIL_TTL_MINUTES: int = 360
+    MFAPI_DETAIL_STALE_HOURS: int = 24
+
+    # Per-user analytics dashboard cache, invalidated on investment changes
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300
+    DASHBOARD_CACHE_MAX_USERS: int = 10000
+
+    # Background NAV refresh
+    NAV_REFRESH_ENABLED: bool = True
+    NAV_REFRESH_INTERVAL_MINUTES: int = 60
+    NAV_REFRESH_JITTER_SECONDS: int = 300
+
     @validator("DATABASE_URL", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: dict[str, any]) -> any:
         if isinstance(v, str):
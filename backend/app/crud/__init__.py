@@ -1,6 +1,14 @@
 from .crud_user import user
 from .crud_investment import investment
+from .crud_investment_transaction import investment_transaction
+from .crud_portfolio_aggregate import portfolio_aggregate
+from .crud_portfolio_snapshot import portfolio_snapshot
+from .crud_user_data_version import user_data_version
 from .crud_mutual_fund import mutual_fund
+from .crud_nav_history import nav_history
+from .crud_nav_change import nav_change
+from .crud_fund_score import fund_score
+from .crud_fund_risk_metrics import fund_risk_metrics
 from .crud_goal import goal
 from .crud_risk_profile import risk_profile
 from .crud_retirement import retirement
@@ -0,0 +1,35 @@
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.fund_risk_metrics import FundRiskMetrics
+from app.schemas.models import FundRiskMetrics as FundRiskMetricsSchema
+
+
+class CRUDFundRiskMetrics(CRUDBase[FundRiskMetrics, FundRiskMetricsSchema, FundRiskMetricsSchema]):
+    def get_by_scheme(
+        self, db: Session, *, scheme_code: str, as_of: Optional[date] = None
+    ) -> Optional[FundRiskMetrics]:
+        """Stored metrics for a scheme, or None if missing or computed from the fund's NAVs before `as_of`."""
+        query = db.query(self.model).filter(self.model.scheme_code == scheme_code)
+        if as_of:
+            query = query.filter(self.model.nav_date >= as_of)
+        return query.first()
+
+    def upsert_many(self, db: Session, *, rows: List[Dict]) -> int:
+        """Insert or refresh metrics rows. Does not commit."""
+        if not rows:
+            return 0
+        stmt = insert(self.model).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['scheme_code'],
+            set_={**{column: stmt.excluded[column] for column in rows[0] if column != 'scheme_code'},
+                  "computed_at": func.now()},
+        ))
+        return len(rows)
+
+fund_risk_metrics = CRUDFundRiskMetrics(FundRiskMetrics)
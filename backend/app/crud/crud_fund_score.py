@@ -0,0 +1,118 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, or_, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.fund_risk_metrics import FundRiskMetrics
+from app.models.fund_score import FundScore
+from app.schemas.models import FundScore as FundScoreSchema
+
+# Ranking metric -> (SQL expression, higher is better)
+RANKING_METRICS = {
+    "rolling_1y": (FundScore.rolling_returns["1Y"]["mean"].as_float(), True),
+    "rolling_3y": (FundScore.rolling_return, True),
+    "rolling_5y": (FundScore.rolling_returns["5Y"]["mean"].as_float(), True),
+    "rolling_7y": (FundScore.rolling_returns["7Y"]["mean"].as_float(), True),
+    # Share of 3-year windows that beat 8% a year
+    "consistency": (FundScore.rolling_returns["3Y"]["share_above"]["8"].as_float(), True),
+    "return_1y": (FundScore.trailing_returns["1Y"].as_float(), True),
+    "return_3y": (FundScore.trailing_returns["3Y"].as_float(), True),
+    "return_5y": (FundScore.trailing_returns["5Y"].as_float(), True),
+    "sharpe_ratio": (FundRiskMetrics.sharpe_ratio, True),
+    "sortino_ratio": (FundRiskMetrics.sortino_ratio, True),
+    "alpha": (FundRiskMetrics.alpha, True),
+    "volatility": (FundRiskMetrics.volatility, False),
+    # Drawdowns are negative, so the shallowest is the largest
+    "max_drawdown": (FundRiskMetrics.max_drawdown, True),
+}
+DEFAULT_RANKING_METRIC = "rolling_3y"
+
+
+class CRUDFundScore(CRUDBase[FundScore, FundScoreSchema, FundScoreSchema]):
+    def get_ranked(
+        self, db: Session, *, sub_category: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[FundScore]:
+        query = db.query(self.model)
+        if sub_category:
+            query = query.filter(self.model.sub_category == sub_category)
+        query = query.order_by(self.model.rank)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def get_top(
+        self,
+        db: Session,
+        *,
+        category: Optional[str] = None,
+        top_n: int = 5,
+        metric: str = DEFAULT_RANKING_METRIC,
+    ) -> List[Tuple[FundScore, Optional[float]]]:
+        """
+        Best `top_n` funds by `metric`, per sub-category unless one is requested.
+
+        `category` matches either the broad category (Equity, Debt) or a
+        sub-category (Large Cap, ...). Returns (score row, metric value) pairs.
+        """
+        expression, higher_is_better = RANKING_METRICS[metric]
+        ordering = (expression.desc() if higher_is_better else expression.asc()).nulls_last()
+        position = func.row_number().over(partition_by=self.model.sub_category, order_by=ordering)
+
+        ranked = (
+            db.query(self.model.scheme_code, expression.label("value"), position.label("position"))
+            .outerjoin(FundRiskMetrics, FundRiskMetrics.scheme_code == self.model.scheme_code)
+        )
+        if category:
+            ranked = ranked.filter(or_(self.model.category == category, self.model.sub_category == category))
+        ranked = ranked.subquery()
+
+        rows = (
+            db.query(self.model, ranked.c.value)
+            .join(ranked, ranked.c.scheme_code == self.model.scheme_code)
+            .filter(ranked.c.position <= top_n)
+            .order_by(self.model.sub_category, ranked.c.position)
+            .all()
+        )
+        return [(score, value) for score, value in rows]
+
+    def get_nav_dates(self, db: Session) -> Dict[str, date]:
+        """{scheme_code: nav_date} of the stored scores, used to skip unchanged funds."""
+        return {code: nav_date for code, nav_date in db.query(self.model.scheme_code, self.model.nav_date)}
+
+    def upsert_many(self, db: Session, *, rows: List[Dict]) -> int:
+        """Insert or refresh score rows. Does not commit."""
+        if rows:
+            stmt = insert(self.model).values(rows)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=['scheme_code'],
+                set_={column: stmt.excluded[column] for column in rows[0] if column != 'scheme_code'},
+            ))
+        return len(rows)
+
+    def delete_except(self, db: Session, *, scheme_codes: List[str]) -> int:
+        """Drop scores for schemes that left the universe. Does not commit."""
+        if not scheme_codes:
+            # An empty universe means nothing loaded, not that every fund left.
+            return 0
+        result = db.execute(delete(self.model).where(self.model.scheme_code.notin_(scheme_codes)))
+        return result.rowcount
+
+    def rerank(self, db: Session) -> None:
+        """Recompute overall and per-category ranks by 3-year rolling return in one UPDATE. Does not commit."""
+        db.execute(text("""
+            UPDATE fund_scores f
+            SET rank = r.rank, category_rank = r.category_rank
+            FROM (
+                SELECT scheme_code,
+                       ROW_NUMBER() OVER (ORDER BY rolling_return DESC NULLS LAST, scheme_code) AS rank,
+                       ROW_NUMBER() OVER (PARTITION BY sub_category
+                                          ORDER BY rolling_return DESC NULLS LAST, scheme_code) AS category_rank
+                FROM fund_scores
+            ) r
+            WHERE f.scheme_code = r.scheme_code
+        """))
+
+fund_score = CRUDFundScore(FundScore)
@@ -1,15 +1,116 @@
 from app.crud.base import CRUDBase
+from app.crud.crud_portfolio_aggregate import portfolio_aggregate
+from app.crud.crud_user_data_version import user_data_version
 from app.models.investment import Investment
+from app.models.mutual_fund import MutualFund
 from app.schemas.models import InvestmentCreate, InvestmentUpdate
+from app.services.user_cache import dashboard_cache
+from app.utils.amfi import extract_scheme_code
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional, Union
+
+# Whole analytics dashboard in one round trip. Totals and allocation come from
+# portfolio_aggregates; only the best/worst ranking reads individual holdings.
+# Holdings with nothing invested have no return percentage and are not ranked.
+DASHBOARD_SQL = text("""
+    WITH holdings AS (
+        SELECT fund_name, investment_type, invested_amount, current_value,
+               current_value - invested_amount AS absolute_return,
+               CASE WHEN invested_amount > 0
+                    THEN (current_value - invested_amount) / invested_amount * 100
+               END AS return_percentage
+        FROM investments
+        WHERE owner_id = :owner_id
+    ),
+    aggregates AS (
+        SELECT investment_type, holding_count, total_invested, total_current
+        FROM portfolio_aggregates
+        WHERE owner_id = :owner_id
+    ),
+    summary AS (
+        SELECT COALESCE(SUM(total_invested), 0) AS total_invested,
+               COALESCE(SUM(total_current), 0) AS total_current,
+               COUNT(*) AS type_count
+        FROM aggregates
+    ),
+    allocation AS (
+        SELECT investment_type, total_current AS value
+        FROM aggregates
+    ),
+    ranked AS (
+        SELECT fund_name, investment_type, return_percentage, absolute_return,
+               ROW_NUMBER() OVER (ORDER BY return_percentage DESC, fund_name) AS best_rank,
+               ROW_NUMBER() OVER (ORDER BY return_percentage ASC, fund_name) AS worst_rank
+        FROM holdings
+        WHERE return_percentage IS NOT NULL
+    )
+    SELECT s.total_invested, s.total_current, s.type_count,
+           (SELECT COALESCE(json_agg(json_build_object('type', investment_type, 'value', value)
+                                     ORDER BY investment_type), '[]'::json)
+            FROM allocation) AS allocation,
+           (SELECT COALESCE(json_agg(json_build_object('name', fund_name, 'type', investment_type,
+                                                       'return_percentage', return_percentage,
+                                                       'absolute_return', absolute_return)
+                                     ORDER BY best_rank), '[]'::json)
+            FROM ranked WHERE best_rank <= 3) AS top_gainers,
+           (SELECT json_build_object('name', fund_name, 'type', investment_type,
+                                     'return_percentage', return_percentage,
+                                     'absolute_return', absolute_return)
+            FROM ranked WHERE worst_rank = 1) AS worst
+    FROM summary s
+""")
 
 class CRUDInvestment(CRUDBase[Investment, InvestmentCreate, InvestmentUpdate]):
+    def resolve_scheme_code(self, db: Session, *, investment_type: str, fund_name: str) -> Optional[str]:
+        """Return the scheme code embedded in a mutual fund name if that fund is in the catalog."""
+        if investment_type != 'mutual_fund':
+            return None
+        code = extract_scheme_code(fund_name)
+        if code and db.query(MutualFund.scheme_code).filter(MutualFund.scheme_code == code).first():
+            return code
+        return None
+
     def create_with_owner(self, db: Session, *, obj_in: InvestmentCreate, owner_id: int) -> Investment:
-        db_obj = Investment(**obj_in.dict(), owner_id=owner_id)
+        scheme_code = self.resolve_scheme_code(db, investment_type=obj_in.investment_type, fund_name=obj_in.fund_name)
+        db_obj = Investment(**obj_in.dict(), owner_id=owner_id, scheme_code=scheme_code)
         db.add(db_obj)
+        portfolio_aggregate.add_holding(db, holding=db_obj)
+        user_data_version.bump(db, owner_ids=[owner_id])
         db.commit()
         db.refresh(db_obj)
+        dashboard_cache.invalidate(owner_id)
+        return db_obj
+
+    def update(
+        self, db: Session, *, db_obj: Investment, obj_in: Union[InvestmentUpdate, Dict[str, Any]]
+    ) -> Investment:
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+        investment_type = update_data.get("investment_type", db_obj.investment_type)
+        fund_name = update_data.get("fund_name", db_obj.fund_name)
+        db_obj.scheme_code = self.resolve_scheme_code(db, investment_type=investment_type, fund_name=fund_name)
+        # Move the holding's old figures out of the aggregates and the new ones in; committed with the update.
+        portfolio_aggregate.add_holding(db, holding=db_obj, sign=-1)
+        portfolio_aggregate.apply_delta(
+            db,
+            owner_id=db_obj.owner_id,
+            investment_type=investment_type,
+            holdings=1,
+            invested=update_data.get("invested_amount", db_obj.invested_amount),
+            current=update_data.get("current_value", db_obj.current_value),
+        )
+        user_data_version.bump(db, owner_ids=[db_obj.owner_id])
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        dashboard_cache.invalidate(db_obj.owner_id)
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> Investment:
+        db_obj = db.query(self.model).get(id)
+        portfolio_aggregate.add_holding(db, holding=db_obj, sign=-1)
+        user_data_version.bump(db, owner_ids=[db_obj.owner_id])
+        db.delete(db_obj)
+        db.commit()
+        dashboard_cache.invalidate(db_obj.owner_id)
         return db_obj
 
     def get_multi_by_owner(
@@ -23,4 +124,8 @@ class CRUDInvestment(CRUDBase[Investment, InvestmentCreate, InvestmentUpdate]):
             .all()
         )
 
+    def get_dashboard_stats(self, db: Session, *, owner_id: int) -> Dict[str, Any]:
+        """Summary totals, allocation, top gainers and worst performer from a single statement."""
+        return dict(db.execute(DASHBOARD_SQL, {"owner_id": owner_id}).mappings().one())
+
 investment = CRUDInvestment(Investment)
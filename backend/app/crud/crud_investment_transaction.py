@@ -0,0 +1,54 @@
+from typing import List
+
+from sqlalchemy import case
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.crud.crud_user_data_version import user_data_version
+from app.models.investment import Investment
+from app.models.investment_transaction import InvestmentTransaction
+from app.schemas.models import InvestmentTransactionCreate
+from app.services.user_cache import dashboard_cache
+
+# Transaction types that take money out of the investor's pocket.
+OUTFLOW_TYPES = ("buy", "sip")
+
+
+class CRUDInvestmentTransaction(CRUDBase[InvestmentTransaction, InvestmentTransactionCreate, InvestmentTransactionCreate]):
+    def create_for_investment(
+        self, db: Session, *, obj_in: InvestmentTransactionCreate, investment: Investment
+    ) -> InvestmentTransaction:
+        db_obj = InvestmentTransaction(**obj_in.model_dump(), investment_id=investment.id, owner_id=investment.owner_id)
+        db.add(db_obj)
+        user_data_version.bump(db, owner_ids=[investment.owner_id])
+        db.commit()
+        db.refresh(db_obj)
+        dashboard_cache.invalidate(db_obj.owner_id)
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> InvestmentTransaction:
+        db_obj = db.query(self.model).get(id)
+        user_data_version.bump(db, owner_ids=[db_obj.owner_id])
+        db.delete(db_obj)
+        db.commit()
+        dashboard_cache.invalidate(db_obj.owner_id)
+        return db_obj
+
+    def get_multi_by_investment(self, db: Session, *, investment_id: int) -> List[InvestmentTransaction]:
+        return (
+            db.query(self.model)
+            .filter(self.model.investment_id == investment_id)
+            .order_by(self.model.transaction_date, self.model.id)
+            .all()
+        )
+
+    def get_cash_flows_by_owner(self, db: Session, *, owner_id: int) -> List[tuple]:
+        """(investment_id, transaction_date, signed amount) for every transaction of the owner; outflows are negative."""
+        signed = case((self.model.transaction_type.in_(OUTFLOW_TYPES), -self.model.amount), else_=self.model.amount)
+        return (
+            db.query(self.model.investment_id, self.model.transaction_date, signed)
+            .filter(self.model.owner_id == owner_id)
+            .all()
+        )
+
+investment_transaction = CRUDInvestmentTransaction(InvestmentTransaction)
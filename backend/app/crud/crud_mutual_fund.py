@@ -1,9 +1,16 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
 from app.crud.base import CRUDBase
 from app.models.mutual_fund import MutualFund
 from app.schemas.models import MutualFundCreate
+from sqlalchemy import func, literal_column, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 
+UPSERT_COLUMNS = ("scheme_name", "nav", "nav_date", "fund_house", "category", "sub_category")
+
+
 class CRUDMutualFund(CRUDBase[MutualFund, MutualFundCreate, MutualFundCreate]):
     def upsert(self, db: Session, *, obj_in: MutualFundCreate) -> MutualFund:
         insert_stmt = insert(self.model).values(obj_in.dict())
@@ -15,4 +22,65 @@ class CRUDMutualFund(CRUDBase[MutualFund, MutualFundCreate, MutualFundCreate]):
         db.commit()
         return db.query(self.model).get(obj_in.scheme_code)
 
+    def get_multi_filtered(
+        self, db: Session, *, stale_since: Optional[date] = None
+    ) -> List[MutualFund]:
+        """List funds, optionally only those whose NAV is older than `stale_since` (index range scan)."""
+        query = db.query(self.model)
+        if stale_since:
+            query = query.filter(self.model.nav_date < stale_since).order_by(self.model.nav_date)
+        return query.all()
+
+    def get_navs(self, db: Session, *, scheme_codes: List[str]) -> Dict[str, Tuple]:
+        """Return {scheme_code: (nav, nav_date)} for the given funds."""
+        rows = (
+            db.query(self.model.scheme_code, self.model.nav, self.model.nav_date)
+            .filter(self.model.scheme_code.in_(scheme_codes))
+            .all()
+        )
+        return {code: (nav, nav_date) for code, nav, nav_date in rows}
+
+    def get_ranking_universe(self, db: Session, *, categories: List[str]) -> List[MutualFund]:
+        """Growth-option schemes in the given categories; IDCW NAVs drop on payouts and would skew returns."""
+        return (
+            db.query(self.model)
+            .filter(self.model.category.in_(categories), self.model.scheme_name.ilike('%growth%'))
+            .order_by(self.model.scheme_code)
+            .all()
+        )
+
+    def get_names(self, db: Session, *, scheme_codes: List[str]) -> Dict[str, str]:
+        rows = db.query(self.model.scheme_code, self.model.scheme_name).filter(self.model.scheme_code.in_(scheme_codes))
+        return {code: name for code, name in rows}
+
+    def get_fund_houses(self, db: Session) -> Dict[str, str]:
+        """Return {scheme_code: fund_house} for every fund with a known fund house."""
+        rows = db.query(self.model.scheme_code, self.model.fund_house).filter(self.model.fund_house.isnot(None))
+        return {code: fund_house for code, fund_house in rows}
+
+    def bulk_upsert(self, db: Session, *, rows: List[Dict]) -> Tuple[List[str], List[str]]:
+        """
+        Upsert many funds with a single multi-row INSERT ... ON CONFLICT.
+
+        Rows whose values are identical to the stored ones are left untouched.
+        Does not commit, so callers can wrap several batches in one transaction.
+        Returns the scheme codes that were (inserted, updated).
+        """
+        if not rows:
+            return [], []
+        insert_stmt = insert(self.model).values(rows)
+        excluded = insert_stmt.excluded
+        do_update_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=['scheme_code'],
+            set_={**{column: excluded[column] for column in UPSERT_COLUMNS}, "updated_at": func.now()},
+            where=or_(*[
+                self.model.__table__.c[column].is_distinct_from(excluded[column])
+                for column in UPSERT_COLUMNS
+            ])
+        ).returning(self.model.scheme_code, literal_column("(xmax = 0)").label("inserted"))
+        inserted, updated = [], []
+        for scheme_code, was_inserted in db.execute(do_update_stmt):
+            (inserted if was_inserted else updated).append(scheme_code)
+        return inserted, updated
+
 mutual_fund = CRUDMutualFund(MutualFund)
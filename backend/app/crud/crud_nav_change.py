@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.nav_change import NavChange, NavIngestionRun
+from app.schemas.models import NavChange as NavChangeSchema
+
+# Transaction-level advisory lock that serializes journal-writing runs. It
+# is separate from the scheduler's session-level refresh lock, which is held
+# on another connection for the whole refresh and would block its own run.
+NAV_JOURNAL_LOCK_KEY = 72_110_002
+
+
+class CRUDNavChange(CRUDBase[NavChange, NavChangeSchema, NavChangeSchema]):
+    def start_run(self, db: Session, *, source: str) -> NavIngestionRun:
+        """
+        Create the run row inside the caller's transaction. Does not commit.
+
+        Waits for any other run to commit first and holds the journal lock
+        until this transaction ends, so journal ids are handed out in commit
+        order and a reader paging by `id > cursor` never skips a row that
+        commits late.
+        """
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": NAV_JOURNAL_LOCK_KEY})
+        run = NavIngestionRun(source=source)
+        db.add(run)
+        db.flush()
+        return run
+
+    def finish_run(self, db: Session, *, run: NavIngestionRun, inserted: int, updated: int, unchanged: int) -> None:
+        run.inserted = inserted
+        run.updated = updated
+        run.unchanged = unchanged
+        run.finished_at = datetime.now(timezone.utc)
+
+    def record(self, db: Session, *, run_id: int, changes: List[Dict]) -> None:
+        """Journal a batch of NAV changes with one multi-row INSERT. Does not commit."""
+        if changes:
+            db.execute(insert(NavChange), [{**change, "run_id": run_id} for change in changes])
+
+    def get_since(
+        self, db: Session, *, cursor: int = 0, limit: int = 1000, scheme_codes: Optional[List[str]] = None
+    ) -> List[NavChange]:
+        """Journal rows after `cursor`; safe to page by id because runs are serialized in `start_run`."""
+        query = db.query(NavChange).filter(NavChange.id > cursor)
+        if scheme_codes:
+            query = query.filter(NavChange.scheme_code.in_(scheme_codes))
+        return query.order_by(NavChange.id).limit(limit).all()
+
+nav_change = CRUDNavChange(NavChange)
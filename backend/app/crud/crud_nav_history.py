@@ -0,0 +1,87 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.mutual_fund_nav_history import MutualFundNavHistory
+from app.schemas.models import MutualFundNavPoint
+
+INSERT_CHUNK_SIZE = 5000
+
+
+class CRUDNavHistory(CRUDBase[MutualFundNavHistory, MutualFundNavPoint, MutualFundNavPoint]):
+    def get_latest_date(self, db: Session, *, scheme_code: str) -> Optional[date]:
+        return (
+            db.query(func.max(MutualFundNavHistory.nav_date))
+            .filter(MutualFundNavHistory.scheme_code == scheme_code)
+            .scalar()
+        )
+
+    def get_latest_dates(self, db: Session, *, scheme_codes: List[str]) -> Dict[str, date]:
+        rows = (
+            db.query(MutualFundNavHistory.scheme_code, func.max(MutualFundNavHistory.nav_date))
+            .filter(MutualFundNavHistory.scheme_code.in_(scheme_codes))
+            .group_by(MutualFundNavHistory.scheme_code)
+            .all()
+        )
+        return {code: latest for code, latest in rows}
+
+    def get_summaries(self, db: Session) -> Dict[str, Tuple[date, int]]:
+        """{scheme_code: (latest date, point count)} over positive NAVs, used to spot changed histories."""
+        rows = (
+            db.query(MutualFundNavHistory.scheme_code, func.max(MutualFundNavHistory.nav_date), func.count())
+            .filter(MutualFundNavHistory.nav > 0)
+            .group_by(MutualFundNavHistory.scheme_code)
+            .all()
+        )
+        return {code: (latest, count) for code, latest, count in rows}
+
+    def get_range(
+        self, db: Session, *, scheme_code: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> List[Tuple[date, float]]:
+        """Return (nav_date, nav) pairs in ascending date order using the primary key index."""
+        query = db.query(MutualFundNavHistory.nav_date, MutualFundNavHistory.nav).filter(
+            MutualFundNavHistory.scheme_code == scheme_code
+        )
+        if start:
+            query = query.filter(MutualFundNavHistory.nav_date >= start)
+        if end:
+            query = query.filter(MutualFundNavHistory.nav_date <= end)
+        return [(nav_date, float(nav)) for nav_date, nav in query.order_by(MutualFundNavHistory.nav_date)]
+
+    def append(self, db: Session, *, scheme_code: str, points: Iterable[Tuple[date, float]]) -> int:
+        """
+        Insert points dated after the latest stored NAV for the scheme.
+
+        Does not commit. Returns the number of rows written.
+        """
+        latest = self.get_latest_date(db, scheme_code=scheme_code)
+        rows = [
+            {"scheme_code": scheme_code, "nav_date": nav_date, "nav": nav}
+            for nav_date, nav in points
+            if latest is None or nav_date > latest
+        ]
+        for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+            stmt = insert(self.model).values(rows[i:i + INSERT_CHUNK_SIZE])
+            db.execute(stmt.on_conflict_do_nothing(index_elements=['scheme_code', 'nav_date']))
+        return len(rows)
+
+    def upsert_points(self, db: Session, *, rows: List[Dict]) -> int:
+        """
+        Insert or correct {scheme_code, nav_date, nav} rows, skipping identical ones.
+
+        Does not commit. Returns the number of rows passed in.
+        """
+        for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+            stmt = insert(self.model).values(rows[i:i + INSERT_CHUNK_SIZE])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=['scheme_code', 'nav_date'],
+                set_={"nav": stmt.excluded.nav},
+                where=self.model.nav.is_distinct_from(stmt.excluded.nav),
+            ))
+        return len(rows)
+
+nav_history = CRUDNavHistory(MutualFundNavHistory)
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.investment import Investment
+from app.models.portfolio_aggregate import PortfolioAggregate
+from app.schemas.models import AssetBreakdown
+
+# Per-(owner, type) totals straight from investments; the source of truth for rebuilds and checks.
+COMPUTED_SQL = """
+    SELECT owner_id, investment_type,
+           COUNT(*) AS holding_count,
+           COALESCE(SUM(invested_amount), 0) AS total_invested,
+           COALESCE(SUM(current_value), 0) AS total_current
+    FROM investments
+    WHERE owner_id IS NOT NULL AND investment_type IS NOT NULL {owner_filter}
+    GROUP BY owner_id, investment_type
+"""
+
+
+class CRUDPortfolioAggregate(CRUDBase[PortfolioAggregate, AssetBreakdown, AssetBreakdown]):
+    def get_by_owner(self, db: Session, *, owner_id: int) -> List[PortfolioAggregate]:
+        return (
+            db.query(self.model)
+            .filter(self.model.owner_id == owner_id)
+            .order_by(self.model.investment_type)
+            .all()
+        )
+
+    def apply_delta(
+        self,
+        db: Session,
+        *,
+        owner_id: int,
+        investment_type: str,
+        holdings: int = 0,
+        invested: Optional[Decimal] = None,
+        current: Optional[Decimal] = None,
+    ) -> None:
+        """Add signed deltas to one (owner, type) row, creating or dropping it as needed. Does not commit."""
+        stmt = insert(self.model).values(
+            owner_id=owner_id,
+            investment_type=investment_type,
+            holding_count=holdings,
+            total_invested=invested or 0,
+            total_current=current or 0,
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['owner_id', 'investment_type'],
+            set_={
+                "holding_count": self.model.holding_count + stmt.excluded.holding_count,
+                "total_invested": self.model.total_invested + stmt.excluded.total_invested,
+                "total_current": self.model.total_current + stmt.excluded.total_current,
+                "updated_at": func.now(),
+            },
+        ))
+        if holdings < 0:
+            db.execute(delete(self.model).where(and_(
+                self.model.owner_id == owner_id,
+                self.model.investment_type == investment_type,
+                self.model.holding_count <= 0,
+            )))
+
+    def add_holding(self, db: Session, *, holding: Investment, sign: int = 1) -> None:
+        """Count a holding in (sign=1) or out of (sign=-1) its owner's totals. Does not commit."""
+        self.apply_delta(
+            db,
+            owner_id=holding.owner_id,
+            investment_type=holding.investment_type,
+            holdings=sign,
+            invested=sign * (holding.invested_amount or 0),
+            current=sign * (holding.current_value or 0),
+        )
+
+    def rebuild(self, db: Session, *, owner_id: Optional[int] = None) -> int:
+        """Recompute the table (or one owner's rows) from investments with one INSERT ... SELECT. Does not commit."""
+        params = {}
+        owner_filter = ""
+        purge = delete(self.model)
+        if owner_id is not None:
+            params["owner_id"] = owner_id
+            owner_filter = "AND owner_id = :owner_id"
+            purge = purge.where(self.model.owner_id == owner_id)
+        db.execute(purge)
+        result = db.execute(text(f"""
+            INSERT INTO portfolio_aggregates (owner_id, investment_type, holding_count, total_invested, total_current)
+            {COMPUTED_SQL.format(owner_filter=owner_filter)}
+        """), params)
+        return result.rowcount
+
+    def find_drift(self, db: Session, *, owner_id: Optional[int] = None) -> List[Dict]:
+        """Rows where the stored totals disagree with investments, including missing or orphaned rows."""
+        params = {}
+        owner_filter = ""
+        if owner_id is not None:
+            params["owner_id"] = owner_id
+            owner_filter = "AND owner_id = :owner_id"
+        rows = db.execute(text(f"""
+            WITH computed AS ({COMPUTED_SQL.format(owner_filter=owner_filter)}),
+            stored AS (
+                SELECT owner_id, investment_type, holding_count, total_invested, total_current
+                FROM portfolio_aggregates
+                WHERE TRUE {owner_filter}
+            )
+            SELECT COALESCE(c.owner_id, s.owner_id) AS owner_id,
+                   COALESCE(c.investment_type, s.investment_type) AS investment_type,
+                   s.holding_count AS stored_count, c.holding_count AS actual_count,
+                   s.total_invested AS stored_invested, c.total_invested AS actual_invested,
+                   s.total_current AS stored_current, c.total_current AS actual_current
+            FROM computed c
+            FULL OUTER JOIN stored s
+              ON s.owner_id = c.owner_id AND s.investment_type = c.investment_type
+            WHERE s.holding_count IS DISTINCT FROM c.holding_count
+               OR s.total_invested IS DISTINCT FROM c.total_invested
+               OR s.total_current IS DISTINCT FROM c.total_current
+            ORDER BY 1, 2
+        """), params)
+        return [dict(row) for row in rows.mappings()]
+
+portfolio_aggregate = CRUDPortfolioAggregate(PortfolioAggregate)
@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.schemas.models import AssetBreakdown
+
+
+def month_bounds(day: date):
+    start = day.replace(day=1)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+
+class CRUDPortfolioSnapshot(CRUDBase[PortfolioSnapshot, AssetBreakdown, AssetBreakdown]):
+    def ensure_partition(self, db: Session, *, day: date) -> str:
+        """Create the monthly partition holding `day` if it is missing. Does not commit."""
+        start, end = month_bounds(day)
+        name = f"portfolio_snapshots_{start:%Y_%m}"
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF portfolio_snapshots "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        return name
+
+    def snapshot_all(self, db: Session, *, snapshot_date: date) -> int:
+        """
+        Copy every user's current per-type totals into `snapshot_date` with one
+        INSERT ... SELECT from portfolio_aggregates. The totals are current, so
+        callers pass today's date (see services.portfolio_history). Re-running
+        today overwrites it, and types a user no longer holds are removed.
+        Does not commit.
+        """
+        self.ensure_partition(db, day=snapshot_date)
+        db.execute(
+            text("""
+                DELETE FROM portfolio_snapshots s
+                WHERE s.snapshot_date = :snapshot_date
+                  AND NOT EXISTS (
+                      SELECT 1 FROM portfolio_aggregates a
+                      WHERE a.owner_id = s.owner_id AND a.investment_type = s.investment_type
+                  )
+            """),
+            {"snapshot_date": snapshot_date},
+        )
+        result = db.execute(
+            text("""
+                INSERT INTO portfolio_snapshots
+                    (owner_id, snapshot_date, investment_type, holding_count, total_invested, total_current)
+                SELECT owner_id, :snapshot_date, investment_type, holding_count, total_invested, total_current
+                FROM portfolio_aggregates
+                ON CONFLICT (owner_id, snapshot_date, investment_type) DO UPDATE
+                SET holding_count = EXCLUDED.holding_count,
+                    total_invested = EXCLUDED.total_invested,
+                    total_current = EXCLUDED.total_current,
+                    created_at = now()
+            """),
+            {"snapshot_date": snapshot_date},
+        )
+        return result.rowcount
+
+    def get_range(
+        self, db: Session, *, owner_id: int, start: date, end: date
+    ) -> List[PortfolioSnapshot]:
+        return (
+            db.query(self.model)
+            .filter(
+                self.model.owner_id == owner_id,
+                self.model.snapshot_date >= start,
+                self.model.snapshot_date <= end,
+            )
+            .order_by(self.model.snapshot_date, self.model.investment_type)
+            .all()
+        )
+
+    def exists_for(self, db: Session, *, snapshot_date: date) -> bool:
+        """
+        Whether any snapshot row is dated `snapshot_date`.
+
+        The equality filter prunes the scan to that day's monthly partition,
+        where the snapshot_date index answers it with a single probe.
+        """
+        return db.query(
+            db.query(self.model.owner_id).filter(self.model.snapshot_date == snapshot_date).exists()
+        ).scalar()
+
+portfolio_snapshot = CRUDPortfolioSnapshot(PortfolioSnapshot)
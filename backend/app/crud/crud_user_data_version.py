@@ -0,0 +1,29 @@
+from typing import Iterable
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.user_data_version import UserDataVersion
+from app.schemas.models import UserDataVersion as UserDataVersionSchema
+
+
+class CRUDUserDataVersion(CRUDBase[UserDataVersion, UserDataVersionSchema, UserDataVersionSchema]):
+    def get_version(self, db: Session, *, owner_id: int) -> int:
+        """Current data version of a user; 0 if their data never changed."""
+        version = db.query(self.model.version).filter(self.model.owner_id == owner_id).scalar()
+        return version or 0
+
+    def bump(self, db: Session, *, owner_ids: Iterable[int]) -> None:
+        """Increment the version of every owner in one upsert. Does not commit."""
+        rows = [{"owner_id": owner_id, "version": 1} for owner_id in sorted(set(owner_ids)) if owner_id is not None]
+        if not rows:
+            return
+        stmt = insert(self.model).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['owner_id'],
+            set_={"version": self.model.version + 1, "updated_at": func.now()},
+        ))
+
+user_data_version = CRUDUserDataVersion(UserDataVersion)
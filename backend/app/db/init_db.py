@@ -19,3 +19,8 @@ def init_db(db: Session) -> None:
             role="admin",
         )
         user = crud.user.create(db, obj_in=user_in)
+
+    # Seed portfolio_aggregates the first time it exists alongside older investments.
+    if not db.query(crud.portfolio_aggregate.model).first() and db.query(crud.investment.model.id).first():
+        crud.portfolio_aggregate.rebuild(db)
+        db.commit()
@@ -8,6 +8,8 @@ from app.core.config import settings
 from app.db.base import Base
 from app.db.session import engine, SessionLocal
 from app.db.init_db import init_db
+from app.services.http_client import market_data_client
+from app.services.nav_scheduler import NavRefreshScheduler
 
 Base.metadata.create_all(bind=engine)
 
@@ -16,6 +18,19 @@ db = SessionLocal()
 init_db(db)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler = NavRefreshScheduler(
+        interval_seconds=settings.NAV_REFRESH_INTERVAL_MINUTES * 60,
+        jitter_seconds=settings.NAV_REFRESH_JITTER_SECONDS,
+    )
+    if settings.NAV_REFRESH_ENABLED:
+        scheduler.start()
+    yield
+    await scheduler.stop()
+    await market_data_client.aclose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
@@ -23,6 +38,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -1,7 +1,16 @@
 from .user import User
 
 from .investment import Investment
+from .investment_transaction import InvestmentTransaction
+from .portfolio_aggregate import PortfolioAggregate
+from .portfolio_snapshot import PortfolioSnapshot
+from .user_data_version import UserDataVersion
 from .mutual_fund import MutualFund
+from .mutual_fund_nav_history import MutualFundNavHistory
+from .nav_feed_state import NavFeedState
+from .nav_change import NavIngestionRun, NavChange
+from .fund_score import FundScore
+from .fund_risk_metrics import FundRiskMetrics
 from .sip_estimation import SIPEstimation
 from .goal import Goal
 from .goal_investment import GoalInvestment
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Float, Date, DateTime
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class FundRiskMetrics(Base):
+    """Risk metrics over the trailing lookback window, computed from NAV history."""
+    __tablename__ = "fund_risk_metrics"
+
+    scheme_code = Column(String, primary_key=True)
+    benchmark_code = Column(String, nullable=True)
+    risk_free_rate = Column(Float, nullable=False)
+    period_start = Column(Date, nullable=False)
+    period_end = Column(Date, nullable=False)
+    # The fund's own latest NAV date; period_end follows the benchmark's calendar and can lag it.
+    nav_date = Column(Date, nullable=True)
+    annualized_return = Column(Float, nullable=True)
+    volatility = Column(Float, nullable=True)
+    max_drawdown = Column(Float, nullable=True)
+    max_drawdown_recovery_days = Column(Float, nullable=True)  # NULL while still under water
+    sharpe_ratio = Column(Float, nullable=True)
+    sortino_ratio = Column(Float, nullable=True)
+    beta = Column(Float, nullable=True)
+    alpha = Column(Float, nullable=True)
+    tracking_error = Column(Float, nullable=True)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
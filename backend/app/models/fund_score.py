@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, Numeric, Date, DateTime, JSON
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class FundScore(Base):
+    """Precomputed recommendation metrics for a scheme, refreshed after NAV ingestion."""
+    __tablename__ = "fund_scores"
+
+    scheme_code = Column(String, primary_key=True)
+    scheme_name = Column(String, nullable=False)
+    fund_house = Column(String, nullable=True)
+    category = Column(String, nullable=True)
+    sub_category = Column(String, index=True, nullable=True)
+    nav = Column(Numeric(15, 5), nullable=True)
+    nav_date = Column(Date, nullable=True)
+    rolling_return = Column(Float, nullable=True)  # Mean 3-year rolling CAGR, the ranking key
+    rolling_returns = Column(JSON, nullable=True)
+    trailing_returns = Column(JSON, nullable=True)
+    rank = Column(Integer, index=True, nullable=True)
+    category_rank = Column(Integer, nullable=True)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
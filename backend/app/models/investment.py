@@ -9,6 +9,13 @@ class Investment(Base):
     fund_name = Column(String)
     invested_amount = Column(Numeric(18, 2))
     current_value = Column(Numeric(18, 2))
+    units = Column(Numeric(18, 4), nullable=True)
+    scheme_code = Column(String, ForeignKey("mutual_funds.scheme_code", ondelete="SET NULL"), index=True, nullable=True)
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="investments")
     goal_associations = relationship("GoalInvestment", back_populates="investment")
+    transactions = relationship(
+        "InvestmentTransaction", back_populates="investment",
+        cascade="all, delete-orphan", passive_deletes=True,
+        order_by="InvestmentTransaction.transaction_date",
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class InvestmentTransaction(Base):
+    """One dated cash flow of a holding: a buy, sell, SIP instalment or dividend."""
+    __tablename__ = "investment_transactions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    investment_id = Column(Integer, ForeignKey("investments.id", ondelete="CASCADE"), index=True, nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    transaction_type = Column(String, nullable=False)  # 'buy', 'sell', 'sip' or 'dividend'
+    transaction_date = Column(Date, nullable=False)
+    amount = Column(Numeric(18, 2), nullable=False)  # Always positive; the type gives the direction
+    units = Column(Numeric(18, 4), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    investment = relationship("Investment", back_populates="transactions")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, DateTime, func
+from sqlalchemy import Column, String, Numeric, Date, DateTime, func
 from app.db.base_class import Base
 
 class MutualFund(Base):
@@ -6,7 +6,7 @@ class MutualFund(Base):
     scheme_code = Column(String, primary_key=True, index=True)
     scheme_name = Column(String, index=True)
     nav = Column(Numeric(10, 4))
-    nav_date = Column(String) # The data from AMFI is a string like '05-Jul-2024'
+    nav_date = Column(Date, index=True) # Parsed from AMFI's '05-Jul-2024' format at write time
     fund_house = Column(String)
     category = Column(String)
     sub_category = Column(String)
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, Numeric, Date
+from app.db.base_class import Base
+
+class MutualFundNavHistory(Base):
+    __tablename__ = "mutual_fund_nav_history"
+    # The composite primary key doubles as the (scheme_code, nav_date) range index.
+    scheme_code = Column(String, primary_key=True)
+    nav_date = Column(Date, primary_key=True)
+    nav = Column(Numeric(15, 5), nullable=False)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class NavIngestionRun(Base):
+    __tablename__ = "nav_ingestion_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    inserted = Column(Integer, default=0)
+    updated = Column(Integer, default=0)
+    unchanged = Column(Integer, default=0)
+
+class NavChange(Base):
+    """One NAV movement recorded by an ingestion run; `id` is the consumer cursor."""
+    __tablename__ = "nav_changes"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("nav_ingestion_runs.id", ondelete="CASCADE"), index=True, nullable=False)
+    scheme_code = Column(String, index=True, nullable=False)
+    old_nav = Column(Numeric(10, 4), nullable=True)
+    new_nav = Column(Numeric(10, 4), nullable=True)
+    old_nav_date = Column(Date, nullable=True)
+    new_nav_date = Column(Date, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
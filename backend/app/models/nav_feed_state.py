@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime
+from app.db.base_class import Base
+
+class NavFeedState(Base):
+    """Validators from the last download of a NAV feed, used for conditional fetches."""
+    __tablename__ = "nav_feed_state"
+    url = Column(String, primary_key=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    checked_at = Column(DateTime(timezone=True), nullable=True)
+    synced_at = Column(DateTime(timezone=True), nullable=True)
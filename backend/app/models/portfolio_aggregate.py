@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class PortfolioAggregate(Base):
+    """Running totals of a user's holdings per asset type, kept in step with every investment write."""
+    __tablename__ = "portfolio_aggregates"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    investment_type = Column(String, primary_key=True)
+    holding_count = Column(Integer, nullable=False, default=0)
+    total_invested = Column(Numeric(18, 2), nullable=False, default=0)
+    total_current = Column(Numeric(18, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
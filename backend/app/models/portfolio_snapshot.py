@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class PortfolioSnapshot(Base):
+    """
+    End-of-day totals per user and asset type.
+
+    Range-partitioned by month on snapshot_date; partitions are created by
+    crud.portfolio_snapshot.ensure_partition before each write.
+    """
+    __tablename__ = "portfolio_snapshots"
+    __table_args__ = {"postgresql_partition_by": "RANGE (snapshot_date)"}
+
+    # Key order serves "one user's history over a date range" as an index range scan.
+    owner_id = Column(Integer, primary_key=True)
+    # Separately indexed for "is there a snapshot for this day" checks, which the key can't serve.
+    snapshot_date = Column(Date, primary_key=True, index=True)
+    investment_type = Column(String, primary_key=True)
+    holding_count = Column(Integer, nullable=False)
+    total_invested = Column(Numeric(18, 2), nullable=False)
+    total_current = Column(Numeric(18, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class UserDataVersion(Base):
+    """Per-user counter bumped in every transaction that changes what the user's dashboard shows."""
+    __tablename__ = "user_data_versions"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,18 +1,21 @@
+from datetime import date
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from app import crud
 from app.api import deps
-from app.models.mutual_fund import MutualFund
 from app.schemas.response import APIResponse
 from app.utils.response import success_response
 from app.schemas.models import MutualFund as MutualFundSchema
-from typing import List
+from typing import List, Optional
 
 router = APIRouter()
 
 @router.get("/mutual-funds", response_model=APIResponse[List[MutualFundSchema]])
-def get_popular_mutual_funds(db: Session = Depends(deps.get_db)):
+def get_popular_mutual_funds(stale_since: Optional[date] = None, db: Session = Depends(deps.get_db)):
     """
     Get a list of all mutual funds.
+
+    With `stale_since`, only funds whose latest NAV is dated before that day are returned.
     """
-    funds = db.query(MutualFund).all()
+    funds = crud.mutual_fund.get_multi_filtered(db, stale_since=stale_since)
     return success_response(data=funds, message="Mutual funds retrieved successfully")
@@ -1,7 +1,7 @@
 from .user import User, UserCreate, UserUpdate, OAuth2PasswordRequestForm, TokenPayload, UserProfileUpdate, UserPasswordUpdate
 from .models import *
 from .response import APIResponse
-from .sip_estimation import SIPEstimation, SIPEstimationCreate
+from .sip_estimation import SIPEstimation, SIPEstimationCreate, SIPBacktestRequest, SIPRollingBacktestRequest
 from .swp_estimation import SWPEstimation, SWPEstimationCreate
 from .budget import Budget, BudgetCreate, BudgetItem, BudgetItemCreate
 from .goal import Goal, GoalCreate, GoalUpdate
@@ -1,7 +1,10 @@
 """Pydantic models for request/response validation."""
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Literal, Optional
 from decimal import Decimal
+from datetime import date, datetime
+
+from app.utils.http_cache import IST
 
 
 class UserLogin(BaseModel):
@@ -51,6 +54,7 @@ class InvestmentCreate(BaseModel):
     fund_name: str
     invested_amount: Decimal
     current_value: Decimal
+    units: Optional[Decimal] = None
     
     class Config:
         json_schema_extra = {
@@ -58,7 +62,8 @@ class InvestmentCreate(BaseModel):
                 "investment_type": "mutual_fund",
                 "fund_name": "SBI Bluechip Fund - Direct Plan - Growth",
                 "invested_amount": 50000.00,
-                "current_value": 55000.00
+                "current_value": 55000.00,
+                "units": 612.3456
             }
         }
 
@@ -68,6 +73,7 @@ class InvestmentUpdate(BaseModel):
     fund_name: str
     invested_amount: Decimal
     current_value: Decimal
+    units: Optional[Decimal] = None
 
 
 class Investment(BaseModel):
@@ -76,7 +82,46 @@ class Investment(BaseModel):
     fund_name: str
     invested_amount: Decimal
     current_value: Decimal
+    units: Optional[Decimal] = None
+    owner_id: int
+    scheme_code: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class InvestmentTransactionBase(BaseModel):
+    transaction_type: Literal["buy", "sell", "sip", "dividend"]
+    transaction_date: date
+    amount: Decimal = Field(gt=0)
+    units: Optional[Decimal] = None
+
+
+class InvestmentTransactionCreate(InvestmentTransactionBase):
+    @field_validator("transaction_date")
+    @classmethod
+    def not_in_future(cls, value: date) -> date:
+        # A future-dated cash flow makes the XIRR meaningless. Dates are Indian business days.
+        if value > datetime.now(IST).date():
+            raise ValueError("transaction_date cannot be in the future")
+        return value
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "transaction_type": "sip",
+                "transaction_date": "2024-01-05",
+                "amount": 5000.00,
+                "units": 61.2345
+            }
+        }
+
+
+class InvestmentTransaction(InvestmentTransactionBase):
+    id: int
+    investment_id: int
     owner_id: int
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -109,11 +154,12 @@ class MutualFund(BaseModel):
     scheme_code: str
     scheme_name: str
     nav: float
-    nav_date: str # The data from AMFI is a string like '05-Jul-2024'
+    nav_date: Optional[date] = None
     fund_house: Optional[str] = None
     category: Optional[str] = None
     sub_category: Optional[str] = None
     rolling_return: Optional[float] = None
+    rolling_returns: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
 
     class Config:
         from_attributes = True
@@ -122,12 +168,80 @@ class MutualFundCreate(BaseModel):
     scheme_code: str
     scheme_name: str
     nav: float
-    nav_date: str
+    nav_date: date
     fund_house: Optional[str] = None
     category: Optional[str] = None
     sub_category: Optional[str] = None
 
 
+class NavChange(BaseModel):
+    id: int
+    run_id: int
+    scheme_code: str
+    old_nav: Optional[float] = None
+    new_nav: Optional[float] = None
+    old_nav_date: Optional[date] = None
+    new_nav_date: Optional[date] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FundScore(MutualFund):
+    trailing_returns: Optional[Dict[str, Optional[float]]] = None
+    rank: Optional[int] = None
+    category_rank: Optional[int] = None
+    computed_at: Optional[datetime] = None
+    score: Optional[float] = None  # Value of the metric the list was ranked by
+
+
+class FundRiskMetrics(BaseModel):
+    scheme_code: str
+    benchmark_code: Optional[str] = None
+    risk_free_rate: float
+    period_start: date
+    period_end: date
+    nav_date: Optional[date] = None
+    annualized_return: Optional[float] = None
+    volatility: Optional[float] = None
+    max_drawdown: Optional[float] = None
+    max_drawdown_recovery_days: Optional[float] = None
+    sharpe_ratio: Optional[float] = None
+    sortino_ratio: Optional[float] = None
+    beta: Optional[float] = None
+    alpha: Optional[float] = None
+    tracking_error: Optional[float] = None
+    computed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FundComparisonRequest(BaseModel):
+    scheme_codes: List[str] = Field(min_length=2, max_length=20)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    resolution: Literal["raw", "lttb", "weekly", "monthly"] = "raw"
+    points: int = Field(default=500, ge=3, le=5000)  # Target size for "lttb"
+
+
+class UserDataVersion(BaseModel):
+    owner_id: int
+    version: int
+
+    class Config:
+        from_attributes = True
+
+
+class MutualFundNavPoint(BaseModel):
+    scheme_code: str
+    nav_date: date
+    nav: float
+
+    class Config:
+        from_attributes = True
+
+
 
 class UserRegistration(BaseModel):
     user_id: str
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from datetime import date, datetime
 
 class SIPEstimationBase(BaseModel):
     name: Optional[str] = None
@@ -22,3 +22,19 @@ class SIPEstimation(SIPEstimationBase):
 
     class Config:
         from_attributes = True
+
+class SIPBacktestRequest(BaseModel):
+    scheme_codes: List[str] = Field(min_length=1, max_length=20)
+    amount: float = Field(gt=0)
+    frequency: Literal["monthly", "quarterly", "yearly"] = "monthly"
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    sip_day: int = Field(default=1, ge=1, le=28)
+
+class SIPRollingBacktestRequest(BaseModel):
+    scheme_codes: List[str] = Field(min_length=1, max_length=20)
+    amount: float = Field(gt=0)
+    frequency: Literal["monthly", "quarterly", "yearly"] = "monthly"
+    duration_years: int = Field(ge=1, le=30)
+    sip_day: int = Field(default=1, ge=1, le=28)
+    include_points: bool = False  # Per-start-month XIRR and value, for charting
@@ -0,0 +1,126 @@
+"""Chart-oriented reduction of NAV series: LTTB downsampling and period OHLC aggregation."""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.nav_history import MFAPI_DATE_FORMAT
+from app.services.nav_series import from_day_number
+
+RESOLUTIONS = ("raw", "lttb", "weekly", "monthly")
+DEFAULT_POINTS = 500
+MIN_POINTS = 3
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices kept by largest-triangle-three-buckets downsampling.
+
+    The first and last points are always kept. Each bucket contributes the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket; the areas within a bucket are computed
+    in one array operation. NaN values are passed over unless a bucket holds
+    nothing else.
+    """
+    n = len(x)
+    if n_out >= n or n_out < MIN_POINTS:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end]
+        avg_y = next_y.mean()
+        if np.isnan(avg_y):
+            finite = next_y[~np.isnan(next_y)]
+            avg_y = finite.mean() if len(finite) else y[previous]
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        # argmax would pick a NaN area first.
+        areas[np.isnan(areas)] = -1
+        previous = start + int(areas.argmax())
+        kept[bucket + 1] = previous
+    return kept
+
+
+def period_keys(days: np.ndarray, period: str) -> np.ndarray:
+    """Bucket key per day number: ISO weeks starting Monday, or calendar months."""
+    if period == "weekly":
+        # 1970-01-01 was a Thursday; shifting by 3 aligns buckets to Mondays.
+        return (days.astype(np.int64) + 3) // 7
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+
+def period_last_indices(days: np.ndarray, period: str) -> np.ndarray:
+    """Index of the last NAV in each period (ascending days)."""
+    keys = period_keys(days, period)
+    if not len(keys):
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(np.append(keys[1:] != keys[:-1], True))
+
+
+def aggregate_ohlc(days: np.ndarray, navs: np.ndarray, period: str) -> Dict[str, np.ndarray]:
+    """Open/high/low/close per period, dated by each period's last NAV."""
+    ends = period_last_indices(days, period)
+    if not len(ends):
+        return {"days": days[:0], "open": navs[:0], "high": navs[:0], "low": navs[:0], "close": navs[:0]}
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    return {
+        "days": days[ends],
+        "open": navs[starts],
+        "high": np.maximum.reduceat(navs, starts),
+        "low": np.minimum.reduceat(navs, starts),
+        "close": navs[ends],
+    }
+
+
+def select_indices(days: np.ndarray, values: np.ndarray, resolution: str, points: Optional[int] = None) -> np.ndarray:
+    """
+    Row indices to keep for `resolution`; `values` may be one series or a
+    (days x series) matrix, in which case LTTB keeps the union of each
+    series' picks so shared dates stay aligned.
+    """
+    if resolution == "raw":
+        return np.arange(len(days))
+    if resolution in ("weekly", "monthly"):
+        return period_last_indices(days, resolution)
+    points = points or DEFAULT_POINTS
+    if values.ndim == 1:
+        return lttb_indices(days, values, points)
+    picks = [lttb_indices(days, values[:, col], max(points // values.shape[1], MIN_POINTS))
+             for col in range(values.shape[1])]
+    return np.unique(np.concatenate(picks))
+
+
+def to_chart_rows(days: np.ndarray, navs: np.ndarray, resolution: str, points: Optional[int] = None) -> List[Dict]:
+    """
+    Reduce an ascending series to mfapi-style rows, newest first.
+
+    Period resolutions add open/high/low/close, with `nav` set to the close.
+    """
+    if resolution in ("weekly", "monthly"):
+        ohlc = aggregate_ohlc(days, navs, resolution)
+        rows = [
+            {
+                "date": from_day_number(day).strftime(MFAPI_DATE_FORMAT),
+                "nav": f"{close:.5f}",
+                "open": float(open_), "high": float(high), "low": float(low), "close": float(close),
+            }
+            for day, open_, high, low, close in zip(
+                ohlc["days"], ohlc["open"], ohlc["high"], ohlc["low"], ohlc["close"]
+            )
+        ]
+    else:
+        keep = select_indices(days, navs, resolution, points)
+        rows = [
+            {"date": from_day_number(day).strftime(MFAPI_DATE_FORMAT), "nav": f"{nav:.5f}"}
+            for day, nav in zip(days[keep], navs[keep])
+        ]
+    rows.reverse()
+    return rows
@@ -0,0 +1,99 @@
+"""Aligned multi-fund comparison computed on a shared NAV matrix."""
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.downsampling import select_indices
+from app.services.fund_scores import load_fund_data, parse_payload
+from app.services.nav_history import is_fresh
+from app.services.nav_series import NavSeries, from_day_number
+from app.services.risk_metrics import build_nav_matrix
+
+
+class ComparisonError(ValueError):
+    """The requested funds have no overlapping history to compare."""
+
+
+async def load_nav_series(scheme_code: str) -> Tuple[Optional[str], Optional[NavSeries]]:
+    """
+    Return (scheme name if known, series) for a scheme.
+
+    The NAV archive is used when it is current for the scheme; otherwise the
+    history comes through the local store / mfapi.
+    """
+    series = NavSeries.from_archive(scheme_code)
+    if series is not None and is_fresh(series.latest_date):
+        return None, series
+    parsed = parse_payload(await load_fund_data(scheme_code))
+    if parsed is None:
+        return None, series
+    meta, series = parsed
+    return meta.get('scheme_name'), series
+
+
+def compare_series(
+    series: List[NavSeries],
+    names: Dict[str, str],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    resolution: str = "raw",
+    points: Optional[int] = None,
+) -> Dict:
+    """
+    Align funds on the union of their NAV dates and compare them side by side.
+
+    Every fund is rebased to 100 on the first date all of them have a NAV
+    (missing days carry the previous NAV forward). The correlation matrix is
+    over daily returns in that common window. Trailing and rolling statistics
+    use each fund's full history up to `end`. `resolution` thins only the
+    returned chart series; every statistic uses the full daily data.
+    """
+    windowed = [s.between(start, end) for s in series]
+    if any(not len(s) for s in windowed):
+        raise ComparisonError("Every fund needs NAV history in the requested range")
+
+    grid = np.unique(np.concatenate([s.days for s in windowed]))
+    matrix = build_nav_matrix(windowed, grid)
+    complete = ~np.isnan(matrix).any(axis=1)
+    if not complete.any():
+        raise ComparisonError("The funds have no overlapping NAV history in the requested range")
+    first = int(complete.argmax())
+    grid, matrix = grid[first:], matrix[first:]
+
+    normalized = np.round(matrix / matrix[0] * 100, 4)
+    returns = matrix[1:] / matrix[:-1] - 1
+    if len(returns) > 1:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlation = np.corrcoef(returns, rowvar=False).reshape(len(series), len(series))
+    else:
+        correlation = np.full((len(series), len(series)), np.nan)
+
+    years = (int(grid[-1]) - int(grid[0])) / 365
+    funds = []
+    for col, s in enumerate(series):
+        history = s.between(None, end)
+        growth = matrix[-1, col] / matrix[0, col]
+        funds.append({
+            "scheme_code": s.scheme_code,
+            "scheme_name": names.get(s.scheme_code),
+            "period_return": float((growth - 1) * 100),
+            "period_cagr": float((growth ** (1 / years) - 1) * 100) if years >= 1 else None,
+            "trailing_returns": history.trailing_returns(),
+            "rolling_returns": history.rolling_return_stats(),
+        })
+
+    codes = [s.scheme_code for s in series]
+    keep = select_indices(grid, normalized, resolution, points)
+    return {
+        "start_date": from_day_number(grid[0]),
+        "end_date": from_day_number(grid[-1]),
+        "resolution": resolution,
+        "dates": [from_day_number(day).isoformat() for day in grid[keep]],
+        "series": {code: normalized[keep, col].tolist() for col, code in enumerate(codes)},
+        "correlation": {
+            "scheme_codes": codes,
+            "matrix": [[None if np.isnan(v) else round(float(v), 4) for v in row] for row in correlation],
+        },
+        "funds": funds,
+    }
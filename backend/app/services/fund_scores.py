@@ -0,0 +1,263 @@
+"""
+Category-wide fund scoring, served from fund_scores.
+
+The nightly refresh brings every scheme's history up to date, refreshes the
+NAV archive (re-reading only schemes whose history changed) and then scores
+funds in chunks on a process pool. Workers read NAVs straight from the
+memory-mapped archive, so no series is pickled between processes, and only
+funds with a new NAV since the last run are recomputed.
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.schemas.models import FundRiskMetrics
+from app.services.nav_archive import get_nav_archive, refresh_archive
+from app.services.nav_history import backfill_scheme, get_fund_payload, is_fresh
+from app.services.nav_series import NavSeries, from_day_number
+from app.services.risk_metrics import risk_metric_rows
+
+logger = logging.getLogger(__name__)
+
+
+async def load_fund_data(scheme_code: str) -> Optional[Dict]:
+    """Load a scheme's payload with its own session so loads can run concurrently."""
+    db = SessionLocal()
+    try:
+        return await get_fund_payload(db, scheme_code)
+    finally:
+        db.close()
+
+
+def parse_payload(payload: Optional[Dict]) -> Optional[Tuple[Dict, NavSeries]]:
+    """Split an mfapi-shaped payload into its meta and a parsed NavSeries."""
+    if not payload or 'meta' not in payload or 'data' not in payload:
+        return None
+    meta = payload['meta']
+    series = NavSeries.from_mfapi(payload['data'], str(meta['scheme_code']))
+    return (meta, series) if len(series) else None
+
+
+def score_series(series: NavSeries) -> Dict:
+    """Return-based columns of a fund_scores row for one series."""
+    rolling_returns = series.rolling_return_stats()
+    return {
+        "scheme_code": series.scheme_code,
+        "nav": series.latest_nav,
+        "nav_date": series.latest_date,
+        "rolling_return": rolling_returns["3Y"]["mean"] if rolling_returns["3Y"] else None,
+        "rolling_returns": rolling_returns,
+        "trailing_returns": series.trailing_returns(),
+    }
+
+
+def score_chunk(scheme_codes: List[str], benchmark_code: Optional[str]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Process-pool work unit: score a chunk of schemes from the NAV archive.
+
+    Returns (score columns, risk metric rows) for the schemes that are
+    archived. A fund that fails to score is logged and left out, so one bad
+    history doesn't cost the rest of the chunk.
+    """
+    series = [s for s in (NavSeries.from_archive(code) for code in scheme_codes) if s is not None]
+    benchmark = NavSeries.from_archive(benchmark_code) if benchmark_code else None
+
+    rows, scored = [], []
+    for s in series:
+        try:
+            rows.append(score_series(s))
+            scored.append(s)
+        except Exception as e:
+            logger.error(f"Scoring {s.scheme_code} failed: {e}")
+    try:
+        risk_rows = risk_metric_rows(scored, benchmark)
+    except Exception as e:
+        # Fall back to one fund at a time to isolate the one that breaks the batch.
+        logger.error(f"Batch risk metrics failed, retrying per fund: {e}")
+        risk_rows = []
+        for s in scored:
+            try:
+                risk_rows.extend(risk_metric_rows([s], benchmark))
+            except Exception as e:
+                logger.error(f"Risk metrics for {s.scheme_code} failed: {e}")
+    return rows, risk_rows
+
+
+def _load_universe() -> List[Dict]:
+    db = SessionLocal()
+    try:
+        funds = crud.mutual_fund.get_ranking_universe(db, categories=settings.FUND_RANKING_CATEGORIES)
+        scored = crud.fund_score.get_nav_dates(db)
+    finally:
+        db.close()
+    return [
+        {
+            "scheme_code": fund.scheme_code,
+            "scheme_name": fund.scheme_name,
+            "fund_house": fund.fund_house,
+            "category": fund.category,
+            "sub_category": fund.sub_category,
+            "scored_nav_date": scored.get(fund.scheme_code),
+        }
+        for fund in funds
+    ]
+
+
+async def sync_histories(scheme_codes: List[str]) -> Dict:
+    """Append new NAVs from mfapi for every scheme whose stored history is stale."""
+    db = SessionLocal()
+    try:
+        latest = await asyncio.to_thread(crud.nav_history.get_latest_dates, db, scheme_codes=scheme_codes)
+    finally:
+        db.close()
+    pending = [code for code in scheme_codes if not is_fresh(latest.get(code))]
+    limit = asyncio.Semaphore(settings.HTTP_PER_HOST_CONCURRENCY)
+
+    async def run(code: str) -> bool:
+        async with limit:
+            try:
+                await backfill_scheme(code)
+                return True
+            except Exception as e:
+                logger.warning(f"NAV history sync failed for {code}: {e}")
+                return False
+
+    results = await asyncio.gather(*(run(code) for code in pending))
+    return {"stale": len(pending), "failed": results.count(False)}
+
+
+def _rebuild_archive() -> Dict:
+    db = SessionLocal()
+    try:
+        return refresh_archive(settings.NAV_ARCHIVE_PATH, db)
+    finally:
+        db.close()
+
+
+def _save_scores(universe: List[Dict], rows: List[Dict], risk_rows: List[Dict]) -> None:
+    db = SessionLocal()
+    try:
+        crud.fund_score.upsert_many(db, rows=rows)
+        crud.fund_score.delete_except(db, scheme_codes=[fund["scheme_code"] for fund in universe])
+        crud.fund_risk_metrics.upsert_many(db, rows=risk_rows)
+        crud.fund_score.rerank(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def refresh_fund_scores(full: bool = False) -> Dict:
+    """
+    Bring fund_scores up to date for every scheme in the ranked categories.
+
+    Funds whose archived latest NAV matches the stored score are skipped
+    unless `full` is set. Scores, risk metrics and ranks are written in one
+    transaction, so readers never see a half-refreshed ranking.
+    """
+    started = time.monotonic()
+    computed_at = datetime.now(timezone.utc)
+    universe = await asyncio.to_thread(_load_universe)
+    codes = [fund["scheme_code"] for fund in universe]
+    stats = {"universe": len(universe)}
+    if not universe:
+        # Most likely the catalog failed to load; an empty universe would wipe every score.
+        logger.error("Ranking universe is empty; keeping the previous fund scores")
+        return stats
+
+    stats["history"] = await sync_histories(codes + [settings.RISK_BENCHMARK_SCHEME_CODE])
+    stats["archive"] = await asyncio.to_thread(_rebuild_archive)
+
+    archive = get_nav_archive()
+    if archive is None:
+        logger.error("No NAV archive available; keeping the previous fund scores")
+        return stats
+
+    def needs_score(fund: Dict) -> bool:
+        series = archive.get(fund["scheme_code"])
+        if series is None:
+            return False
+        return full or fund["scored_nav_date"] != from_day_number(series[0][-1])
+
+    pending = [fund for fund in universe if needs_score(fund)]
+    chunk_size = settings.FUND_RANKING_CHUNK_SIZE
+    chunks = [
+        [fund["scheme_code"] for fund in pending[i:i + chunk_size]]
+        for i in range(0, len(pending), chunk_size)
+    ]
+
+    rows, risk_rows = [], []
+    if chunks:
+        loop = asyncio.get_running_loop()
+        # Spawned workers avoid forking a process that is running threads.
+        with ProcessPoolExecutor(
+            max_workers=settings.FUND_RANKING_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, score_chunk, chunk, settings.RISK_BENCHMARK_SCHEME_CODE)
+                for chunk in chunks
+            ), return_exceptions=True)
+        details = {fund["scheme_code"]: fund for fund in pending}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                # e.g. a crashed worker; these funds keep their previous scores
+                logger.error(f"Scoring chunk starting at {chunk[0]} failed: {result}")
+                stats["failed_chunks"] = stats.get("failed_chunks", 0) + 1
+                continue
+            chunk_rows, chunk_risk_rows = result
+            for row in chunk_rows:
+                fund = details[row["scheme_code"]]
+                row.update(
+                    scheme_name=fund["scheme_name"],
+                    fund_house=fund["fund_house"],
+                    category=fund["category"],
+                    sub_category=fund["sub_category"],
+                    computed_at=computed_at,
+                )
+                rows.append(row)
+            risk_rows.extend(chunk_risk_rows)
+
+    if rows:
+        await asyncio.to_thread(_save_scores, universe, rows, risk_rows)
+    else:
+        logger.info("No fund needed rescoring; keeping the previous fund scores")
+    stats.update(
+        scored=len(rows),
+        unchanged=len(universe) - len(pending),
+        risk_metrics=len(risk_rows),
+        elapsed_seconds=round(time.monotonic() - started, 3),
+    )
+    return stats
+
+
+async def get_fund_risk_metrics(db, series: NavSeries) -> Optional[Dict]:
+    """
+    Risk metrics for one fund, served from fund_risk_metrics when current.
+
+    Stored metrics are current when they were computed from the fund's own
+    NAVs up to within NAV_HISTORY_MAX_AGE_DAYS of its latest. Funds outside
+    the scored universe, or with stored metrics that have fallen behind,
+    are computed on demand but not saved: this is a read path, and the
+    scorer persists metrics on its next run.
+    """
+    if not len(series):
+        return None
+    as_of = series.latest_date - timedelta(days=settings.NAV_HISTORY_MAX_AGE_DAYS)
+    stored = await asyncio.to_thread(
+        crud.fund_risk_metrics.get_by_scheme, db, scheme_code=series.scheme_code, as_of=as_of
+    )
+    if stored is not None:
+        return FundRiskMetrics.model_validate(stored).model_dump()
+
+    benchmark = parse_payload(await load_fund_data(settings.RISK_BENCHMARK_SCHEME_CODE))
+    rows = await asyncio.to_thread(risk_metric_rows, [series], benchmark[1] if benchmark else None)
+    return rows[0] if rows else None
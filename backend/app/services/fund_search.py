@@ -0,0 +1,189 @@
+"""In-memory search index over the mfapi scheme list."""
+import bisect
+import heapq
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Minimum trigram similarity for a vocabulary token to count as a typo match.
+FUZZY_MIN_SIMILARITY = 0.3
+FUZZY_MIN_TOKEN_LENGTH = 4
+# Relevance weights per query token
+EXACT_MATCH_SCORE = 3.0
+PREFIX_MATCH_SCORE = 2.0
+FUZZY_MATCH_SCORE = 1.5
+# Most searches are for the plan investors actually buy.
+PLAN_BONUS = {"direct": 0.5, "growth": 0.5}
+
+
+def normalize(text: str) -> str:
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    return normalize(text).split()
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FundSearchIndex:
+    """
+    Token and trigram postings over scheme names with fund-house facets.
+
+    Postings map vocabulary tokens to documents, and trigrams to vocabulary
+    tokens, so prefix lookups are a bisect over the sorted vocabulary and
+    typo matching only compares against distinct tokens. `update` diffs a
+    refreshed list against the indexed one and touches only what changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Dict] = {}
+        self._doc_tokens: Dict[str, Tuple[str, ...]] = {}
+        self._doc_house: Dict[str, Optional[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._trigram_postings: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._houses: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _add(self, code: str, entry: Dict, fund_house: Optional[str]) -> None:
+        tokens = tuple(tokenize(entry.get('schemeName', '')))
+        self._docs[code] = entry
+        self._doc_tokens[code] = tokens
+        self._doc_house[code] = fund_house
+        for token in set(tokens):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                for gram in trigrams(token):
+                    self._trigram_postings.setdefault(gram, set()).add(token)
+            postings.add(code)
+        if fund_house:
+            self._houses.setdefault(fund_house, set()).add(code)
+
+    def _remove(self, code: str) -> None:
+        self._docs.pop(code)
+        for token in set(self._doc_tokens.pop(code)):
+            postings = self._postings[token]
+            postings.discard(code)
+            if not postings:
+                del self._postings[token]
+                for gram in trigrams(token):
+                    tokens = self._trigram_postings[gram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigram_postings[gram]
+        fund_house = self._doc_house.pop(code)
+        if fund_house:
+            self._houses[fund_house].discard(code)
+            if not self._houses[fund_house]:
+                del self._houses[fund_house]
+
+    def update(self, entries: Iterable[Dict], fund_houses: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """Sync the index with a freshly downloaded scheme list."""
+        fund_houses = fund_houses or {}
+        incoming = {str(entry.get('schemeCode')): entry for entry in entries}
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock:
+            for code in [code for code in self._docs if code not in incoming]:
+                self._remove(code)
+                stats["removed"] += 1
+            for code, entry in incoming.items():
+                current = self._docs.get(code)
+                fund_house = fund_houses.get(code)
+                if current is not None:
+                    if current.get('schemeName') == entry.get('schemeName') and self._doc_house[code] == fund_house:
+                        self._docs[code] = entry
+                        continue
+                    self._remove(code)
+                    stats["updated"] += 1
+                else:
+                    stats["added"] += 1
+                self._add(code, entry, fund_house)
+            if stats["added"] or stats["updated"] or stats["removed"]:
+                self._vocabulary = sorted(self._postings)
+        return stats
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        return self._vocabulary[start:end]
+
+    def _fuzzy_tokens(self, token: str) -> Dict[str, float]:
+        grams = trigrams(token)
+        shared = Counter(t for gram in grams for t in self._trigram_postings.get(gram, ()))
+        matches = {}
+        for candidate, overlap in shared.items():
+            similarity = overlap / (len(grams) + len(trigrams(candidate)) - overlap)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                matches[candidate] = similarity
+        return matches
+
+    def _match_token(self, token: str) -> Dict[str, float]:
+        """Score every document containing a token that matches `token`."""
+        scores: Dict[str, float] = {}
+        matched = {t: PREFIX_MATCH_SCORE for t in self._prefix_tokens(token)}
+        if token in self._postings:
+            matched[token] = EXACT_MATCH_SCORE
+        if not matched and len(token) >= FUZZY_MIN_TOKEN_LENGTH:
+            matched = {t: FUZZY_MATCH_SCORE * s for t, s in self._fuzzy_tokens(token).items()}
+        for vocab_token, score in matched.items():
+            for code in self._postings[vocab_token]:
+                if score > scores.get(code, 0.0):
+                    scores[code] = score
+        return scores
+
+    def search(
+        self, query: str, limit: int = 20, offset: int = 0, fund_house: Optional[str] = None
+    ) -> Dict:
+        """
+        Rank schemes matching every query token.
+
+        Each token matches exactly, as a prefix, or (when nothing else does)
+        by trigram similarity. Returns the requested page, the total match
+        count and fund-house facet counts over all matches.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return {"results": [], "total": 0, "facets": {}}
+        with self._lock:
+            scores: Optional[Dict[str, float]] = None
+            for token in tokens:
+                token_scores = self._match_token(token)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {code: scores[code] + s for code, s in token_scores.items() if code in scores}
+                if not scores:
+                    break
+            scores = scores or {}
+
+            facets = Counter(self._doc_house[code] for code in scores if self._doc_house[code])
+            if fund_house:
+                members = self._houses.get(fund_house, set())
+                scores = {code: score for code, score in scores.items() if code in members}
+
+            def rank(code: str):
+                doc_tokens = self._doc_tokens[code]
+                bonus = sum(weight for token, weight in PLAN_BONUS.items() if token in doc_tokens)
+                return (-(scores[code] + bonus), len(doc_tokens), self._docs[code].get('schemeName', ''))
+
+            # Only the requested page needs ordering, not every match.
+            page = heapq.nsmallest(offset + limit, scores, key=rank)[offset:]
+            return {
+                "results": [self._docs[code] for code in page],
+                "total": len(scores),
+                "facets": dict(facets.most_common()),
+            }
+
+
+fund_search_index = FundSearchIndex()
@@ -0,0 +1,197 @@
+"""Shared async HTTP client for outbound market-data calls (AMFI, mfapi)."""
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a host's circuit breaker is open and calls are short-circuited."""
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: opens after `failure_threshold` consecutive failures and
+    lets a single trial request through once `reset_seconds` have passed.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise CircuitOpenError("circuit open")
+        if state == "half_open":
+            self._trial_in_flight = True
+
+    def release_trial(self) -> None:
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class MarketDataClient:
+    """
+    Lazily created httpx.AsyncClient with keep-alive pooling, per-host
+    concurrency limits, retries with exponential backoff and circuit breaking.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        max_connections: int,
+        per_host_concurrency: int,
+        retries: int,
+        backoff_seconds: float,
+        failure_threshold: int,
+        reset_seconds: float,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.per_host_concurrency = per_host_concurrency
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                follow_redirects=True,
+            )
+        return self._client
+
+    def _host_state(self, url: str):
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+            self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+        return self._host_limits[host], self._breakers[host]
+
+    def _backoff(self, attempt: int) -> float:
+        return self.backoff_seconds * (2 ** attempt) * (1 + random.random())
+
+    @asynccontextmanager
+    async def stream(self, url: str, headers: Optional[Dict[str, str]] = None) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streamed GET, retrying connection errors and retryable statuses.
+
+        The yielded response may be 304 or another non-retryable status;
+        callers decide what to do with it.
+        """
+        limit, breaker = self._host_state(url)
+        async with limit:
+            breaker.before_call()
+            response = None
+            try:
+                for attempt in range(self.retries + 1):
+                    try:
+                        request = self.client.build_request("GET", url, headers=headers)
+                        response = await self.client.send(request, stream=True)
+                    except httpx.TransportError as e:
+                        if attempt >= self.retries:
+                            breaker.record_failure()
+                            raise
+                        logger.warning(f"GET {url} failed ({e!r}), retrying")
+                        await asyncio.sleep(self._backoff(attempt))
+                        continue
+                    if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.retries:
+                        await response.aclose()
+                        await asyncio.sleep(self._backoff(attempt))
+                        continue
+                    break
+            finally:
+                # Don't leave a half-open breaker waiting on a trial that was cancelled.
+                breaker.release_trial()
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        async with self.stream(url, headers=headers) as response:
+            await response.aread()
+            return response
+
+    async def get_json(self, url: str) -> Optional[Any]:
+        """Return the decoded JSON body, or None on any failure."""
+        try:
+            response = await self.get(url)
+            if response.status_code == 200:
+                return response.json()
+        except CircuitOpenError:
+            logger.warning(f"Skipping {url}: circuit open")
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {e}")
+        return None
+
+    async def iter_lines(self, url: str) -> AsyncIterator[str]:
+        async with self.stream(url) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield line
+
+    def stats(self) -> Dict:
+        return {host: breaker.state for host, breaker in self._breakers.items()}
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+market_data_client = MarketDataClient(
+    timeout=settings.HTTP_TIMEOUT_SECONDS,
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    per_host_concurrency=settings.HTTP_PER_HOST_CONCURRENCY,
+    retries=settings.HTTP_RETRIES,
+    backoff_seconds=settings.HTTP_BACKOFF_SECONDS,
+    failure_threshold=settings.HTTP_CIRCUIT_FAILURE_THRESHOLD,
+    reset_seconds=settings.HTTP_CIRCUIT_RESET_SECONDS,
+)
@@ -0,0 +1,250 @@
+"""
+Memory-mapped columnar archive of NAV history.
+
+File layout (little endian, every section 8-byte aligned):
+
+    header   magic, version, scheme count, point count, section offsets
+    index    scheme_code (S16), offset (i8), length (i8), sorted by code
+    days     int32 days since 1970-01-01, contiguous per scheme, ascending
+    navs     float64 NAVs aligned with `days`
+
+Readers mmap the file read-only, so every uvicorn worker shares the same
+page-cache pages and the arrays handed out are zero-copy views.
+"""
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.models.mutual_fund_nav_history import MutualFundNavHistory
+from app.services.nav_history import parse_mfapi_history
+
+MAGIC = b"NAVARCH1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIqqqq")
+HEADER_SIZE = 64
+INDEX_DTYPE = np.dtype([("scheme_code", "S16"), ("offset", "<i8"), ("length", "<i8")])
+EPOCH = date(1970, 1, 1)
+
+Series = Tuple[str, np.ndarray, np.ndarray]
+
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+
+def to_day_numbers(dates: Iterable[date]) -> np.ndarray:
+    return np.fromiter((d.toordinal() - EPOCH.toordinal() for d in dates), dtype=np.int32)
+
+
+def write_archive(path: str, series: Iterable[Series]) -> Dict:
+    """
+    Write (scheme_code, days, navs) series to `path`.
+
+    The file is built next to the target and atomically renamed over it, so
+    readers that still map the previous version keep a consistent view.
+    """
+    entries: List[Tuple[bytes, np.ndarray, np.ndarray]] = []
+    for scheme_code, days, navs in series:
+        if len(days):
+            order = np.argsort(days, kind="stable")
+            entries.append((
+                scheme_code.encode(),
+                np.ascontiguousarray(days[order], dtype="<i4"),
+                np.ascontiguousarray(navs[order], dtype="<f8"),
+            ))
+    entries.sort(key=lambda entry: entry[0])
+
+    index = np.zeros(len(entries), dtype=INDEX_DTYPE)
+    offset = 0
+    for i, (code, days, _) in enumerate(entries):
+        index[i] = (code, offset, len(days))
+        offset += len(days)
+    total_points = offset
+
+    index_offset = HEADER_SIZE
+    days_offset = _align(index_offset + index.nbytes)
+    navs_offset = _align(days_offset + total_points * 4)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(entries), total_points, index_offset, days_offset, navs_offset))
+            f.seek(index_offset)
+            f.write(index.tobytes())
+            f.seek(days_offset)
+            for _, days, _ in entries:
+                f.write(days.tobytes())
+            f.seek(navs_offset)
+            for _, _, navs in entries:
+                f.write(navs.tobytes())
+            # Make sure the file covers every section even when they are empty.
+            f.truncate(navs_offset + total_points * 8)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    return {"schemes": len(entries), "points": total_points, "bytes": navs_offset + total_points * 8}
+
+
+def series_from_db(
+    db: Session, scheme_codes: Optional[List[str]] = None, batch_size: int = 50_000
+) -> Iterator[Series]:
+    """Stream stored histories (all, or just `scheme_codes`) out of mutual_fund_nav_history, one scheme at a time."""
+    rows = db.query(MutualFundNavHistory.scheme_code, MutualFundNavHistory.nav_date, MutualFundNavHistory.nav)
+    rows = rows.filter(MutualFundNavHistory.nav > 0)
+    if scheme_codes is not None:
+        rows = rows.filter(MutualFundNavHistory.scheme_code.in_(scheme_codes))
+    rows = (
+        rows.order_by(MutualFundNavHistory.scheme_code, MutualFundNavHistory.nav_date)
+        .yield_per(batch_size)
+    )
+    current, dates, navs = None, [], []
+    for scheme_code, nav_date, nav in rows:
+        if scheme_code != current and current is not None:
+            yield current, to_day_numbers(dates), np.asarray(navs, dtype=np.float64)
+            dates, navs = [], []
+        current = scheme_code
+        dates.append(nav_date)
+        navs.append(float(nav))
+    if current is not None:
+        yield current, to_day_numbers(dates), np.asarray(navs, dtype=np.float64)
+
+
+def series_from_mfapi(payloads: Iterable[Dict]) -> Iterator[Series]:
+    """Convert raw mfapi payloads ({'meta': ..., 'data': [...]}) into archive series."""
+    for payload in payloads:
+        if not payload or 'meta' not in payload:
+            continue
+        points = parse_mfapi_history(payload.get('data', []))
+        yield (
+            str(payload['meta']['scheme_code']),
+            to_day_numbers(d for d, _ in points),
+            np.fromiter((nav for _, nav in points), dtype=np.float64, count=len(points)),
+        )
+
+
+def refresh_archive(path: str, db: Session) -> Dict:
+    """
+    Bring the archive at `path` in line with mutual_fund_nav_history.
+
+    History is append-only, so a scheme whose latest date and point count
+    match the archived series is copied over from the current file; only
+    the schemes that changed are read from the database. When nothing
+    changed the file is left untouched.
+    """
+    stored = crud.nav_history.get_summaries(db)
+    try:
+        archive: Optional[NavArchive] = NavArchive(path)
+    except (FileNotFoundError, ValueError):
+        archive = None
+
+    def unchanged(code: str) -> bool:
+        series = archive.get(code) if archive is not None else None
+        latest, count = stored[code]
+        return series is not None and len(series[0]) == count and int(series[0][-1]) == to_day_numbers([latest])[0]
+
+    changed = [code for code in stored if not unchanged(code)]
+    removed = sum(code not in stored for code in archive.scheme_codes()) if archive is not None else 0
+    if archive is not None and not changed and not removed:
+        return {"schemes": len(archive), "changed": 0, "removed": 0, "rewritten": False}
+
+    fresh = {code: (days, navs) for code, days, navs in series_from_db(db, scheme_codes=changed)} if changed else {}
+
+    def merged() -> Iterator[Series]:
+        for code in stored:
+            series = fresh.get(code) or (archive.get(code) if archive is not None else None)
+            if series is not None:
+                yield (code, *series)
+
+    stats = write_archive(path, merged())
+    stats.update(changed=len(changed), removed=removed, rewritten=True)
+    return stats
+
+
+class NavArchive:
+    """Read-only view over an archive file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._stat = os.fstat(f.fileno())
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, schemes, points, index_offset, days_offset, navs_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a v{VERSION} NAV archive")
+        index = np.frombuffer(self._mm, dtype=INDEX_DTYPE, count=schemes, offset=index_offset)
+        self._days = np.frombuffer(self._mm, dtype="<i4", count=points, offset=days_offset)
+        self._navs = np.frombuffer(self._mm, dtype="<f8", count=points, offset=navs_offset)
+        self._index = {
+            code.decode(): (int(offset), int(length))
+            for code, offset, length in zip(index["scheme_code"], index["offset"], index["length"])
+        }
+
+    def __contains__(self, scheme_code: str) -> bool:
+        return scheme_code in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def scheme_codes(self) -> List[str]:
+        return list(self._index)
+
+    def get(self, scheme_code: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return zero-copy (days, navs) views for a scheme, or None if it isn't archived."""
+        location = self._index.get(scheme_code)
+        if location is None:
+            return None
+        offset, length = location
+        return self._days[offset:offset + length], self._navs[offset:offset + length]
+
+    def get_dates(self, scheme_code: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Like `get` but with dates as datetime64[D] (this converts, so it copies the day column)."""
+        series = self.get(scheme_code)
+        if series is None:
+            return None
+        days, navs = series
+        return days.astype("datetime64[D]"), navs
+
+    def is_current(self) -> bool:
+        """False once the file on disk has been replaced by a rebuild."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns) == (self._stat.st_ino, self._stat.st_mtime_ns)
+
+
+_archive: Optional[NavArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_nav_archive() -> Optional[NavArchive]:
+    """
+    Return the process-wide archive, reopening it after a rebuild.
+
+    Returns None when no archive has been built yet.
+    """
+    global _archive
+    if _archive is not None and _archive.is_current():
+        return _archive
+    with _archive_lock:
+        if _archive is None or not _archive.is_current():
+            try:
+                # The replaced mapping is left to the garbage collector because
+                # views handed out earlier may still reference it.
+                _archive = NavArchive(settings.NAV_ARCHIVE_PATH)
+            except FileNotFoundError:
+                _archive = None
+    return _archive
@@ -0,0 +1,143 @@
+"""Local NAV time-series store backed by mutual_fund_nav_history, fed from mfapi."""
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.mutual_fund import MutualFund
+from app.services.http_client import market_data_client
+from app.services.response_cache import api_cache
+
+logger = logging.getLogger(__name__)
+
+MFAPI_DATE_FORMAT = "%d-%m-%Y"
+
+
+async def fetch_fund_data(scheme_code: str, cached: bool = True) -> Optional[Dict]:
+    """
+    Fetch the full mfapi payload (meta + NAV history) for a scheme.
+
+    Responses go through the shared response cache unless `cached` is False,
+    which bulk jobs use so they don't flush it with one-off payloads. A cached
+    payload is the cache's own object: callers must not modify it.
+    """
+    url = f"{settings.MFAPI_BASE_URL}/{scheme_code}"
+    if not cached:
+        return await market_data_client.get_json(url)
+    return await api_cache.get_or_load(
+        f"mfapi:scheme:{scheme_code}",
+        lambda: market_data_client.get_json(url),
+        ttl=settings.MFAPI_DETAIL_TTL_MINUTES * 60,
+        stale_ttl=settings.MFAPI_DETAIL_STALE_HOURS * 3600,
+    )
+
+
+def parse_mfapi_history(nav_data: List[Dict]) -> List[Tuple[date, float]]:
+    """
+    Convert mfapi {'date': 'dd-mm-YYYY', 'nav': '...'} rows to ascending (date, nav) pairs,
+    skipping rows without a positive NAV.
+    """
+    points = []
+    for entry in nav_data:
+        try:
+            nav_date = datetime.strptime(entry['date'], MFAPI_DATE_FORMAT).date()
+            nav = float(entry['nav'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if nav > 0:  # also rejects NaN
+            points.append((nav_date, nav))
+    points.sort()
+    return points
+
+
+def is_fresh(latest: Optional[date]) -> bool:
+    return latest is not None and latest >= date.today() - timedelta(days=settings.NAV_HISTORY_MAX_AGE_DAYS)
+
+
+def sync_scheme_history(db: Session, scheme_code: str, payload: Optional[Dict]) -> int:
+    """Append NAVs from an mfapi payload newer than the stored maximum and commit."""
+    if not payload or 'data' not in payload:
+        return 0
+    written = crud.nav_history.append(
+        db, scheme_code=scheme_code, points=parse_mfapi_history(payload['data'])
+    )
+    db.commit()
+    return written
+
+
+def _write_scheme_history(scheme_code: str, payload: Dict) -> int:
+    db = SessionLocal()
+    try:
+        return sync_scheme_history(db, scheme_code, payload)
+    finally:
+        db.close()
+
+
+async def backfill_scheme(scheme_code: str) -> int:
+    """Download a scheme's history and append what's new, in its own session and transaction."""
+    payload = await fetch_fund_data(scheme_code, cached=False)
+    if payload is None:
+        raise RuntimeError("download failed")
+    return await asyncio.to_thread(_write_scheme_history, scheme_code, payload)
+
+
+def load_nav_history(
+    db: Session, scheme_code: str, start: Optional[date] = None, end: Optional[date] = None
+) -> List[Tuple[date, float]]:
+    return crud.nav_history.get_range(db, scheme_code=scheme_code, start=start, end=end)
+
+
+def to_mfapi_rows(points: List[Tuple[date, float]]) -> List[Dict]:
+    """Render ascending (date, nav) pairs in mfapi's newest-first JSON shape."""
+    return [
+        {"date": nav_date.strftime(MFAPI_DATE_FORMAT), "nav": f"{nav:.5f}"}
+        for nav_date, nav in reversed(points)
+    ]
+
+
+def _load_local_payload(db: Session, scheme_code: str) -> Optional[Dict]:
+    fund = db.query(MutualFund).get(scheme_code)
+    latest = crud.nav_history.get_latest_date(db, scheme_code=scheme_code)
+    if not fund or not is_fresh(latest):
+        return None
+    return {
+        "meta": {
+            "fund_house": fund.fund_house,
+            "scheme_type": None,
+            "scheme_category": fund.sub_category or fund.category,
+            "scheme_code": fund.scheme_code,
+            "scheme_name": fund.scheme_name,
+        },
+        "data": to_mfapi_rows(load_nav_history(db, scheme_code)),
+    }
+
+
+def _append_payload(db: Session, scheme_code: str, payload: Dict) -> None:
+    try:
+        sync_scheme_history(db, scheme_code, payload)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"NAV history append failed for {scheme_code}: {e}")
+
+
+async def get_fund_payload(db: Session, scheme_code: str) -> Optional[Dict]:
+    """
+    Return an mfapi-shaped payload for a scheme, preferring the local store.
+
+    Fresh local history is served as is. Otherwise mfapi is queried once and
+    only the new dates are appended before returning the remote payload,
+    which may be shared with the response cache and must be treated as
+    read-only. Database work runs in a worker thread to keep the event loop free.
+    """
+    local = await asyncio.to_thread(_load_local_payload, db, scheme_code)
+    if local:
+        return local
+    payload = await fetch_fund_data(scheme_code)
+    if payload:
+        await asyncio.to_thread(_append_payload, db, scheme_code, payload)
+    return payload
@@ -0,0 +1,233 @@
+"""Streaming ingestion of the AMFI NAVAll.txt feed into the mutual_funds table."""
+import asyncio
+import hashlib
+import io
+import logging
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from typing import IO, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.models.nav_feed_state import NavFeedState
+from app.services.http_client import market_data_client
+from app.services.nav_snapshot import nav_snapshot
+from app.services.revaluation import revalue_holdings
+from app.services.user_cache import dashboard_cache
+from app.utils.amfi import iter_nav_records
+
+logger = logging.getLogger(__name__)
+
+# Feeds larger than this spill from memory to a temporary file while hashing.
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+class FeedDownload(NamedTuple):
+    body: IO[bytes]
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+async def download_feed(
+    url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> Optional[FeedDownload]:
+    """
+    Conditionally download a feed, hashing it as it streams to a spooled file.
+
+    Returns None when the server answers 304 Not Modified.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    async with market_data_client.stream(url, headers=headers) as response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        digest = hashlib.sha256()
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        async for chunk in response.aiter_bytes(chunk_size=64 * 1024):
+            digest.update(chunk)
+            body.write(chunk)
+        body.seek(0)
+        return FeedDownload(body, digest.hexdigest(), response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+
+def _nav_changes(batch: Dict[str, Dict], previous: Dict[str, Tuple], changed_codes: List[str]) -> List[Dict]:
+    """Build journal rows for schemes whose NAV or NAV date actually moved."""
+    changes = []
+    for code in changed_codes:
+        record = batch[code]
+        old_nav, old_nav_date = previous.get(code, (None, None))
+        new_nav = round(record["nav"], 4)
+        if old_nav is not None and float(old_nav) == new_nav and old_nav_date == record["nav_date"]:
+            continue
+        changes.append({
+            "scheme_code": code,
+            "old_nav": old_nav,
+            "new_nav": new_nav,
+            "old_nav_date": old_nav_date,
+            "new_nav_date": record["nav_date"],
+        })
+    return changes
+
+
+def _history_points(
+    batch: Dict[str, Dict], previous: Dict[str, Tuple], changed_codes: List[str], latest: Dict[str, date]
+) -> List[Dict]:
+    """
+    History rows for changed schemes whose stored history is contiguous.
+
+    A scheme is only extended when its stored history reaches the NAV date
+    the feed showed before this one. Schemes without stored history, or
+    with a gap, are left to the mfapi backfill, which only appends after the
+    latest stored date and so could never fill in behind a lone daily point.
+    """
+    points = []
+    for code in changed_codes:
+        record = batch[code]
+        stored_latest = latest.get(code)
+        _, old_nav_date = previous.get(code, (None, None))
+        if stored_latest is None or not record["nav"] > 0:
+            continue
+        if old_nav_date is not None and stored_latest < old_nav_date:
+            continue
+        points.append({"scheme_code": code, "nav_date": record["nav_date"], "nav": record["nav"]})
+    return points
+
+
+def ingest_nav_records(
+    db: Session, records: Iterable[Dict], batch_size: Optional[int] = None, source: str = "amfi"
+) -> Dict:
+    """
+    Upsert NAV records in batches inside a single transaction.
+
+    Every NAV movement is written to the change journal under a new run id,
+    appended to the stored NAV history (see `_history_points`), and holdings
+    of every changed scheme are revalued, all in the same transaction.
+    Returns the run id, counts of inserted, updated and unchanged rows and
+    the revaluation stats.
+    """
+    batch_size = batch_size or settings.NAV_SYNC_BATCH_SIZE
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0, "journaled": 0, "history": 0}
+    changed_codes = []
+    # ON CONFLICT cannot touch the same row twice in one statement, so the
+    # batch is keyed by scheme code and the last occurrence wins.
+    batch: Dict[str, Dict] = {}
+
+    def flush():
+        previous = crud.mutual_fund.get_navs(db, scheme_codes=list(batch))
+        inserted, updated = crud.mutual_fund.bulk_upsert(db, rows=list(batch.values()))
+        changed = inserted + updated
+        changes = _nav_changes(batch, previous, changed)
+        crud.nav_change.record(db, run_id=run.id, changes=changes)
+        if changed:
+            latest = crud.nav_history.get_latest_dates(db, scheme_codes=changed)
+            stats["history"] += crud.nav_history.upsert_points(
+                db, rows=_history_points(batch, previous, changed, latest)
+            )
+        stats["inserted"] += len(inserted)
+        stats["updated"] += len(updated)
+        stats["unchanged"] += len(batch) - len(inserted) - len(updated)
+        stats["journaled"] += len(changes)
+        changed_codes.extend(changed)
+        batch.clear()
+
+    try:
+        run = crud.nav_change.start_run(db, source=source)
+        stats["run_id"] = run.id
+        for record in records:
+            batch[record["scheme_code"]] = record
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        crud.nav_change.finish_run(
+            db, run=run, inserted=stats["inserted"], updated=stats["updated"], unchanged=stats["unchanged"]
+        )
+        stats["revaluation"] = revalue_holdings(db, scheme_codes=changed_codes)
+        db.commit()
+        if stats["revaluation"]["rows_touched"]:
+            dashboard_cache.clear()
+    except Exception:
+        db.rollback()
+        raise
+    return stats
+
+
+async def sync_all_mutual_funds(db: Session) -> Dict:
+    """Write the full AMFI universe from the shared NAV snapshot and report what changed."""
+    started = time.monotonic()
+    records = await nav_snapshot.all_records()
+    stats = await asyncio.to_thread(ingest_nav_records, db, records.values())
+    stats["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    logger.info(
+        "NAV sync complete: %(inserted)s inserted, %(updated)s updated, "
+        "%(unchanged)s unchanged in %(elapsed_seconds)ss", stats
+    )
+    return stats
+
+
+def _ingest_feed_body(db: Session, body: IO[bytes]) -> Dict:
+    lines = io.TextIOWrapper(body, encoding="utf-8", errors="replace")
+    records = {record["scheme_code"]: record for record in iter_nav_records(lines)}
+    result = ingest_nav_records(db, records.values())
+    nav_snapshot.replace(records)
+    return result
+
+
+def _load_feed_state(db: Session, url: str) -> NavFeedState:
+    state = db.query(NavFeedState).get(url)
+    if state is None:
+        return NavFeedState(url=url)
+    # Detach so the ingestion commit doesn't expire it while it is being updated.
+    db.expunge(state)
+    return state
+
+
+def _save_feed_state(db: Session, state: NavFeedState) -> None:
+    db.merge(state)
+    db.commit()
+
+
+def feed_checked_at(db: Session, url: Optional[str] = None) -> Optional[datetime]:
+    """When any worker last checked the feed at `url`, or None if it never has."""
+    return _load_feed_state(db, url or settings.AMFI_NAV_URL).checked_at
+
+
+async def refresh_mutual_funds(db: Session, url: Optional[str] = None) -> Dict:
+    """
+    Sync the AMFI feed only if it changed since the last successful run.
+
+    The feed is skipped without parsing when the server returns 304 or the
+    downloaded body hashes to the same digest as last time.
+    """
+    url = url or settings.AMFI_NAV_URL
+    state = await asyncio.to_thread(_load_feed_state, db, url)
+    download = await download_feed(url, state.etag, state.last_modified)
+    now = datetime.now(timezone.utc)
+    result = {"status": "not_modified"}
+
+    if download is not None:
+        with download.body:
+            if download.content_hash == state.content_hash:
+                result = {"status": "unchanged"}
+            else:
+                started = time.monotonic()
+                result = await asyncio.to_thread(_ingest_feed_body, db, download.body)
+                result["elapsed_seconds"] = round(time.monotonic() - started, 3)
+                result["status"] = "synced"
+                state.content_hash = download.content_hash
+                state.synced_at = now
+        state.etag = download.etag
+        state.last_modified = download.last_modified
+
+    state.checked_at = now
+    await asyncio.to_thread(_save_feed_state, db, state)
+    logger.info("NAV refresh for %s: %s", url, result)
+    return result
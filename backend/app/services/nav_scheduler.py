@@ -0,0 +1,135 @@
+"""In-process scheduler that keeps mutual fund NAVs fresh in the background."""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from app import crud
+from app.db.session import SessionLocal, engine
+from app.services.fund_scores import refresh_fund_scores
+from app.services.nav_ingestion import feed_checked_at, refresh_mutual_funds
+from app.services.portfolio_history import snapshot_date_today, take_portfolio_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for the Postgres advisory lock that elects
+# a single worker to run the refresh when uvicorn runs several processes.
+NAV_REFRESH_LOCK_KEY = 72_110_001
+# A run is skipped when the feed was checked less than the interval minus
+# this ago, so the worker that ran last isn't held off by its own download time.
+RUN_SPACING_SLACK_SECONDS = 60
+
+
+def _try_lock(conn) -> bool:
+    return conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": NAV_REFRESH_LOCK_KEY}).scalar()
+
+
+def _unlock(conn) -> None:
+    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": NAV_REFRESH_LOCK_KEY})
+
+
+async def acquire_refresh_lock():
+    """
+    Take the refresh leader lock on a dedicated connection.
+
+    Returns the connection holding it, or None if another run holds it.
+    Pass the connection to `release_refresh_lock` when done.
+    """
+    conn = await asyncio.to_thread(engine.connect)
+    try:
+        if await asyncio.to_thread(_try_lock, conn):
+            return conn
+    except Exception:
+        conn.close()
+        raise
+    conn.close()
+    return None
+
+
+async def release_refresh_lock(conn) -> None:
+    try:
+        await asyncio.to_thread(_unlock, conn)
+    finally:
+        conn.close()
+
+
+async def run_nav_refresh(url: Optional[str] = None, min_interval_seconds: float = 0) -> Optional[Dict]:
+    """
+    Run one refresh if this process can take the leader lock.
+
+    The lock only covers a single run, so every worker's scheduler would
+    otherwise refresh once per interval. The feed's last check time is kept
+    in the database, and a run is skipped when any worker checked the feed
+    within `min_interval_seconds` (less RUN_SPACING_SLACK_SECONDS).
+
+    Returns None when another worker holds the lock or ran recently.
+    """
+    lock_conn = await acquire_refresh_lock()
+    if lock_conn is None:
+        logger.debug("NAV refresh skipped: another worker holds the lock")
+        return None
+    try:
+        db = SessionLocal()
+        try:
+            if min_interval_seconds:
+                checked_at = await asyncio.to_thread(feed_checked_at, db, url)
+                spacing = timedelta(seconds=max(min_interval_seconds - RUN_SPACING_SLACK_SECONDS, 0))
+                if checked_at is not None and datetime.now(timezone.utc) - checked_at < spacing:
+                    logger.debug("NAV refresh skipped: feed was checked at %s", checked_at)
+                    return None
+            result = await refresh_mutual_funds(db, url)
+            # Rescore after new NAVs land, or on first start when nothing is scored yet.
+            scored = await asyncio.to_thread(crud.fund_score.get_ranked, db, limit=1)
+            if result.get("status") == "synced" or not scored:
+                result["fund_scores"] = await refresh_fund_scores()
+            # Write today's snapshot once, and again whenever new NAVs revalued holdings.
+            snapshot_taken = await asyncio.to_thread(
+                crud.portfolio_snapshot.exists_for, db, snapshot_date=snapshot_date_today()
+            )
+            if result.get("status") == "synced" or not snapshot_taken:
+                result["portfolio_snapshot"] = await asyncio.to_thread(take_portfolio_snapshot, db)
+            return result
+        finally:
+            db.close()
+    finally:
+        await release_refresh_lock(lock_conn)
+
+
+class NavRefreshScheduler:
+    """Runs `run_nav_refresh` every `interval_seconds` plus random jitter."""
+
+    def __init__(self, interval_seconds: float, jitter_seconds: float = 0, url: Optional[str] = None):
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.url = url
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="nav-refresh")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def next_delay(self) -> float:
+        return self.interval_seconds + random.uniform(0, self.jitter_seconds)
+
+    async def _run(self) -> None:
+        # Jitter the first run too so freshly started workers don't fire together.
+        await asyncio.sleep(random.uniform(0, self.jitter_seconds))
+        while True:
+            try:
+                await run_nav_refresh(self.url, min_interval_seconds=self.interval_seconds)
+            except Exception as e:
+                logger.error(f"Scheduled NAV refresh failed: {e}")
+            await asyncio.sleep(self.next_delay())
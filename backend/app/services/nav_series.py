@@ -0,0 +1,133 @@
+"""Parsed, array-backed NAV series shared by the recommendation and fund-detail paths."""
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from app.services.nav_archive import EPOCH, get_nav_archive
+from app.services.rolling_returns import ROLLING_WINDOWS_YEARS, parse_mfapi_series, rolling_return_stats
+
+# Look-back in days for each trailing period; Inception is measured from the first NAV.
+TRAILING_PERIODS = {
+    "1W": 7,
+    "1M": 30,
+    "3M": 90,
+    "6M": 180,
+    "1Y": 365,
+    "3Y": 365 * 3,
+    "5Y": 365 * 5,
+    "Inception": None,
+}
+
+
+def to_day_number(value: date) -> int:
+    return value.toordinal() - EPOCH.toordinal()
+
+
+def from_day_number(day: int) -> date:
+    return date.fromordinal(EPOCH.toordinal() + int(day))
+
+
+class NavSeries:
+    """
+    Ascending NAV history held as int32 day numbers and float64 NAVs.
+
+    Dates are parsed once on construction; lookups are binary searches.
+    """
+
+    __slots__ = ("scheme_code", "days", "navs")
+
+    def __init__(self, days: np.ndarray, navs: np.ndarray, scheme_code: Optional[str] = None):
+        self.scheme_code = scheme_code
+        self.days = days
+        self.navs = navs
+
+    @classmethod
+    def from_mfapi(cls, nav_data: List[Dict], scheme_code: Optional[str] = None) -> "NavSeries":
+        days, navs = parse_mfapi_series(nav_data)
+        return cls(days, navs, scheme_code)
+
+    @classmethod
+    def from_archive(cls, scheme_code: str) -> Optional["NavSeries"]:
+        """Zero-copy series from the NAV archive, or None if it isn't archived."""
+        archive = get_nav_archive()
+        series = archive.get(scheme_code) if archive else None
+        if series is None:
+            return None
+        return cls(*series, scheme_code=scheme_code)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @property
+    def first_date(self) -> Optional[date]:
+        return from_day_number(self.days[0]) if len(self.days) else None
+
+    @property
+    def latest_date(self) -> Optional[date]:
+        return from_day_number(self.days[-1]) if len(self.days) else None
+
+    @property
+    def latest_nav(self) -> Optional[float]:
+        return float(self.navs[-1]) if len(self.navs) else None
+
+    def between(self, start: Optional[date] = None, end: Optional[date] = None) -> "NavSeries":
+        """Sub-series within [start, end] as views over the same arrays."""
+        lo = np.searchsorted(self.days, to_day_number(start), side="left") if start else 0
+        hi = np.searchsorted(self.days, to_day_number(end), side="right") if end else len(self.days)
+        return NavSeries(self.days[lo:hi], self.navs[lo:hi], self.scheme_code)
+
+    def closest_indices(self, targets: np.ndarray) -> np.ndarray:
+        """Index of the NAV closest to each target day number (ties go to the earlier date)."""
+        right = np.clip(np.searchsorted(self.days, targets, side="left"), 0, len(self.days) - 1)
+        left = np.maximum(right - 1, 0)
+        use_left = np.abs(targets - self.days[left]) <= np.abs(self.days[right] - targets)
+        return np.where(use_left, left, right)
+
+    def nav_on(self, target: Union[date, int]) -> Optional[tuple]:
+        """(date, nav) of the NAV closest to `target`."""
+        if not len(self.days):
+            return None
+        day = to_day_number(target) if isinstance(target, date) else target
+        idx = int(self.closest_indices(np.asarray([day]))[0])
+        return from_day_number(self.days[idx]), float(self.navs[idx])
+
+    def trailing_returns(self, periods: Iterable[str] = TRAILING_PERIODS) -> Dict[str, Optional[float]]:
+        """
+        Trailing return (%) per period, all resolved with one vectorized lookup.
+
+        Periods of a year or more are CAGR, shorter ones absolute. A period
+        longer than the available history, or starting from a non-positive
+        NAV, is None.
+        """
+        periods = list(periods)
+        if not len(self.days):
+            return {period: None for period in periods}
+
+        latest_day = int(self.days[-1])
+        latest_nav = float(self.navs[-1])
+        history_days = latest_day - int(self.days[0])
+        lookbacks = np.asarray(
+            [history_days if TRAILING_PERIODS[p] is None else TRAILING_PERIODS[p] for p in periods]
+        )
+        indices = self.closest_indices(latest_day - lookbacks)
+
+        returns = {}
+        for period, lookback, idx in zip(periods, lookbacks, indices):
+            if TRAILING_PERIODS[period] is not None and history_days < lookback:
+                returns[period] = None
+                continue
+            start_nav = float(self.navs[idx])
+            days_diff = latest_day - int(self.days[idx])
+            if not start_nav > 0:
+                returns[period] = None
+            elif days_diff == 0:
+                returns[period] = 0.0
+            elif days_diff >= 365:
+                returns[period] = ((latest_nav / start_nav) ** (365 / days_diff) - 1) * 100
+            else:
+                returns[period] = (latest_nav - start_nav) / start_nav * 100
+        return returns
+
+    def rolling_return_stats(self, windows: Iterable[int] = ROLLING_WINDOWS_YEARS) -> Dict[str, Optional[Dict]]:
+        return rolling_return_stats(self.days, self.navs, windows)
@@ -0,0 +1,89 @@
+"""Process-wide snapshot of the latest AMFI NAVs keyed by scheme code."""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.services.http_client import market_data_client
+from app.utils.amfi import parse_nav_records_async
+
+logger = logging.getLogger(__name__)
+
+# After a failed load, wait this long before letting another request retry.
+LOAD_RETRY_SECONDS = 60
+
+
+async def load_amfi_records() -> Dict[str, Dict]:
+    lines = market_data_client.iter_lines(settings.AMFI_NAV_URL)
+    return {record["scheme_code"]: record async for record in parse_nav_records_async(lines)}
+
+
+class NavSnapshot:
+    """
+    TTL-refreshed dict of scheme_code -> parsed NAV record.
+
+    Concurrent misses are single-flighted: one task downloads the feed while
+    the others wait on the lock and then read the fresh snapshot. If a refresh
+    fails, the previous snapshot keeps being served.
+    """
+
+    def __init__(self, ttl_seconds: float, loader: Callable[[], Awaitable[Dict[str, Dict]]] = load_amfi_records):
+        self.ttl_seconds = ttl_seconds
+        self._loader = loader
+        self._records: Dict[str, Dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._loaded_at_wall: Optional[datetime] = None
+        self._failed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return True
+        return self._failed_at is not None and time.monotonic() - self._failed_at < LOAD_RETRY_SECONDS
+
+    async def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            try:
+                self.replace(await self._loader())
+            except Exception as e:
+                self._failed_at = time.monotonic()
+                logger.error(f"NAV snapshot refresh failed, serving {len(self._records)} cached records: {e}")
+
+    def replace(self, records: Dict[str, Dict]) -> None:
+        """Swap in a freshly parsed feed, e.g. one the ingestion job already downloaded."""
+        self._records = records
+        self._loaded_at = time.monotonic()
+        self._loaded_at_wall = datetime.now(timezone.utc)
+        self._failed_at = None
+
+    async def get(self, scheme_code: str) -> Optional[Dict]:
+        await self._ensure_fresh()
+        return self._records.get(scheme_code)
+
+    async def all_records(self) -> Dict[str, Dict]:
+        await self._ensure_fresh()
+        return self._records
+
+    def age_seconds(self) -> Optional[float]:
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    def stats(self) -> Dict:
+        age = self.age_seconds()
+        return {
+            "size": len(self._records),
+            "loaded_at": self._loaded_at_wall,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "ttl_seconds": self.ttl_seconds,
+            "stale": age is None or age >= self.ttl_seconds,
+        }
+
+
+nav_snapshot = NavSnapshot(ttl_seconds=settings.NAV_SNAPSHOT_TTL_MINUTES * 60)
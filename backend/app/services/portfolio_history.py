@@ -0,0 +1,98 @@
+"""Daily portfolio value snapshots: the nightly write and chart-ready reads."""
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.services.downsampling import select_indices
+from app.services.nav_series import from_day_number, to_day_number
+from app.utils.http_cache import IST
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DAYS = 365
+
+
+def snapshot_date_today() -> date:
+    """Snapshots are dated by the Indian business day the NAVs belong to."""
+    return datetime.now(IST).date()
+
+
+def take_portfolio_snapshot(db: Session) -> Dict:
+    """
+    Snapshot every user's current per-type totals as today's and commit.
+
+    There is no date argument: the totals are always today's, so writing
+    them under another date would overwrite that day's real history.
+    """
+    started = time.monotonic()
+    snapshot_date = snapshot_date_today()
+    try:
+        rows = crud.portfolio_snapshot.snapshot_all(db, snapshot_date=snapshot_date)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    stats = {
+        "snapshot_date": snapshot_date,
+        "rows": rows,
+        "elapsed_seconds": round(time.monotonic() - started, 3),
+    }
+    logger.info("Portfolio snapshot %(snapshot_date)s: %(rows)s rows in %(elapsed_seconds)ss", stats)
+    return stats
+
+
+def portfolio_history(
+    db: Session,
+    owner_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    resolution: str = "lttb",
+    points: Optional[int] = None,
+) -> Dict:
+    """
+    A user's invested and current value over time, overall and per asset type.
+
+    Days on which a type has no snapshot count as zero for it. The series is
+    thinned by `resolution` (see services.downsampling); LTTB follows the
+    total current value, and weekly/monthly keep each period's last snapshot.
+    """
+    end = end or snapshot_date_today()
+    start = start or end - timedelta(days=DEFAULT_HISTORY_DAYS)
+    rows = crud.portfolio_snapshot.get_range(db, owner_id=owner_id, start=start, end=end)
+    if not rows:
+        return {"start_date": start, "end_date": end, "resolution": resolution,
+                "dates": [], "total_invested": [], "total_current": [], "by_type": {}}
+
+    row_days = np.asarray([to_day_number(row.snapshot_date) for row in rows])
+    days, day_idx = np.unique(row_days, return_inverse=True)
+    types = sorted({row.investment_type for row in rows})
+    type_column = {investment_type: col for col, investment_type in enumerate(types)}
+    type_idx = np.asarray([type_column[row.investment_type] for row in rows])
+
+    invested = np.zeros((len(days), len(types)))
+    current = np.zeros((len(days), len(types)))
+    invested[day_idx, type_idx] = [float(row.total_invested) for row in rows]
+    current[day_idx, type_idx] = [float(row.total_current) for row in rows]
+    total_current = current.sum(axis=1)
+
+    keep = select_indices(days, total_current, resolution, points)
+    return {
+        "start_date": start,
+        "end_date": end,
+        "resolution": resolution,
+        "dates": [from_day_number(day) for day in days[keep]],
+        "total_invested": invested.sum(axis=1)[keep].round(2).tolist(),
+        "total_current": total_current[keep].round(2).tolist(),
+        "by_type": {
+            investment_type: {
+                "invested": invested[keep, col].round(2).tolist(),
+                "current": current[keep, col].round(2).tolist(),
+            }
+            for col, investment_type in enumerate(types)
+        },
+    }
@@ -0,0 +1,96 @@
+"""Money-weighted returns (XIRR) from the transaction ledger, per holding, per asset type and overall."""
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models.investment import Investment
+from app.services.xirr import xirr_batch
+
+
+def grouped_xirr(
+    flow_rows: np.ndarray, flow_days: np.ndarray, flow_amounts: np.ndarray, row_count: int
+) -> np.ndarray:
+    """
+    XIRR (as a fraction) of each group of cash flows, solved in one batch.
+
+    Flows are given flat with the row (group) each belongs to; a flow may be
+    listed once per group it counts towards. Same-day flows within a row are
+    netted before the rows are padded into one matrix. Rows without a root
+    are NaN.
+    """
+    if not len(flow_rows):
+        return np.full(row_count, np.nan)
+    flow_days = flow_days.astype(np.int64)
+    offset = flow_days.min()
+    keys = flow_rows.astype(np.int64) << 32 | (flow_days - offset)
+    keys, inverse = np.unique(keys, return_inverse=True)
+    amounts = np.bincount(inverse, weights=flow_amounts, minlength=len(keys))
+    rows = (keys >> 32).astype(np.intp)
+    days = (keys & 0xFFFFFFFF) + offset
+
+    # Keys are sorted by row then day, so each row's flows are contiguous.
+    counts = np.bincount(rows, minlength=row_count)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    cols = np.arange(len(rows)) - starts[rows]
+    amount_matrix = np.zeros((row_count, int(counts.max())))
+    year_matrix = np.zeros_like(amount_matrix)
+    amount_matrix[rows, cols] = amounts
+    year_matrix[rows, cols] = (days - days[starts[rows]]) / 365.0
+    return xirr_batch(amount_matrix, year_matrix)
+
+
+def compute_portfolio_xirr(
+    holdings: Sequence[tuple], cash_flows: Sequence[tuple], as_of: date
+) -> Dict:
+    """
+    XIRR (%) of every holding, every asset type and the whole portfolio.
+
+    `holdings` are (id, investment_type, current_value) and `cash_flows`
+    (investment_id, date, signed amount). Each holding's current value is
+    treated as a redemption on `as_of`. Holdings without transactions have
+    no dated cash flows, so they are left out of every XIRR.
+    """
+    if not cash_flows:
+        return {"as_of": as_of, "portfolio": None, "by_type": {}, "holdings": {}}
+    ledger_ids = {investment_id for investment_id, _, _ in cash_flows}
+    holdings = [h for h in holdings if h[0] in ledger_ids]
+    types = sorted({investment_type for _, investment_type, _ in holdings})
+    holding_row = {holding_id: i for i, (holding_id, _, _) in enumerate(holdings)}
+    type_row = {investment_type: len(holdings) + i for i, investment_type in enumerate(types)}
+    portfolio_row = len(holdings) + len(types)
+
+    flows = [(holding_row[investment_id], flow_date.toordinal(), float(amount))
+             for investment_id, flow_date, amount in cash_flows]
+    flows += [(holding_row[holding_id], as_of.toordinal(), float(current_value or 0))
+              for holding_id, _, current_value in holdings]
+    holding_idx = np.asarray([row for row, _, _ in flows], dtype=np.intp)
+    days = np.asarray([day for _, day, _ in flows], dtype=np.int64)
+    amounts = np.asarray([amount for _, _, amount in flows], dtype=np.float64)
+
+    # Each flow counts towards its holding, its asset type and the portfolio.
+    holding_type_row = np.asarray([type_row[investment_type] for _, investment_type, _ in holdings], dtype=np.intp)
+    rows = np.concatenate([holding_idx, holding_type_row[holding_idx], np.full(len(holding_idx), portfolio_row)])
+    rates = grouped_xirr(rows, np.tile(days, 3), np.tile(amounts, 3), portfolio_row + 1) * 100
+
+    def pct(row: int) -> Optional[float]:
+        return None if np.isnan(rates[row]) else float(rates[row])
+
+    return {
+        "as_of": as_of,
+        "portfolio": pct(portfolio_row),
+        "by_type": {investment_type: pct(row) for investment_type, row in type_row.items()},
+        "holdings": {holding_id: pct(row) for holding_id, row in holding_row.items()},
+    }
+
+
+def get_portfolio_xirr(db: Session, owner_id: int, as_of: Optional[date] = None) -> Dict:
+    holdings: List[tuple] = (
+        db.query(Investment.id, Investment.investment_type, Investment.current_value)
+        .filter(Investment.owner_id == owner_id)
+        .all()
+    )
+    cash_flows = crud.investment_transaction.get_cash_flows_by_owner(db, owner_id=owner_id)
+    return compute_portfolio_xirr(holdings, cash_flows, as_of or date.today())
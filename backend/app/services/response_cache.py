@@ -0,0 +1,267 @@
+"""
+Two-tier cache for external API responses.
+
+Tier one is an in-process LRU bounded by a byte budget; tier two is a
+directory of JSON files shared by every worker on the host, so restarts and
+new workers start warm. Entries carry their own TTL plus a stale window in
+which the stale value is served while one background task refreshes it.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prune the disk tier down to this fraction of its budget once it overflows.
+DISK_PRUNE_TARGET = 0.8
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    size: int
+    stored_at: float
+    expires_at: float
+    stale_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def is_usable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+class TieredCache:
+    def __init__(self, directory: str, max_memory_bytes: int, max_disk_bytes: int):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background: set = set()
+        self._metrics = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stale_served": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "evictions": 0,
+        }
+
+    # Memory tier
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+        if entry.size > self.max_memory_bytes:
+            return
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self._metrics["evictions"] += 1
+
+    def _recall(self, key: str) -> Optional[CacheEntry]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        return entry
+
+    # Disk tier
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(key), "rb") as f:
+                raw = f.read()
+            record = json.loads(raw)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable cache file for {key}: {e}")
+            return None
+        if record.get("key") != key:
+            return None
+        return CacheEntry(record["value"], len(raw), record["stored_at"], record["expires_at"], record["stale_until"])
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> int:
+        """Atomically write an entry; returns its serialized size."""
+        raw = json.dumps({
+            "key": key,
+            "stored_at": entry.stored_at,
+            "expires_at": entry.expires_at,
+            "stale_until": entry.stale_until,
+            "value": entry.value,
+        }, separators=(",", ":")).encode()
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        self._track_disk(len(raw) - replaced)
+        return len(raw)
+
+    def _disk_files(self):
+        try:
+            with os.scandir(self.directory) as it:
+                return [(e.path, e.stat()) for e in it if e.name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+
+    def _track_disk(self, written: int) -> None:
+        """Add the net bytes written (new size minus any file replaced) and prune if over budget."""
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(stat.st_size for _, stat in self._disk_files())
+        else:
+            self._disk_bytes += written
+        if self._disk_bytes > self.max_disk_bytes:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Delete least recently written files until under the prune target."""
+        files = sorted(self._disk_files(), key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in files)
+        for path, stat in files:
+            if total <= self.max_disk_bytes * DISK_PRUNE_TARGET:
+                break
+            try:
+                os.unlink(path)
+                total -= stat.st_size
+            except FileNotFoundError:
+                pass
+        self._disk_bytes = total
+
+    # Public API
+
+    async def _lookup(self, key: str) -> Optional[CacheEntry]:
+        entry = self._recall(key)
+        if entry is not None:
+            self._metrics["memory_hits"] += 1
+            return entry
+        entry = await asyncio.to_thread(self._read_disk, key)
+        if entry is not None:
+            self._metrics["disk_hits"] += 1
+            self._remember(key, entry)
+        return entry
+
+    async def _refresh(
+        self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float
+    ) -> Optional[CacheEntry]:
+        # Another worker may have refreshed the shared disk tier meanwhile.
+        on_disk = await asyncio.to_thread(self._read_disk, key)
+        if on_disk is not None and on_disk.is_fresh(time.time()):
+            self._remember(key, on_disk)
+            return on_disk
+
+        self._metrics["refreshes"] += 1
+        try:
+            value = await loader()
+        except Exception as e:
+            logger.error(f"Cache refresh for {key} failed: {e}")
+            value = None
+        if value is None:
+            self._metrics["refresh_failures"] += 1
+            return None
+
+        now = time.time()
+        entry = CacheEntry(value, 0, now, now + ttl, now + ttl + stale_ttl)
+        try:
+            size = await asyncio.to_thread(self._write_disk, key, entry)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not persist cache entry {key}: {e}")
+            size = len(json.dumps(value, separators=(",", ":")))
+        entry = entry._replace(size=size)
+        self._remember(key, entry)
+        return entry
+
+    def _single_flight(
+        self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float
+    ) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, loader, ttl, stale_ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float = 0
+    ) -> Any:
+        """
+        Return the cached value for `key`, loading it when needed.
+
+        Fresh entries are returned directly. Entries within `stale_ttl` after
+        expiry are returned immediately while a background refresh runs.
+        Otherwise every concurrent caller awaits the same single load. If a
+        load fails (loader raises or returns None) the stale value, if any,
+        is served. None results are never cached.
+
+        The returned value is the cached object itself and is shared between
+        callers; copy it before modifying it.
+        """
+        now = time.time()
+        entry = await self._lookup(key)
+        if entry is not None and entry.is_fresh(now):
+            return entry.value
+        if entry is not None and entry.is_usable(now):
+            self._metrics["stale_served"] += 1
+            task = self._single_flight(key, loader, ttl, stale_ttl)
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+            return entry.value
+
+        self._metrics["misses"] += 1
+        refreshed = await asyncio.shield(self._single_flight(key, loader, ttl, stale_ttl))
+        if refreshed is not None:
+            return refreshed.value
+        return entry.value if entry is not None else None
+
+    def invalidate(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict:
+        return {
+            **self._metrics,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "max_disk_bytes": self.max_disk_bytes,
+            "inflight": len(self._inflight),
+        }
+
+
+api_cache = TieredCache(
+    settings.HTTP_CACHE_DIR,
+    max_memory_bytes=settings.HTTP_CACHE_MEMORY_MB * 1024 * 1024,
+    max_disk_bytes=settings.HTTP_CACHE_DISK_MB * 1024 * 1024,
+)
@@ -0,0 +1,72 @@
+"""Set-based mark-to-market revaluation of mutual fund holdings."""
+import logging
+import time
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models.investment import Investment
+from app.models.mutual_fund import MutualFund
+from app.models.portfolio_aggregate import PortfolioAggregate
+
+logger = logging.getLogger(__name__)
+
+
+def revalue_holdings(db: Session, scheme_codes: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Set current_value = units x latest NAV for every holding with units.
+
+    Runs as one UPDATE ... FROM mutual_funds, restricted to `scheme_codes`
+    when given. Rows already at the right value are not rewritten. The
+    change in value is first added to portfolio_aggregates with one more
+    set-based UPDATE, and the data version of every affected owner is
+    bumped. Does not commit, so it can share the NAV ingestion transaction.
+    """
+    started = time.monotonic()
+    new_value = func.round(Investment.units * MutualFund.nav, 2)
+    conditions = [
+        Investment.scheme_code == MutualFund.scheme_code,
+        Investment.units.isnot(None),
+        MutualFund.nav.isnot(None),
+        Investment.current_value.is_distinct_from(new_value),
+    ]
+    if scheme_codes is not None:
+        scheme_codes = list(scheme_codes)
+        if not scheme_codes:
+            return {"rows_touched": 0, "elapsed_seconds": 0.0}
+        conditions.append(MutualFund.scheme_code.in_(scheme_codes))
+
+    deltas = (
+        select(
+            Investment.owner_id,
+            Investment.investment_type,
+            func.sum(new_value - func.coalesce(Investment.current_value, 0)).label("delta"),
+        )
+        .where(*conditions)
+        .group_by(Investment.owner_id, Investment.investment_type)
+        .subquery()
+    )
+    db.execute(
+        update(PortfolioAggregate)
+        .values(total_current=PortfolioAggregate.total_current + deltas.c.delta, updated_at=func.now())
+        .where(
+            PortfolioAggregate.owner_id == deltas.c.owner_id,
+            PortfolioAggregate.investment_type == deltas.c.investment_type,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    stmt = (
+        update(Investment)
+        .values(current_value=new_value)
+        .where(*conditions)
+        .returning(Investment.owner_id)
+        .execution_options(synchronize_session=False)
+    )
+    owner_ids = db.execute(stmt).scalars().all()
+    crud.user_data_version.bump(db, owner_ids=owner_ids)
+    rows_touched = len(owner_ids)
+    stats = {"rows_touched": rows_touched, "elapsed_seconds": round(time.monotonic() - started, 3)}
+    logger.info("Revalued holdings: %(rows_touched)s rows in %(elapsed_seconds)ss", stats)
+    return stats
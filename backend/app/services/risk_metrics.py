@@ -0,0 +1,166 @@
+"""Vectorized risk metrics for many funds at once from an aligned NAV matrix."""
+import warnings
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.nav_series import NavSeries, from_day_number
+
+TRADING_DAYS_PER_YEAR = 252
+# Fewer daily returns than this and the statistics are too noisy to report.
+MIN_OBSERVATIONS = 60
+
+METRIC_NAMES = (
+    "annualized_return",
+    "volatility",
+    "max_drawdown",
+    "max_drawdown_recovery_days",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "beta",
+    "alpha",
+    "tracking_error",
+)
+
+
+def build_nav_matrix(series: List[NavSeries], grid: np.ndarray) -> np.ndarray:
+    """
+    Align each series onto the `grid` day numbers as one (days x funds) matrix.
+
+    A fund's NAV is carried forward over days it didn't publish; days before
+    its first NAV are NaN.
+    """
+    matrix = np.full((len(grid), len(series)), np.nan)
+    for col, s in enumerate(series):
+        if not len(s):
+            continue
+        idx = np.searchsorted(s.days, grid, side="right") - 1
+        known = idx >= 0
+        matrix[known, col] = s.navs[idx[known]]
+    return matrix
+
+
+def _drawdowns(matrix: np.ndarray, grid: np.ndarray):
+    """Max drawdown (%) per column and the calendar days from its trough until the prior peak is regained."""
+    running_peak = np.fmax.accumulate(matrix, axis=0)
+    drawdown = matrix / running_peak - 1
+    filled = np.where(np.isnan(drawdown), np.inf, drawdown)
+    trough = filled.argmin(axis=0)
+    cols = np.arange(matrix.shape[1])
+    max_drawdown = filled[trough, cols]
+
+    peak_value = running_peak[trough, cols]
+    after_trough = np.arange(len(grid))[:, None] > trough[None, :]
+    recovered = after_trough & (matrix >= peak_value[None, :])
+    has_recovered = recovered.any(axis=0)
+    recovery_days = np.where(
+        has_recovered, grid[recovered.argmax(axis=0)] - grid[trough], np.nan
+    ).astype(float)
+    recovery_days[max_drawdown == 0] = 0.0
+    max_drawdown = np.where(np.isinf(max_drawdown), np.nan, max_drawdown * 100)
+    return max_drawdown, recovery_days
+
+
+def compute_risk_metrics(
+    matrix: np.ndarray,
+    grid: np.ndarray,
+    benchmark: Optional[np.ndarray] = None,
+    risk_free_rate: Optional[float] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute every metric for every column of `matrix` in one pass.
+
+    Returns {metric: array of one value per fund}; NaN means not enough data.
+    Rates and returns are annualized percentages, ratios are plain numbers.
+    """
+    risk_free_rate = settings.RISK_FREE_RATE if risk_free_rate is None else risk_free_rate
+    daily_rf = risk_free_rate / TRADING_DAYS_PER_YEAR
+    returns = matrix[1:] / matrix[:-1] - 1
+    observations = np.sum(~np.isnan(returns), axis=0)
+    enough = observations >= MIN_OBSERVATIONS
+
+    # All-NaN columns (funds with no data in the window) warn; they are masked out below.
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(returns, axis=0)
+        std = np.nanstd(returns, axis=0, ddof=1)
+        downside = np.sqrt(np.nanmean(np.minimum(returns - daily_rf, 0) ** 2, axis=0))
+        annualized_return = mean * TRADING_DAYS_PER_YEAR
+        volatility = std * np.sqrt(TRADING_DAYS_PER_YEAR)
+        metrics = {
+            "annualized_return": annualized_return * 100,
+            "volatility": volatility * 100,
+            "sharpe_ratio": (annualized_return - risk_free_rate) / volatility,
+            "sortino_ratio": (annualized_return - risk_free_rate) / (downside * np.sqrt(TRADING_DAYS_PER_YEAR)),
+        }
+        metrics["max_drawdown"], metrics["max_drawdown_recovery_days"] = _drawdowns(matrix, grid)
+
+        if benchmark is not None:
+            bench_returns = benchmark[1:] / benchmark[:-1] - 1
+            # Pair each fund only with benchmark days on which the fund itself has a return.
+            paired = np.where(np.isnan(returns), np.nan, bench_returns[:, None])
+            bench_mean = np.nanmean(paired, axis=0)
+            covariance = np.nanmean((returns - mean) * (paired - bench_mean), axis=0)
+            beta = covariance / np.nanvar(paired, axis=0)
+            bench_annual = bench_mean * TRADING_DAYS_PER_YEAR
+            metrics["beta"] = beta
+            metrics["alpha"] = (annualized_return - (risk_free_rate + beta * (bench_annual - risk_free_rate))) * 100
+            metrics["tracking_error"] = (
+                np.nanstd(returns - paired, axis=0, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR) * 100
+            )
+        else:
+            nan = np.full(matrix.shape[1], np.nan)
+            metrics.update(beta=nan, alpha=nan, tracking_error=nan)
+
+    for name, values in metrics.items():
+        metrics[name] = np.where(enough & np.isfinite(values), values, np.nan)
+    return metrics
+
+
+def risk_metric_rows(
+    series: List[NavSeries],
+    benchmark: Optional[NavSeries] = None,
+    lookback_years: Optional[int] = None,
+    risk_free_rate: Optional[float] = None,
+) -> List[Dict]:
+    """
+    Risk metrics for a batch of funds over the trailing `lookback_years`.
+
+    The day grid is the benchmark's trading calendar when one is given,
+    otherwise the union of the funds' NAV dates. Returns one dict per input
+    series, shaped for the fund_risk_metrics table.
+    """
+    lookback_years = lookback_years or settings.RISK_LOOKBACK_YEARS
+    risk_free_rate = settings.RISK_FREE_RATE if risk_free_rate is None else risk_free_rate
+    series = [s for s in series if len(s)]
+    if not series:
+        return []
+
+    if benchmark is not None and len(benchmark):
+        grid = benchmark.days
+    else:
+        benchmark = None
+        grid = np.unique(np.concatenate([s.days for s in series]))
+    end = grid[-1]
+    grid = grid[grid >= end - lookback_years * 365]
+
+    matrix = build_nav_matrix(series, grid)
+    bench_navs = build_nav_matrix([benchmark], grid)[:, 0] if benchmark is not None else None
+    metrics = compute_risk_metrics(matrix, grid, bench_navs, risk_free_rate)
+
+    rows = []
+    for col, s in enumerate(series):
+        row = {
+            "scheme_code": s.scheme_code,
+            "benchmark_code": benchmark.scheme_code if benchmark is not None else None,
+            "risk_free_rate": risk_free_rate,
+            "period_start": from_day_number(grid[0]),
+            "period_end": from_day_number(grid[-1]),
+            "nav_date": from_day_number(s.days[-1]),
+        }
+        for name in METRIC_NAMES:
+            value = metrics[name][col]
+            row[name] = None if np.isnan(value) else float(value)
+        rows.append(row)
+    return rows
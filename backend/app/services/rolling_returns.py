@@ -0,0 +1,102 @@
+"""Vectorized rolling-return statistics over NAV series."""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.nav_archive import EPOCH
+
+MFAPI_DATE_FORMAT = "%d-%m-%Y"
+
+ROLLING_WINDOWS_YEARS = (1, 3, 5, 7)
+# A window counts only if its start NAV is within this many days of the exact anniversary.
+WINDOW_TOLERANCE_DAYS = 7
+PERCENTILES = (5, 25, 75, 95)
+# Annualized return levels (in %) reported as "share of windows above".
+RETURN_THRESHOLDS = (0, 8, 12, 15)
+
+
+def parse_mfapi_series(nav_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse mfapi {'date': 'dd-mm-YYYY', 'nav': '...'} rows once into ascending
+    (int32 day numbers since 1970-01-01, float64 NAV) arrays. Rows with a
+    missing, zero, negative or non-numeric NAV are dropped.
+    """
+    epoch = EPOCH.toordinal()
+    days, navs = [], []
+    for entry in nav_data:
+        try:
+            day = datetime.strptime(entry['date'], MFAPI_DATE_FORMAT).toordinal() - epoch
+            nav = float(entry['nav'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not nav > 0:  # also rejects NaN
+            continue
+        days.append(day)
+        navs.append(nav)
+    days = np.asarray(days, dtype=np.int32)
+    navs = np.asarray(navs, dtype=np.float64)
+    order = np.argsort(days, kind="stable")
+    return days[order], navs[order]
+
+
+def window_returns(days: np.ndarray, navs: np.ndarray, years: int) -> np.ndarray:
+    """
+    Annualized return (%) of every window of `years` that ends on a NAV date.
+
+    Each end date is matched with the first NAV on or after its anniversary via
+    `searchsorted`; windows whose start drifts more than WINDOW_TOLERANCE_DAYS
+    from the anniversary (data gaps, fund too young) are dropped.
+    """
+    window_days = years * 365
+    if len(days) < 2:
+        return np.empty(0)
+    end_idx = np.arange(len(days))
+    start_idx = np.searchsorted(days, days - window_days, side="left")
+    start_idx = np.minimum(start_idx, end_idx)
+    span = (days - days[start_idx]).astype(np.int64)
+    start_navs = navs[start_idx]
+    valid = (
+        (start_idx < end_idx)
+        & (np.abs(span - window_days) <= WINDOW_TOLERANCE_DAYS)
+        & (start_navs > 0)
+    )
+    span = span[valid]
+    growth = navs[valid] / start_navs[valid]
+    return (np.power(growth, 365.0 / span) - 1) * 100
+
+
+def summarize(returns: np.ndarray, thresholds: Sequence[float] = RETURN_THRESHOLDS) -> Optional[Dict]:
+    if not len(returns):
+        return None
+    stats = {
+        "windows": int(len(returns)),
+        "mean": float(returns.mean()),
+        "median": float(np.median(returns)),
+        "min": float(returns.min()),
+        "max": float(returns.max()),
+    }
+    for pct, value in zip(PERCENTILES, np.percentile(returns, PERCENTILES)):
+        stats[f"p{pct}"] = float(value)
+    stats["share_above"] = {
+        str(threshold): float((returns > threshold).mean() * 100) for threshold in thresholds
+    }
+    return stats
+
+
+def rolling_return_stats(
+    days: np.ndarray,
+    navs: np.ndarray,
+    windows: Iterable[int] = ROLLING_WINDOWS_YEARS,
+    thresholds: Sequence[float] = RETURN_THRESHOLDS,
+) -> Dict[str, Optional[Dict]]:
+    """
+    Rolling CAGR statistics for each window, keyed "1Y", "3Y", ...
+
+    `days`/`navs` must be ascending, as returned by `parse_mfapi_series` or
+    the NAV archive. A window with no complete periods maps to None.
+    """
+    return {
+        f"{years}Y": summarize(window_returns(days, navs, years), thresholds)
+        for years in windows
+    }
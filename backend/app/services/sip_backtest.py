@@ -0,0 +1,194 @@
+"""Backtest SIPs against real NAV history, for one start date or every possible start month."""
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.nav_series import NavSeries, from_day_number, to_day_number
+from app.services.rolling_returns import summarize
+from app.services.xirr import xirr_batch
+
+FREQUENCY_MONTHS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+# Share of start dates whose XIRR beat these annual rates (in %).
+XIRR_THRESHOLDS = (0, 8, 12, 15)
+
+
+def _month(day: int) -> np.datetime64:
+    return np.datetime64(int(day), "D").astype("datetime64[M]")
+
+
+def scheduled_days(first_month: np.datetime64, months: int, sip_day: int) -> np.ndarray:
+    """Day number of the `sip_day`-th of each month, for `months` consecutive months."""
+    month_starts = np.arange(first_month, first_month + months, dtype="datetime64[M]").astype("datetime64[D]")
+    return (month_starts + (sip_day - 1)).astype(np.int64)
+
+
+def _solve(amounts: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """XIRR (%) per row of (amount, day number) cash-flow matrices."""
+    years = (days - days[:, :1]) / 365.0
+    return xirr_batch(amounts, years) * 100
+
+
+def backtest_sip(
+    series: NavSeries,
+    amount: float,
+    frequency: str = "monthly",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    sip_day: int = 1,
+) -> Optional[Dict]:
+    """
+    Simulate one SIP: an instalment every period on `sip_day` (bought at the
+    first NAV on or after it), valued at the last NAV on or before `end`.
+
+    Returns None when no instalment falls inside the fund's history.
+    """
+    if not len(series):
+        return None
+    step = FREQUENCY_MONTHS[frequency]
+    first_day, last_day = int(series.days[0]), int(series.days[-1])
+    end_day = min(to_day_number(end), last_day) if end else last_day
+    start_day = max(to_day_number(start), first_day) if start else first_day
+
+    first_month, end_month = _month(start_day), _month(end_day)
+    months = int((end_month - first_month).astype(int)) + 1
+    planned = scheduled_days(first_month, months, sip_day)[::step]
+    planned = planned[(planned >= start_day) & (planned <= end_day)]
+    bought = np.searchsorted(series.days, planned, side="left")
+    bought = bought[(bought < len(series)) & (series.days[np.minimum(bought, len(series) - 1)] <= end_day)]
+    if not len(bought):
+        return None
+
+    valuation = np.searchsorted(series.days, end_day, side="right") - 1
+    navs = series.navs[bought]
+    units = amount / navs
+    cumulative_units = np.cumsum(units)
+    invested = amount * len(bought)
+    final_value = float(cumulative_units[-1] * series.navs[valuation])
+
+    flows = np.append(np.full(len(bought), -amount), final_value)[None, :]
+    flow_days = np.append(series.days[bought], series.days[valuation]).astype(np.float64)[None, :]
+    xirr = _solve(flows, flow_days)[0]
+
+    return {
+        "scheme_code": series.scheme_code,
+        "frequency": frequency,
+        "amount": amount,
+        "start_date": from_day_number(series.days[bought[0]]),
+        "valuation_date": from_day_number(series.days[valuation]),
+        "instalments": len(bought),
+        "total_invested": invested,
+        "total_units": float(cumulative_units[-1]),
+        "final_value": final_value,
+        "absolute_return": (final_value - invested) / invested * 100,
+        "xirr": None if np.isnan(xirr) else float(xirr),
+        "schedule": [
+            {
+                "date": from_day_number(day),
+                "nav": float(nav),
+                "units": float(u),
+                "cumulative_units": float(cu),
+                "invested": amount * (i + 1),
+                "value": float(cu * nav),
+            }
+            for i, (day, nav, u, cu) in enumerate(zip(series.days[bought], navs, units, cumulative_units))
+        ],
+    }
+
+
+def _rolling_flows(
+    series: NavSeries, amount: float, step: int, instalments: int, sip_day: int
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Cash flows of every SIP of `instalments` periods that fits in the history,
+    one row per start month: (start days, invested units, amounts, flow days, values).
+    """
+    days, navs = series.days, series.navs
+    # Start in the first full month so the first instalment isn't bought late.
+    first_month = _month(days[0]) + 1
+    months = int((_month(days[-1]) - first_month).astype(int)) + 1
+    span = instalments * step  # months from first instalment to valuation
+    starts = months - span
+    if starts <= 0:
+        return None
+
+    planned = scheduled_days(first_month, months, sip_day)
+    bought = np.searchsorted(days, planned, side="left")
+    schedule = np.arange(starts)[:, None] + step * np.arange(instalments)[None, :]
+    purchase = bought[schedule]
+    valuation = np.searchsorted(days, planned[np.arange(starts) + span], side="right") - 1
+    valid = (purchase < len(days)).all(axis=1) & (valuation >= purchase[:, -1])
+    purchase, valuation = purchase[valid], valuation[valid]
+    if not len(purchase):
+        return None
+
+    units = (amount / navs[purchase]).sum(axis=1)
+    values = units * navs[valuation]
+    amounts = np.hstack([np.full(purchase.shape, -amount), values[:, None]])
+    flow_days = np.hstack([days[purchase], days[valuation][:, None]]).astype(np.float64)
+    return days[purchase[:, 0]], units, amounts, flow_days, values
+
+
+def rolling_sip_backtest(
+    series: List[NavSeries],
+    amount: float,
+    duration_years: int,
+    frequency: str = "monthly",
+    sip_day: int = 1,
+    include_points: bool = False,
+) -> List[Dict]:
+    """
+    Backtest a SIP of `duration_years` starting in every possible month, for
+    every fund at once.
+
+    All funds' schedules are stacked into one cash-flow matrix and their XIRRs
+    solved in a single vectorized call. Returns one summary per fund.
+    """
+    step = FREQUENCY_MONTHS[frequency]
+    instalments = duration_years * 12 // step
+    invested = amount * instalments
+
+    per_fund = [_rolling_flows(s, amount, step, instalments, sip_day) if len(s) else None for s in series]
+    solved = [flows for flows in per_fund if flows is not None]
+    if solved:
+        xirrs = _solve(np.vstack([f[2] for f in solved]), np.vstack([f[3] for f in solved]))
+        splits = np.cumsum([len(f[0]) for f in solved])[:-1]
+        xirr_by_fund = iter(np.split(xirrs, splits))
+
+    results = []
+    for s, flows in zip(series, per_fund):
+        result = {
+            "scheme_code": s.scheme_code,
+            "frequency": frequency,
+            "amount": amount,
+            "duration_years": duration_years,
+            "total_invested": invested,
+            "start_dates": 0,
+            "xirr": None,
+        }
+        if flows is not None:
+            start_days, _, _, _, values = flows
+            xirr = next(xirr_by_fund)
+            finite = ~np.isnan(xirr)
+            result.update(
+                start_dates=len(start_days),
+                first_start=from_day_number(start_days[0]),
+                last_start=from_day_number(start_days[-1]),
+                xirr=summarize(xirr[finite], XIRR_THRESHOLDS),
+                final_value={
+                    "mean": float(values.mean()),
+                    "median": float(np.median(values)),
+                    "min": float(values.min()),
+                    "max": float(values.max()),
+                },
+            )
+            if finite.any():
+                result["best_start"] = from_day_number(start_days[np.nanargmax(xirr)])
+                result["worst_start"] = from_day_number(start_days[np.nanargmin(xirr)])
+            if include_points:
+                result["points"] = [
+                    {"start_date": from_day_number(day), "xirr": None if np.isnan(x) else float(x), "final_value": float(v)}
+                    for day, x, v in zip(start_days, xirr, values)
+                ]
+        results.append(result)
+    return results
@@ -0,0 +1,78 @@
+"""Small per-user result caches for endpoints that summarize a user's own data."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class UserResultCache:
+    """
+    Thread-safe LRU of one computed result per user.
+
+    Each result is stored with the user's data version (see
+    crud.user_data_version), which writers bump in the same transaction as
+    the change. A lookup with a newer version misses, so every worker drops
+    its copy as soon as the change commits. Writers also call
+    `invalidate(user_id)` to free this process's copy right away.
+    """
+
+    def __init__(self, ttl_seconds: float, max_users: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, Tuple[float, Optional[int], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so results computed across one are not stored.
+        self._generation = 0
+
+    def get(self, user_id: int, version: Optional[int] = None) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            stored_at, stored_version, value = entry
+            if stored_version != version or time.monotonic() - stored_at >= self.ttl_seconds:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return value
+
+    def set(self, user_id: int, value: Any, version: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), version, value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, user_id: int, compute: Callable[[], Any], version: Optional[int] = None) -> Any:
+        """
+        Cached result for `user_id` at `version`, computing it on a miss.
+
+        Read the version before computing: data read afterwards is at least
+        that new, so a result is never stored under a later version.
+        """
+        value = self.get(user_id, version)
+        if value is not None:
+            return value
+        generation = self._generation
+        value = compute()
+        if generation == self._generation:
+            self.set(user_id, value, version)
+        return value
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+dashboard_cache = UserResultCache(
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    max_users=settings.DASHBOARD_CACHE_MAX_USERS,
+)
@@ -0,0 +1,88 @@
+"""Vectorized XIRR: solve many cash-flow schedules at once with Newton, falling back to bisection."""
+from datetime import date
+from typing import Optional, Sequence
+
+import numpy as np
+
+NEWTON_ITERATIONS = 50
+BISECTION_ITERATIONS = 200
+TOLERANCE = 1e-9
+# Annual-rate bracket for the bisection fallback: -99.99% to +10,000%.
+RATE_FLOOR = -0.9999
+RATE_CEILING = 100.0
+
+
+def _npv(rates: np.ndarray, amounts: np.ndarray, years: np.ndarray) -> np.ndarray:
+    return np.sum(amounts * np.power(1 + rates[:, None], -years), axis=1)
+
+
+def xirr_batch(amounts: np.ndarray, years: np.ndarray, guess: float = 0.1) -> np.ndarray:
+    """
+    Annualized internal rate of return for each row of a cash-flow matrix.
+
+    `amounts` and `years` are (problems x flows); `years` is each flow's
+    time in years from that row's first flow. Pad unused slots with a zero
+    amount. Investments are negative, redemptions/valuations positive.
+    Returns the rate as a fraction per row, NaN where no root exists
+    (e.g. all flows have the same sign).
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    years = np.asarray(years, dtype=np.float64)
+    has_root = (amounts > 0).any(axis=1) & (amounts < 0).any(axis=1)
+    rates = np.full(len(amounts), guess)
+    converged = ~has_root
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(NEWTON_ITERATIONS):
+            active = ~converged
+            if not active.any():
+                break
+            r, a, t = rates[active], amounts[active], years[active]
+            discount = np.power(1 + r[:, None], -t)
+            value = np.sum(a * discount, axis=1)
+            slope = np.sum(-t * a * discount / (1 + r[:, None]), axis=1)
+            step = value / slope
+            updated = np.clip(r - step, RATE_FLOOR, RATE_CEILING)
+            ok = np.isfinite(updated)
+            rates[active] = np.where(ok, updated, r)
+            done = ok & (np.abs(step) < TOLERANCE)
+            converged[np.flatnonzero(active)[done | ~ok]] = True
+
+        # Rows where Newton diverged, stalled or landed on a bound get bisection.
+        residual = np.full(len(amounts), np.inf)
+        residual[has_root] = np.abs(_npv(rates[has_root], amounts[has_root], years[has_root]))
+        scale = np.maximum(np.abs(amounts).sum(axis=1), 1.0)
+        retry = has_root & ~(residual / scale < 1e-7)
+        if retry.any():
+            rates[retry] = _bisect(amounts[retry], years[retry])
+
+    rates[~has_root] = np.nan
+    return rates
+
+
+def _bisect(amounts: np.ndarray, years: np.ndarray) -> np.ndarray:
+    low = np.full(len(amounts), RATE_FLOOR)
+    high = np.full(len(amounts), RATE_CEILING)
+    f_low = _npv(low, amounts, years)
+    f_high = _npv(high, amounts, years)
+    bracketed = np.sign(f_low) != np.sign(f_high)
+    for _ in range(BISECTION_ITERATIONS):
+        mid = (low + high) / 2
+        f_mid = _npv(mid, amounts, years)
+        left = np.sign(f_mid) == np.sign(f_low)
+        low = np.where(left, mid, low)
+        f_low = np.where(left, f_mid, f_low)
+        high = np.where(left, high, mid)
+        if np.all(high - low < TOLERANCE):
+            break
+    return np.where(bracketed, (low + high) / 2, np.nan)
+
+
+def xirr(dates: Sequence[date], amounts: Sequence[float]) -> Optional[float]:
+    """XIRR (as a fraction) of one dated cash-flow schedule, or None if it has no solution."""
+    if len(dates) < 2:
+        return None
+    ordinals = np.asarray([d.toordinal() for d in dates], dtype=np.float64)
+    years = (ordinals - ordinals.min()) / 365.0
+    rate = xirr_batch(np.asarray([amounts], dtype=np.float64), years[None, :])[0]
+    return None if np.isnan(rate) else float(rate)
@@ -0,0 +1,93 @@
+"""Helpers for parsing the AMFI NAVAll.txt feed."""
+from datetime import date, datetime
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Optional
+
+from app.utils.fund_classifier import classify_fund
+
+SCHEME_TYPE_PREFIXES = ("Open Ended Schemes", "Close Ended Schemes", "Interval Fund Schemes")
+AMFI_DATE_FORMAT = "%d-%b-%Y"
+
+
+def parse_amfi_date(value: str) -> Optional[date]:
+    """Parse AMFI's '05-Jul-2024' date format, returning None when malformed."""
+    try:
+        return datetime.strptime(value.strip(), AMFI_DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def extract_scheme_code(fund_name: str) -> Optional[str]:
+    """Return the numeric scheme code embedded as 'Fund Name (123456)', if any."""
+    if not fund_name or '(' not in fund_name or ')' not in fund_name:
+        return None
+    code = fund_name.split('(')[-1].split(')')[0]
+    return code if code.isdigit() else None
+
+
+def parse_nav_line(line: str, fund_house: Optional[str] = None) -> Optional[Dict]:
+    """
+    Parse one scheme row of NAVAll.txt into a mutual fund record.
+
+    Returns None for headers, section titles and rows without a usable NAV.
+    """
+    parts = line.split(';')
+    if len(parts) < 6 or not parts[0].isdigit():
+        return None
+    try:
+        nav = float(parts[4])
+    except ValueError:
+        return None
+    nav_date = parse_amfi_date(parts[5])
+    if nav_date is None:
+        return None
+    scheme_name = parts[3].strip()
+    category, sub_category = classify_fund(scheme_name)
+    return {
+        "scheme_code": parts[0],
+        "scheme_name": scheme_name,
+        "nav": nav,
+        "nav_date": nav_date,
+        "fund_house": fund_house or "Unknown",
+        "category": category,
+        "sub_category": sub_category,
+    }
+
+
+class _NavFeedParser:
+    """Stateful line parser that tracks the current fund house heading."""
+
+    def __init__(self):
+        self.fund_house = None
+
+    def feed(self, raw: str) -> Optional[Dict]:
+        line = raw.strip()
+        if not line:
+            return None
+        if ';' not in line:
+            if not line.startswith(SCHEME_TYPE_PREFIXES):
+                self.fund_house = line
+            return None
+        return parse_nav_line(line, self.fund_house)
+
+
+def iter_nav_records(lines: Iterable[str]) -> Iterator[Dict]:
+    """
+    Yield parsed records from an iterable of NAVAll.txt lines.
+
+    Scheme rows are grouped under a fund house heading line, which is tracked
+    while streaming so each record carries its AMC name.
+    """
+    parser = _NavFeedParser()
+    for line in lines:
+        record = parser.feed(line)
+        if record:
+            yield record
+
+
+async def parse_nav_records_async(lines: AsyncIterable[str]) -> AsyncIterator[Dict]:
+    """Async counterpart of iter_nav_records for streamed HTTP bodies."""
+    parser = _NavFeedParser()
+    async for line in lines:
+        record = parser.feed(line)
+        if record:
+            yield record
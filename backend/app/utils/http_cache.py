@@ -0,0 +1,62 @@
+"""HTTP validators and freshness for responses that only change when a new NAV is published."""
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from fastapi import Response
+
+from app.core.config import settings
+
+IST = timezone(timedelta(hours=5, minutes=30))
+# Bump when the shape of NAV-derived responses changes so cached copies are refetched.
+ETAG_VERSION = "1"
+# Used when a NAV is already overdue, so clients re-check soon.
+MIN_MAX_AGE_SECONDS = 300
+
+
+def nav_etag(scheme_code: str, nav_date: date, variant: Tuple = ()) -> str:
+    """
+    Strong ETag for a scheme's NAV-derived data as of its latest NAV date.
+
+    `variant` holds every query parameter that changes the representation
+    (e.g. chart resolution and point count), so each variant gets its own tag.
+    """
+    parts = [scheme_code, nav_date.isoformat(), *(str(value) for value in variant)]
+    return f'"{"-".join(parts)}-v{ETAG_VERSION}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (RFC 9110 weak comparison: the W/ prefix is ignored)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def next_nav_publication(latest_nav_date: date) -> datetime:
+    """
+    When the NAV after `latest_nav_date` is expected to be published.
+
+    AMFI publishes a business day's NAVs by NAV_PUBLISH_HOUR_IST that evening,
+    so this is the first weekday after the latest NAV date at that hour.
+    """
+    next_day = latest_nav_date + timedelta(days=1)
+    while next_day.weekday() >= 5:
+        next_day += timedelta(days=1)
+    return datetime(next_day.year, next_day.month, next_day.day, settings.NAV_PUBLISH_HOUR_IST, tzinfo=IST)
+
+
+def nav_max_age(latest_nav_date: date, now: Optional[datetime] = None) -> int:
+    now = now or datetime.now(timezone.utc)
+    remaining = (next_nav_publication(latest_nav_date) - now).total_seconds()
+    return max(int(remaining), MIN_MAX_AGE_SECONDS)
+
+
+def set_nav_cache_headers(response: Response, scheme_code: str, nav_date: date, variant: Tuple = ()) -> None:
+    response.headers["ETag"] = nav_etag(scheme_code, nav_date, variant)
+    response.headers["Cache-Control"] = f"public, max-age={nav_max_age(nav_date)}"
+
+
+def not_modified(scheme_code: str, nav_date: date, variant: Tuple = ()) -> Response:
+    response = Response(status_code=304)
+    set_nav_cache_headers(response, scheme_code, nav_date, variant)
+    return response
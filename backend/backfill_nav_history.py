@@ -0,0 +1,61 @@
+"""
+Backfill mutual_fund_nav_history from mfapi.
+
+Each scheme is committed on its own and only dates newer than the stored
+maximum are appended, so an interrupted run can simply be started again.
+
+    python backfill_nav_history.py --workers 8
+    python backfill_nav_history.py --scheme-codes 122639 147946
+"""
+import argparse
+import asyncio
+
+from app import crud
+from app.db.session import SessionLocal
+from app.models.mutual_fund import MutualFund
+from app.services.http_client import market_data_client
+from app.services.nav_history import backfill_scheme, is_fresh
+
+
+async def backfill_nav_history(scheme_codes=None, workers: int = 8):
+    db = SessionLocal()
+    try:
+        if not scheme_codes:
+            scheme_codes = [code for (code,) in db.query(MutualFund.scheme_code).order_by(MutualFund.scheme_code)]
+        latest = crud.nav_history.get_latest_dates(db, scheme_codes=scheme_codes)
+    finally:
+        db.close()
+
+    pending = [code for code in scheme_codes if not is_fresh(latest.get(code))]
+    print(f"{len(scheme_codes) - len(pending)} schemes already up to date, {len(pending)} to backfill.")
+
+    limit = asyncio.Semaphore(workers)
+
+    async def run(code):
+        try:
+            async with limit:
+                return code, await backfill_scheme(code), None
+        except Exception as e:
+            return code, 0, e
+
+    total_rows = 0
+    try:
+        for done, task in enumerate(asyncio.as_completed([run(code) for code in pending]), start=1):
+            code, rows, error = await task
+            total_rows += rows
+            if error:
+                print(f"[{done}/{len(pending)}] {code}: failed ({error})")
+            else:
+                print(f"[{done}/{len(pending)}] {code}: {rows} new NAVs")
+    finally:
+        await market_data_client.aclose()
+
+    print(f"Backfill complete: {total_rows} NAV rows written.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill historical NAVs from mfapi.")
+    parser.add_argument("--scheme-codes", nargs="*", help="Limit the backfill to these scheme codes")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent downloads")
+    args = parser.parse_args()
+    asyncio.run(backfill_nav_history(args.scheme_codes, args.workers))
@@ -0,0 +1,100 @@
+"""
+Compare the NumPy rolling-returns engine with the previous pure-Python one.
+
+Generates a synthetic daily NAV history in mfapi's JSON shape (weekdays only,
+newest first) and times 1/3/5/7-year rolling returns with both.
+
+    python benchmark_rolling_returns.py --years 16 --repeat 5
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from app.services.rolling_returns import ROLLING_WINDOWS_YEARS, parse_mfapi_series, rolling_return_stats
+
+
+def parse_date(date_str: str) -> datetime:
+    return datetime.strptime(date_str, "%d-%m-%Y")
+
+
+def legacy_rolling_returns(nav_data, years: int = 3) -> float:
+    """The removed recommendations.calculate_rolling_returns, kept here as the baseline."""
+    if not nav_data:
+        return 0.0
+    sorted_data = sorted(nav_data, key=lambda x: parse_date(x['date']))
+    history = []
+    for entry in sorted_data:
+        try:
+            history.append((parse_date(entry['date']), float(entry['nav'])))
+        except ValueError:
+            continue
+    if not history:
+        return 0.0
+
+    window_days = years * 365
+    rolling_returns = []
+    start_idx = 0
+    for end_idx in range(len(history)):
+        end_date, end_nav = history[end_idx]
+        target_date = end_date - timedelta(days=window_days)
+        while start_idx < end_idx and history[start_idx][0] < target_date:
+            start_idx += 1
+        if start_idx < end_idx:
+            start_date, start_nav = history[start_idx]
+            days_diff = (end_date - start_date).days
+            if abs(days_diff - window_days) <= 7 and start_nav > 0 and days_diff > 0:
+                rolling_returns.append((((end_nav / start_nav) ** (365 / days_diff)) - 1) * 100)
+    if not rolling_returns:
+        return 0.0
+    return sum(rolling_returns) / len(rolling_returns)
+
+
+def synthetic_history(years: int, seed: int = 42):
+    rng = random.Random(seed)
+    day = date.today() - timedelta(days=years * 365)
+    nav = 10.0
+    rows = []
+    while day <= date.today():
+        if day.weekday() < 5:
+            nav *= 1 + rng.gauss(0.0005, 0.01)
+            rows.append({"date": day.strftime("%d-%m-%Y"), "nav": f"{nav:.4f}"})
+        day += timedelta(days=1)
+    rows.reverse()
+    return rows
+
+
+def best_of(repeat: int, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(years: int, repeat: int):
+    nav_data = synthetic_history(years)
+    print(f"{len(nav_data)} NAVs over {years} years, best of {repeat} runs")
+
+    legacy_time, legacy = best_of(
+        repeat, lambda: {f"{w}Y": legacy_rolling_returns(nav_data, w) for w in ROLLING_WINDOWS_YEARS}
+    )
+    vector_time, stats = best_of(repeat, lambda: rolling_return_stats(*parse_mfapi_series(nav_data)))
+    days, navs = parse_mfapi_series(nav_data)
+    arrays_time, _ = best_of(repeat, lambda: rolling_return_stats(days, navs))
+
+    for window in legacy:
+        mean = stats[window]["mean"] if stats[window] else 0.0
+        print(f"  {window}: legacy mean {legacy[window]:.4f}%  vectorized mean {mean:.4f}%")
+    print(f"Legacy (4 windows, mean only):        {legacy_time * 1000:9.1f} ms")
+    print(f"Vectorized incl. parsing (full stats): {vector_time * 1000:9.1f} ms  ({legacy_time / vector_time:.1f}x)")
+    print(f"Vectorized on parsed arrays:           {arrays_time * 1000:9.1f} ms  ({legacy_time / arrays_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark rolling-return calculation.")
+    parser.add_argument("--years", type=int, default=16, help="Length of the synthetic history")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per implementation (best is reported)")
+    args = parser.parse_args()
+    main(args.years, args.repeat)
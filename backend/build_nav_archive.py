@@ -0,0 +1,76 @@
+"""
+Rebuild the memory-mapped NAV archive (settings.NAV_ARCHIVE_PATH).
+
+By default the archive is built from mutual_fund_nav_history. With
+--source mfapi the histories are downloaded instead, which is useful on a
+fresh install before the backfill has run.
+
+    python build_nav_archive.py
+    python build_nav_archive.py --source mfapi --scheme-codes 122639 147946
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.mutual_fund import MutualFund
+from app.services.http_client import market_data_client
+from app.services.nav_archive import series_from_db, series_from_mfapi, write_archive
+from app.services.nav_history import fetch_fund_data
+
+
+def build_from_db(path: str):
+    db = SessionLocal()
+    try:
+        return write_archive(path, series_from_db(db))
+    finally:
+        db.close()
+
+
+async def download_series(scheme_codes, workers: int):
+    limit = asyncio.Semaphore(workers)
+
+    async def fetch(code):
+        async with limit:
+            payload = await fetch_fund_data(code, cached=False)
+        if payload is None:
+            print(f"{code}: download failed")
+            return []
+        # Convert straight away so only the compact arrays are kept around.
+        return list(series_from_mfapi([payload]))
+
+    try:
+        results = await asyncio.gather(*(fetch(code) for code in scheme_codes))
+    finally:
+        await market_data_client.aclose()
+    return [series for result in results for series in result]
+
+
+def build_from_mfapi(path: str, scheme_codes=None, workers: int = 8):
+    if not scheme_codes:
+        db = SessionLocal()
+        try:
+            scheme_codes = [code for (code,) in db.query(MutualFund.scheme_code).order_by(MutualFund.scheme_code)]
+        finally:
+            db.close()
+    return write_archive(path, asyncio.run(download_series(scheme_codes, workers)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the memory-mapped NAV archive.")
+    parser.add_argument("--source", choices=["db", "mfapi"], default="db", help="Where to read NAV history from")
+    parser.add_argument("--scheme-codes", nargs="*", help="Schemes to download (mfapi source only)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent downloads (mfapi source only)")
+    parser.add_argument("--path", default=settings.NAV_ARCHIVE_PATH, help="Output file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.source == "db":
+        stats = build_from_db(args.path)
+    else:
+        stats = build_from_mfapi(args.path, args.scheme_codes, args.workers)
+    print(
+        f"Wrote {args.path}: {stats['schemes']} schemes, {stats['points']} NAVs, "
+        f"{stats['bytes'] / 1_048_576:.1f} MiB in {time.perf_counter() - started:.1f}s"
+    )
@@ -0,0 +1,16 @@
+from sqlalchemy import text
+from app.db.session import engine
+
+def migrate_fund_risk_metrics_nav_date():
+    with engine.connect() as connection:
+        try:
+            # Rows without it count as stale until the next scoring run fills it in.
+            connection.execute(text("ALTER TABLE fund_risk_metrics ADD COLUMN IF NOT EXISTS nav_date DATE;"))
+            connection.commit()
+            print("Added fund_risk_metrics.nav_date.")
+        except Exception as e:
+            print(f"Error migrating fund_risk_metrics table: {e}")
+            connection.rollback()
+
+if __name__ == "__main__":
+    migrate_fund_risk_metrics_nav_date()
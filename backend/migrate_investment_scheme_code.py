@@ -0,0 +1,35 @@
+from sqlalchemy import text
+from app.db.session import engine
+
+def migrate_investment_scheme_code():
+    with engine.connect() as connection:
+        try:
+            connection.execute(text("""
+                ALTER TABLE investments
+                ADD COLUMN IF NOT EXISTS scheme_code VARCHAR
+                REFERENCES mutual_funds(scheme_code) ON DELETE SET NULL;
+            """))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_investments_scheme_code ON investments (scheme_code);"
+            ))
+            print("Added investments.scheme_code column and index.")
+
+            # Names look like 'Fund Name (123456)'; take the last parenthesised code,
+            # matching app.utils.amfi.extract_scheme_code, and link it when the fund exists.
+            result = connection.execute(text(r"""
+                UPDATE investments AS i
+                SET scheme_code = mf.scheme_code
+                FROM mutual_funds AS mf
+                WHERE i.investment_type = 'mutual_fund'
+                  AND i.scheme_code IS NULL
+                  AND mf.scheme_code = substring(i.fund_name FROM '\((\d+)\)[^(]*$');
+            """))
+            print(f"Backfilled scheme_code on {result.rowcount} investments.")
+
+            connection.commit()
+        except Exception as e:
+            print(f"Error migrating investments table: {e}")
+            connection.rollback()
+
+if __name__ == "__main__":
+    migrate_investment_scheme_code()
@@ -0,0 +1,15 @@
+from sqlalchemy import text
+from app.db.session import engine
+
+def migrate_investment_units():
+    with engine.connect() as connection:
+        try:
+            connection.execute(text("ALTER TABLE investments ADD COLUMN IF NOT EXISTS units NUMERIC(18, 4);"))
+            print("Added investments.units column.")
+            connection.commit()
+        except Exception as e:
+            print(f"Error migrating investments table: {e}")
+            connection.rollback()
+
+if __name__ == "__main__":
+    migrate_investment_units()
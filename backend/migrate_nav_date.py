@@ -0,0 +1,39 @@
+from sqlalchemy import text
+from app.db.session import engine
+
+def migrate_nav_date():
+    with engine.connect() as connection:
+        try:
+            # Values that don't look like AMFI's '05-Jul-2024' would make to_date fail.
+            connection.execute(text(r"""
+                UPDATE mutual_funds SET nav_date = NULL
+                WHERE nav_date !~ '^\d{2}-[A-Za-z]{3}-\d{4}$';
+            """))
+            connection.execute(text("""
+                ALTER TABLE mutual_funds
+                ALTER COLUMN nav_date TYPE DATE USING to_date(nav_date, 'DD-Mon-YYYY');
+            """))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_mutual_funds_nav_date ON mutual_funds (nav_date);"
+            ))
+            connection.commit()
+            print("Converted mutual_funds.nav_date to DATE and indexed it.")
+        except Exception as e:
+            print(f"Error migrating mutual_funds table: {e}")
+            connection.rollback()
+            return
+
+        try:
+            connection.execute(text("""
+                ALTER TABLE nav_changes
+                ALTER COLUMN old_nav_date TYPE DATE USING to_date(old_nav_date, 'DD-Mon-YYYY'),
+                ALTER COLUMN new_nav_date TYPE DATE USING to_date(new_nav_date, 'DD-Mon-YYYY');
+            """))
+            connection.commit()
+            print("Converted nav_changes dates to DATE.")
+        except Exception as e:
+            print(f"Error migrating nav_changes table: {e}")
+            connection.rollback()
+
+if __name__ == "__main__":
+    migrate_nav_date()
@@ -0,0 +1,19 @@
+from sqlalchemy import text
+from app.db.session import engine
+
+def migrate_portfolio_snapshot_index():
+    with engine.connect() as connection:
+        try:
+            # An index on the partitioned parent is created on every existing and future monthly partition.
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_portfolio_snapshots_snapshot_date "
+                "ON portfolio_snapshots (snapshot_date);"
+            ))
+            connection.commit()
+            print("Indexed portfolio_snapshots.snapshot_date.")
+        except Exception as e:
+            print(f"Error indexing portfolio_snapshots: {e}")
+            connection.rollback()
+
+if __name__ == "__main__":
+    migrate_portfolio_snapshot_index()
@@ -0,0 +1,60 @@
+"""
+Rebuild or verify portfolio_aggregates against the investments table.
+
+The table is maintained incrementally by every investment write; this
+recomputes it from scratch (one INSERT ... SELECT) or, with --check,
+only reports rows that drifted and exits non-zero if any did.
+
+    python rebuild_portfolio_aggregates.py
+    python rebuild_portfolio_aggregates.py --check
+    python rebuild_portfolio_aggregates.py --user-id 42
+"""
+import argparse
+import sys
+import time
+
+from app import crud
+from app.db.session import SessionLocal
+
+
+def check(user_id=None) -> int:
+    db = SessionLocal()
+    try:
+        drift = crud.portfolio_aggregate.find_drift(db, owner_id=user_id)
+    finally:
+        db.close()
+    for row in drift:
+        print(
+            f"user {row['owner_id']} / {row['investment_type']}: "
+            f"count {row['stored_count']} vs {row['actual_count']}, "
+            f"invested {row['stored_invested']} vs {row['actual_invested']}, "
+            f"current {row['stored_current']} vs {row['actual_current']}"
+        )
+    print(f"{len(drift)} drifted rows")
+    return len(drift)
+
+
+def rebuild(user_id=None) -> int:
+    db = SessionLocal()
+    try:
+        rows = crud.portfolio_aggregate.rebuild(db, owner_id=user_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or verify the portfolio_aggregates table.")
+    parser.add_argument("--check", action="store_true", help="Only report drift; exit 1 if any is found")
+    parser.add_argument("--user-id", type=int, help="Limit to one user")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.check:
+        sys.exit(1 if check(args.user_id) else 0)
+    rows = rebuild(args.user_id)
+    print(f"Rebuilt {rows} aggregate rows in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,57 @@
+"""
+Shared pytest setup.
+
+Settings require database credentials at import time; defaults are filled
+in here so the pure-Python services can be tested without a .env file.
+Tests that need a real database use the `db` fixture, which connects to
+TEST_DATABASE_URL and is skipped when it isn't set.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+os.environ.setdefault("POSTGRES_DB", "wealth_test")
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("FIRST_SUPERUSER", "admin@example.com")
+os.environ.setdefault("FIRST_SUPERUSER_PASSWORD", "admin")
+os.environ.setdefault("NAV_REFRESH_ENABLED", "false")
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """A session on TEST_DATABASE_URL with every table created; rolled back and dropped afterwards."""
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import app.models  # noqa: F401 - registers every table on Base.metadata
+    from app.db.base_class import Base
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def owner(db):
+    """A committed user to own test investments."""
+    from app.models.user import User
+
+    user = User(email="owner@example.com", hashed_password="not-a-real-hash")
+    db.add(user)
+    db.commit()
+    return user
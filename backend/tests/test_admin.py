@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import admin
+
+
+def test_score_refresh_conflicts_while_lock_is_held(monkeypatch):
+    async def busy():
+        return None
+
+    monkeypatch.setattr(admin, "acquire_refresh_lock", busy)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(admin.refresh_recommendation_scores(full=False))
+    assert exc.value.status_code == 409
+
+
+def test_score_refresh_runs_in_background_and_releases_lock(monkeypatch):
+    calls = []
+    lock = object()
+
+    async def acquire():
+        return lock
+
+    async def release(conn):
+        calls.append(("release", conn))
+
+    async def refresh(full=False):
+        calls.append(("refresh", full))
+        return {}
+
+    monkeypatch.setattr(admin, "acquire_refresh_lock", acquire)
+    monkeypatch.setattr(admin, "release_refresh_lock", release)
+    monkeypatch.setattr(admin, "refresh_fund_scores", refresh)
+
+    async def request():
+        response = await admin.refresh_recommendation_scores(full=True)
+        assert calls == []
+        await asyncio.gather(*admin._admin_jobs)
+        return response
+
+    response = asyncio.run(request())
+    assert response.data == {"full": True}
+    assert calls == [("refresh", True), ("release", lock)]
@@ -0,0 +1,59 @@
+import asyncio
+import os
+from datetime import date
+
+from app.utils.amfi import (
+    extract_scheme_code, iter_nav_records, parse_amfi_date, parse_nav_line, parse_nav_records_async,
+)
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "NAVAll.txt")
+
+
+def test_parse_amfi_date():
+    assert parse_amfi_date("05-Jan-2024") == date(2024, 1, 5)
+    assert parse_amfi_date(" 29-Feb-2024 ") == date(2024, 2, 29)
+    assert parse_amfi_date("2024-01-05") is None
+    assert parse_amfi_date("31-Feb-2024") is None
+
+
+def test_extract_scheme_code():
+    assert extract_scheme_code("Axis Bluechip Fund - Direct Plan - Growth (120465)") == "120465"
+    assert extract_scheme_code("Fund (Series 2) (118989)") == "118989"
+    assert extract_scheme_code("Fund (Direct)") is None
+    assert extract_scheme_code("") is None
+
+
+def test_parse_nav_line_rejects_headers_and_unusable_rows():
+    assert parse_nav_line("Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;Net Asset Value;Date") is None
+    assert parse_nav_line("120717;INF789F01XB8;-;UTI Nifty 50 Index Fund;N.A.;05-Jan-2024") is None
+    assert parse_nav_line("120717;INF789F01XB8;-;UTI Nifty 50 Index Fund;152.33;05/01/2024") is None
+    assert parse_nav_line("120717;INF789F01XB8;-;UTI Nifty 50 Index Fund") is None
+
+
+def test_iter_nav_records_tracks_the_fund_house():
+    with open(FIXTURE, encoding="utf-8") as f:
+        records = list(iter_nav_records(f))
+
+    assert [(r["scheme_code"], r["fund_house"], r["nav"]) for r in records] == [
+        ("120465", "Axis Mutual Fund", 58.42),
+        ("120466", "Axis Mutual Fund", 22.15),
+        ("120716", "UTI Mutual Fund", 152.3301),
+    ]
+    first = records[0]
+    assert first["scheme_name"] == "Axis Bluechip Fund - Direct Plan - Growth"
+    assert first["nav_date"] == date(2024, 1, 5)
+    assert first["category"] and first["sub_category"]
+
+
+def test_async_parser_matches_sync_parser():
+    with open(FIXTURE, encoding="utf-8") as f:
+        lines = f.readlines()
+
+    async def stream():
+        for line in lines:
+            yield line
+
+    async def collect():
+        return [record async for record in parse_nav_records_async(stream())]
+
+    assert asyncio.run(collect()) == list(iter_nav_records(lines))
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from app.services.downsampling import aggregate_ohlc, lttb_indices, select_indices, to_chart_rows
+
+
+def wave(n):
+    x = np.arange(n)
+    return x, 10 + np.sin(x / 7) + x / 50
+
+
+@pytest.mark.parametrize("n, n_out", [(0, 5), (1, 5), (2, 5), (10, 10), (10, 50), (10, 2)])
+def test_lttb_keeps_everything_at_or_below_the_threshold(n, n_out):
+    x, y = wave(n)
+    assert lttb_indices(x, y, n_out).tolist() == list(range(n))
+
+
+@pytest.mark.parametrize("n, n_out", [(11, 10), (100, 3), (1000, 37), (5000, 500)])
+def test_lttb_returns_sorted_unique_indices_with_both_ends(n, n_out):
+    x, y = wave(n)
+    kept = lttb_indices(x, y, n_out)
+    assert len(kept) == n_out
+    assert kept[0] == 0 and kept[-1] == n - 1
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(1000)
+    y = np.full(1000, 10.0)
+    y[[137, 512, 880]] = [25.0, 2.0, 30.0]
+    kept = lttb_indices(x, y, 50)
+    assert {137, 512, 880} <= set(kept.tolist())
+
+
+def test_lttb_passes_over_nan_values():
+    x, y = wave(200)
+    y[[10, 11, 40, 41, 42, 150]] = np.nan
+    kept = lttb_indices(x, y, 30)
+    assert len(kept) == 30
+    assert np.all(np.diff(kept) > 0)
+    assert not np.isnan(y[kept[1:-1]]).any()
+
+
+def test_lttb_with_all_nan_or_zero_values_still_returns_valid_indices():
+    x = np.arange(100)
+    for y in (np.full(100, np.nan), np.zeros(100)):
+        kept = lttb_indices(x, y, 10)
+        assert len(kept) == 10
+        assert kept[0] == 0 and kept[-1] == 99
+        assert np.all(np.diff(kept) > 0)
+
+
+def test_zero_nav_can_be_kept_as_a_spike():
+    x, y = wave(300)
+    y[123] = 0.0
+    assert 123 in lttb_indices(x, y, 40)
+
+
+def test_matrix_selection_keeps_each_series_picks():
+    x = np.arange(400)
+    values = np.column_stack([10 + np.sin(x / 9), 10 + np.cos(x / 13)])
+    kept = select_indices(x, values, "lttb", 60)
+    for col in range(2):
+        assert set(lttb_indices(x, values[:, col], 30).tolist()) <= set(kept.tolist())
+
+
+def test_monthly_ohlc():
+    # 2024-01-30 .. 2024-02-02 as day numbers.
+    days = np.asarray([19752, 19753, 19754, 19755])
+    navs = np.asarray([10.0, 12.0, 11.0, 9.0])
+    ohlc = aggregate_ohlc(days, navs, "monthly")
+    assert ohlc["days"].tolist() == [19753, 19755]
+    assert ohlc["open"].tolist() == [10.0, 11.0]
+    assert ohlc["high"].tolist() == [12.0, 11.0]
+    assert ohlc["low"].tolist() == [10.0, 9.0]
+    assert ohlc["close"].tolist() == [12.0, 9.0]
+    rows = to_chart_rows(days, navs, "monthly")
+    assert [row["date"] for row in rows] == ["02-02-2024", "31-01-2024"]
+
+
+def test_empty_series_reduces_to_no_rows():
+    empty = np.empty(0)
+    for resolution in ("raw", "lttb", "weekly", "monthly"):
+        assert to_chart_rows(empty.astype(np.int32), empty, resolution) == []
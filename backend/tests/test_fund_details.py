@@ -0,0 +1,56 @@
+import asyncio
+import copy
+from datetime import date, timedelta
+
+from fastapi import Response
+
+from app import crud
+from app.api.v1.endpoints import recommendations
+from app.services import nav_history
+from app.services.response_cache import TieredCache
+
+
+def mfapi_payload(days=400):
+    start = date.today() - timedelta(days=days - 1)
+    rows = [
+        {"date": (start + timedelta(days=i)).strftime("%d-%m-%Y"), "nav": f"{100 + i * 0.1:.5f}"}
+        for i in range(days)
+    ]
+    rows.reverse()
+    return {"meta": {"scheme_code": "100001", "scheme_name": "Test Fund - Direct Plan - Growth"}, "data": rows}
+
+
+def test_detail_response_does_not_modify_cached_payload(monkeypatch, tmp_path):
+    payload = mfapi_payload()
+    pristine = copy.deepcopy(payload)
+    cache = TieredCache(str(tmp_path), max_memory_bytes=1 << 20, max_disk_bytes=1 << 20)
+
+    async def get_json(url):
+        return copy.deepcopy(payload)
+
+    async def no_risk_metrics(db, series):
+        return None
+
+    monkeypatch.setattr(nav_history, "api_cache", cache)
+    monkeypatch.setattr(nav_history.market_data_client, "get_json", get_json)
+    monkeypatch.setattr(nav_history, "_load_local_payload", lambda db, code: None)
+    monkeypatch.setattr(nav_history, "_append_payload", lambda db, code, payload: None)
+    monkeypatch.setattr(crud.nav_history, "get_latest_date", lambda db, scheme_code: None)
+    monkeypatch.setattr(recommendations, "get_fund_risk_metrics", no_risk_metrics)
+
+    async def run():
+        monthly = await recommendations.get_mutual_fund_details(
+            "100001", Response(), resolution="monthly", points=500, if_none_match=None, db=None
+        )
+        raw = await recommendations.get_mutual_fund_details(
+            "100001", Response(), resolution="raw", points=500, if_none_match=None, db=None
+        )
+        cached = await cache.get_or_load("mfapi:scheme:100001", get_json, ttl=60)
+        return monthly, raw, cached
+
+    monthly, raw, cached = asyncio.run(run())
+
+    assert len(monthly.data["data"]) < len(payload["data"])
+    assert monthly.data["meta"]["expense_ratio"] == "0.75%"
+    assert raw.data["data"] == payload["data"]
+    assert cached == pristine
@@ -0,0 +1,164 @@
+import asyncio
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app import crud
+from app.core.config import settings
+from app.services import fund_scores, nav_archive
+from app.services.nav_series import NavSeries
+from app.services.rolling_returns import parse_mfapi_series
+
+
+@pytest.fixture
+def archive_path(monkeypatch, tmp_path):
+    path = str(tmp_path / "nav_archive.bin")
+    monkeypatch.setattr(settings, "NAV_ARCHIVE_PATH", path)
+    monkeypatch.setattr(nav_archive, "_archive", None)
+    return path
+
+
+def daily_series(days: int, start_nav: float = 10.0, growth: float = 0.0004):
+    day_numbers = np.arange(18000, 18000 + days, dtype=np.int32)
+    return day_numbers, start_nav * (1 + growth) ** np.arange(days)
+
+
+def test_parse_mfapi_series_drops_non_positive_and_invalid_navs():
+    days, navs = parse_mfapi_series([
+        {"date": "03-01-2024", "nav": "10.5"},
+        {"date": "02-01-2024", "nav": "0.00000"},
+        {"date": "01-01-2024", "nav": "-1"},
+        {"date": "31-12-2023", "nav": "nan"},
+        {"date": "30-12-2023", "nav": "N.A."},
+        {"date": "29-12-2023", "nav": None},
+        {"date": "28-12-2023", "nav": "9.5"},
+    ])
+    assert navs.tolist() == [9.5, 10.5]
+    assert np.all(np.diff(days) > 0)
+
+
+def test_trailing_returns_with_zero_start_nav_is_none():
+    days, navs = daily_series(400)
+    navs[0] = 0.0
+    returns = NavSeries(days, navs).trailing_returns(["1Y", "Inception", "1M"])
+    assert returns["Inception"] is None
+    assert returns["1M"] is not None
+
+
+def test_score_chunk_skips_only_the_failing_fund(archive_path, monkeypatch):
+    zero_days, zero_navs = daily_series(800)
+    zero_navs[:5] = 0.0
+    nav_archive.write_archive(archive_path, [
+        ("100001", *daily_series(800)),
+        ("100002", zero_days, zero_navs),
+        ("100003", *daily_series(800)),
+        ("BENCH", *daily_series(800, growth=0.0003)),
+    ])
+
+    real_score_series = fund_scores.score_series
+
+    def flaky_score_series(series):
+        if series.scheme_code == "100003":
+            raise ValueError("corrupt history")
+        return real_score_series(series)
+
+    monkeypatch.setattr(fund_scores, "score_series", flaky_score_series)
+    rows, risk_rows = fund_scores.score_chunk(["100001", "100002", "100003", "999999"], "BENCH")
+
+    assert [row["scheme_code"] for row in rows] == ["100001", "100002"]
+    assert [row["scheme_code"] for row in risk_rows] == ["100001", "100002"]
+
+
+def test_refresh_keeps_previous_scores_when_universe_is_empty(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("previous scores must not be touched")
+
+    monkeypatch.setattr(fund_scores, "_load_universe", lambda: [])
+    monkeypatch.setattr(fund_scores, "sync_histories", fail)
+    monkeypatch.setattr(fund_scores, "_save_scores", fail)
+
+    stats = asyncio.run(fund_scores.refresh_fund_scores(full=True))
+    assert stats == {"universe": 0}
+
+
+def test_refresh_does_not_save_when_nothing_was_scored(archive_path, monkeypatch):
+    nav_archive.write_archive(archive_path, [("100001", *daily_series(800))])
+    universe = [{
+        "scheme_code": "100001", "scheme_name": "Fund", "fund_house": None,
+        "category": "Equity", "sub_category": "Large Cap", "scored_nav_date": None,
+    }]
+
+    async def no_sync(codes):
+        return {"stale": 0, "failed": 0}
+
+    def fail(*args, **kwargs):
+        raise AssertionError("previous scores must not be touched")
+
+    monkeypatch.setattr(fund_scores, "_load_universe", lambda: universe)
+    monkeypatch.setattr(fund_scores, "sync_histories", no_sync)
+    monkeypatch.setattr(fund_scores, "_rebuild_archive", lambda *args: {})
+    # Every chunk fails, as if all workers crashed.
+    monkeypatch.setattr(fund_scores, "ProcessPoolExecutor", BrokenPool)
+    monkeypatch.setattr(fund_scores, "_save_scores", fail)
+
+    stats = asyncio.run(fund_scores.refresh_fund_scores())
+    assert stats["scored"] == 0
+    assert stats["failed_chunks"] == 1
+
+
+class BrokenPool:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+
+        future = Future()
+        future.set_exception(RuntimeError("worker died"))
+        return future
+
+
+def test_risk_metrics_on_a_lagging_benchmark_are_computed_without_saving(monkeypatch):
+    fund = NavSeries(*daily_series(400), scheme_code="100001")
+    # The benchmark's history stops ten days before the fund's.
+    bench_days, bench_navs = daily_series(390, growth=0.0003)
+    lookups = []
+
+    def get_by_scheme(db, scheme_code, as_of):
+        lookups.append(as_of)
+        return None
+
+    async def load_fund_data(scheme_code):
+        return {"meta": {"scheme_code": scheme_code}, "data": []}
+
+    def save(*args, **kwargs):
+        raise AssertionError("the read path must not write")
+
+    monkeypatch.setattr(fund_scores.crud.fund_risk_metrics, "get_by_scheme", get_by_scheme)
+    monkeypatch.setattr(fund_scores.crud.fund_risk_metrics, "upsert_many", save)
+    monkeypatch.setattr(fund_scores, "load_fund_data", load_fund_data)
+    monkeypatch.setattr(fund_scores, "parse_payload", lambda payload: ({}, NavSeries(bench_days, bench_navs, "BENCH")))
+
+    row = asyncio.run(fund_scores.get_fund_risk_metrics(None, fund))
+
+    assert row["nav_date"] == fund.latest_date
+    assert row["period_end"] < row["nav_date"]
+    # Freshness is judged against the fund's own latest NAV, which the stored nav_date tracks.
+    assert lookups == [fund.latest_date - timedelta(days=settings.NAV_HISTORY_MAX_AGE_DAYS)]
+
+
+def test_stored_metrics_are_fresh_by_the_fund_nav_date(db):
+    crud.fund_risk_metrics.upsert_many(db, rows=[{
+        "scheme_code": "100001", "benchmark_code": "BENCH", "risk_free_rate": 0.065,
+        "period_start": date(2021, 1, 1), "period_end": date(2024, 1, 1), "nav_date": date(2024, 1, 20),
+    }])
+    db.commit()
+    assert crud.fund_risk_metrics.get_by_scheme(db, scheme_code="100001", as_of=date(2024, 1, 17)) is not None
+    assert crud.fund_risk_metrics.get_by_scheme(db, scheme_code="100001", as_of=date(2024, 1, 21)) is None
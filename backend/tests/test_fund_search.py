@@ -0,0 +1,94 @@
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from app import crud
+from app.api.v1.endpoints import recommendations
+from app.services.fund_search import FundSearchIndex
+
+FUNDS = [
+    {"schemeCode": 1, "schemeName": "Axis Bluechip Fund - Direct Plan - Growth"},
+    {"schemeCode": 2, "schemeName": "Axis Bluechip Fund - Regular Plan - IDCW"},
+    {"schemeCode": 3, "schemeName": "Axis Bluechip Fund"},
+    {"schemeCode": 4, "schemeName": "HDFC Flexi Cap Fund - Direct Plan - Growth"},
+    {"schemeCode": 5, "schemeName": "Mirae Asset Large Cap Fund - Direct Plan - Growth"},
+]
+HOUSES = {"1": "Axis Mutual Fund", "2": "Axis Mutual Fund", "3": "Axis Mutual Fund",
+          "4": "HDFC Mutual Fund", "5": "Mirae Asset Mutual Fund"}
+
+
+def codes(result):
+    return [entry["schemeCode"] for entry in result["results"]]
+
+
+def build_index():
+    index = FundSearchIndex()
+    index.update(FUNDS, HOUSES)
+    return index
+
+
+def test_exact_matches_rank_first_then_direct_growth_then_shorter_names():
+    index = build_index()
+    # "bluechip" is exact for 1-3; Direct/Growth earns 1 the plan bonus, 3 is shortest of the rest.
+    assert codes(index.search("axis bluechip")) == [1, 3, 2]
+    # An exact token outranks a prefix match.
+    assert codes(index.search("cap"))[:2] == [4, 5]
+    assert codes(index.search("ca")) == [4, 5]
+
+
+def test_one_letter_typo_still_matches():
+    index = build_index()
+    assert codes(index.search("bluechup")) == [1, 3, 2]
+    assert codes(index.search("hdfc flexy")) == [4]
+
+
+def test_fund_house_filter_keeps_facets_over_all_matches():
+    index = build_index()
+    result = index.search("direct growth", fund_house="Axis Mutual Fund")
+    assert codes(result) == [1]
+    assert result["total"] == 1
+    assert result["facets"] == {"Axis Mutual Fund": 1, "HDFC Mutual Fund": 1, "Mirae Asset Mutual Fund": 1}
+
+
+def test_incremental_update_touches_only_changes():
+    index = build_index()
+    renamed = dict(FUNDS[3], schemeName="HDFC Flexicap Fund - Direct Plan - Growth")
+    refreshed = FUNDS[:2] + [renamed, FUNDS[4], {"schemeCode": 6, "schemeName": "Parag Parikh Flexi Cap Fund"}]
+
+    stats = index.update(refreshed, HOUSES)
+    assert stats == {"added": 1, "updated": 1, "removed": 1}
+    assert len(index) == 5
+    assert codes(index.search("flexicap")) == [4]
+    assert codes(index.search("parag")) == [6]
+    assert codes(index.search("bluechip")) == [1, 2]
+    assert index.update(refreshed, HOUSES) == {"added": 0, "updated": 0, "removed": 0}
+
+
+def test_search_indexes_without_facets_when_the_database_fails(monkeypatch):
+    index = FundSearchIndex()
+    houses = {}
+
+    def get_fund_houses(db):
+        if not houses:
+            raise OperationalError("SELECT", {}, Exception("connection refused"))
+        return houses
+
+    async def get_or_load(key, loader, **kwargs):
+        return FUNDS
+
+    monkeypatch.setattr(recommendations, "fund_search_index", index)
+    monkeypatch.setattr(recommendations, "_indexed_funds", None)
+    monkeypatch.setattr(recommendations, "_fund_houses", {})
+    monkeypatch.setattr(recommendations, "_facets_pending", False)
+    monkeypatch.setattr(recommendations.api_cache, "get_or_load", get_or_load)
+    monkeypatch.setattr(crud.mutual_fund, "get_fund_houses", get_fund_houses)
+
+    response = asyncio.run(recommendations.search_mutual_funds("bluechip"))
+    assert response.data["total"] == 3
+    assert response.data["facets"] == {"fund_house": {}}
+
+    # The same list is re-indexed on the next call once the fund houses load.
+    houses.update(HOUSES)
+    response = asyncio.run(recommendations.search_mutual_funds("bluechip"))
+    assert response.data["facets"] == {"fund_house": {"Axis Mutual Fund": 3}}
+    assert recommendations._facets_pending is False
@@ -0,0 +1,24 @@
+from datetime import date
+
+from app.utils.http_cache import etag_matches, nav_etag, not_modified
+
+
+def test_nav_etag_differs_per_resolution_and_points():
+    nav_date = date(2024, 1, 5)
+    tags = {
+        nav_etag("120716", nav_date, ("raw", 500)),
+        nav_etag("120716", nav_date, ("lttb", 500)),
+        nav_etag("120716", nav_date, ("lttb", 200)),
+        nav_etag("120716", nav_date, ("monthly", 500)),
+    }
+    assert len(tags) == 4
+    assert not etag_matches(nav_etag("120716", nav_date, ("lttb", 500)), nav_etag("120716", nav_date, ("lttb", 200)))
+
+
+def test_not_modified_repeats_the_variant_tag():
+    nav_date = date(2024, 1, 5)
+    etag = nav_etag("120716", nav_date, ("weekly", 500))
+    response = not_modified("120716", nav_date, ("weekly", 500))
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert etag_matches(f'W/{etag}', etag)
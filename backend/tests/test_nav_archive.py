@@ -0,0 +1,77 @@
+import os
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from app import crud
+from app.services import nav_archive
+from app.services.nav_archive import EPOCH, NavArchive, refresh_archive, write_archive
+
+
+class FakeHistory:
+    """mutual_fund_nav_history stand-in: {scheme_code: (days, navs)}."""
+
+    def __init__(self, series):
+        self.series = series
+        self.requested = []
+
+    def summaries(self, db):
+        return {
+            code: (EPOCH + timedelta(days=int(days[-1])), len(days))
+            for code, (days, _) in sorted(self.series.items())
+        }
+
+    def series_from_db(self, db, scheme_codes=None, batch_size=50_000):
+        self.requested.append(sorted(scheme_codes))
+        for code in sorted(scheme_codes):
+            yield (code, *self.series[code])
+
+
+def history(days: int, start_nav: float = 10.0):
+    return np.arange(19000, 19000 + days, dtype=np.int32), start_nav + np.arange(days, dtype=np.float64)
+
+
+@pytest.fixture
+def fake_history(monkeypatch):
+    fake = FakeHistory({"100001": history(30), "100002": history(40, 20.0), "100003": history(50, 30.0)})
+    monkeypatch.setattr(crud.nav_history, "get_summaries", fake.summaries)
+    monkeypatch.setattr(nav_archive, "series_from_db", fake.series_from_db)
+    return fake
+
+
+def test_refresh_archive_reads_only_changed_schemes(fake_history, tmp_path):
+    path = str(tmp_path / "nav_archive.bin")
+    write_archive(path, [(code, *series) for code, series in fake_history.series.items()])
+
+    fake_history.series["100002"] = history(41, 20.0)
+    del fake_history.series["100003"]
+    fake_history.series["100004"] = history(5, 40.0)
+    stats = refresh_archive(path, db=None)
+
+    assert fake_history.requested == [["100002", "100004"]]
+    assert stats["changed"] == 2 and stats["removed"] == 1 and stats["rewritten"]
+    archive = NavArchive(path)
+    assert sorted(archive.scheme_codes()) == ["100001", "100002", "100004"]
+    for code, (days, navs) in fake_history.series.items():
+        np.testing.assert_array_equal(archive.get(code)[0], days)
+        np.testing.assert_array_equal(archive.get(code)[1], navs)
+
+
+def test_refresh_archive_leaves_unchanged_file_alone(fake_history, tmp_path):
+    path = str(tmp_path / "nav_archive.bin")
+    write_archive(path, [(code, *series) for code, series in fake_history.series.items()])
+    before = os.stat(path)
+
+    stats = refresh_archive(path, db=None)
+
+    assert stats == {"schemes": 3, "changed": 0, "removed": 0, "rewritten": False}
+    assert fake_history.requested == []
+    assert os.stat(path).st_mtime_ns == before.st_mtime_ns
+
+
+def test_refresh_archive_builds_missing_file(fake_history, tmp_path):
+    path = str(tmp_path / "nav_archive.bin")
+    stats = refresh_archive(path, db=None)
+    assert stats["schemes"] == 3 and stats["changed"] == 3
+    assert len(NavArchive(path)) == 3
@@ -0,0 +1,48 @@
+import threading
+from datetime import date
+
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+
+
+def journal(db, source, scheme_code):
+    run = crud.nav_change.start_run(db, source=source)
+    crud.nav_change.record(db, run_id=run.id, changes=[{
+        "scheme_code": scheme_code, "old_nav": None, "new_nav": 10.0,
+        "old_nav_date": None, "new_nav_date": date(2024, 1, 5),
+    }])
+    return run
+
+
+def test_concurrent_runs_journal_in_commit_order(db):
+    db.commit()
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    first, second = Session(), Session()
+    second_started = threading.Event()
+    try:
+        journal(first, "amfi", "100001")
+
+        def late_run():
+            second_started.set()
+            journal(second, "add_fund", "100002")
+            second.commit()
+
+        thread = threading.Thread(target=late_run)
+        thread.start()
+        second_started.wait()
+        # The second run waits on the journal lock, so nothing of it is visible yet.
+        thread.join(timeout=0.5)
+        assert thread.is_alive()
+        assert crud.nav_change.get_since(db, cursor=0) == []
+
+        first.commit()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+        changes = crud.nav_change.get_since(db, cursor=0)
+        assert [change.scheme_code for change in changes] == ["100001", "100002"]
+        assert changes[0].id < changes[1].id
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,67 @@
+from datetime import date
+
+from app import crud
+from app.models.mutual_fund_nav_history import MutualFundNavHistory
+from app.services.nav_ingestion import _history_points, _nav_changes, ingest_nav_records
+
+
+def record(code, nav, nav_date):
+    return {
+        "scheme_code": code, "scheme_name": f"Fund {code}", "nav": nav, "nav_date": nav_date,
+        "fund_house": "Test AMC", "category": "Equity", "sub_category": "Large Cap",
+    }
+
+
+def test_nav_changes_journal_only_real_movements():
+    jan4, jan5 = date(2024, 1, 4), date(2024, 1, 5)
+    batch = {
+        "1": record("1", 10.00004, jan4),  # rounds to the stored NAV on the same date
+        "2": record("2", 20.5, jan5),
+        "3": record("3", 30.0, jan5),      # same NAV, new date
+        "4": record("4", 40.0, jan5),      # new scheme
+    }
+    previous = {"1": (10.0, jan4), "2": (20.0, jan4), "3": (30.0, jan4)}
+
+    changes = _nav_changes(batch, previous, list(batch))
+
+    assert [(c["scheme_code"], c["old_nav"], c["new_nav"]) for c in changes] == [
+        ("2", 20.0, 20.5), ("3", 30.0, 30.0), ("4", None, 40.0)
+    ]
+    assert changes[1]["old_nav_date"] == jan4 and changes[1]["new_nav_date"] == jan5
+
+
+def test_history_points_extend_only_contiguous_histories():
+    jan4, jan5 = date(2024, 1, 4), date(2024, 1, 5)
+    batch = {
+        "1": record("1", 10.5, jan5),   # history reaches the previous NAV date
+        "2": record("2", 20.5, jan5),   # no stored history: left to the mfapi backfill
+        "3": record("3", 30.5, jan5),   # history stops before the previous NAV date
+        "4": record("4", 0.0, jan5),    # unusable NAV
+        "5": record("5", 50.5, jan5),   # new to the feed but already backfilled
+    }
+    previous = {"1": (10.0, jan4), "2": (20.0, jan4), "3": (30.0, jan4), "4": (40.0, jan4)}
+    latest = {"1": jan4, "3": date(2024, 1, 2), "4": jan4, "5": jan4}
+
+    points = _history_points(batch, previous, list(batch), latest)
+
+    assert points == [
+        {"scheme_code": "1", "nav_date": jan5, "nav": 10.5},
+        {"scheme_code": "5", "nav_date": jan5, "nav": 50.5},
+    ]
+
+
+def test_ingestion_appends_nav_history_in_the_same_run(db):
+    jan4, jan5 = date(2024, 1, 4), date(2024, 1, 5)
+    ingest_nav_records(db, [record("100001", 10.0, jan4), record("100002", 20.0, jan4)])
+    crud.nav_history.append(db, scheme_code="100001", points=[(date(2024, 1, 3), 9.9), (jan4, 10.0)])
+    db.commit()
+
+    stats = ingest_nav_records(db, [record("100001", 10.5, jan5), record("100002", 20.5, jan5)])
+    # A corrected NAV for the same day replaces the stored point.
+    ingest_nav_records(db, [record("100001", 10.6, jan5)])
+
+    assert stats["history"] == 1
+    assert crud.nav_history.get_range(db, scheme_code="100001") == [
+        (date(2024, 1, 3), 9.9), (jan4, 10.0), (jan5, 10.6)
+    ]
+    assert db.query(MutualFundNavHistory).filter_by(scheme_code="100002").count() == 0
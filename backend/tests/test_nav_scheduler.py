@@ -0,0 +1,135 @@
+import asyncio
+import http.server
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.services import nav_ingestion, nav_scheduler
+from app.services.http_client import MarketDataClient
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "NAVAll.txt")
+
+
+@pytest.fixture
+def feed_server():
+    """Serve the NAVAll.txt fixture over HTTP, counting the downloads."""
+    with open(FIXTURE, "rb") as f:
+        body = f.read()
+    hits = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/NAVAll.txt", hits
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def http_client(monkeypatch):
+    client = MarketDataClient(
+        timeout=5, max_connections=4, per_host_concurrency=2, retries=0,
+        backoff_seconds=0, failure_threshold=5, reset_seconds=30,
+    )
+    monkeypatch.setattr(nav_ingestion, "market_data_client", client)
+    return client
+
+
+@pytest.fixture
+def no_followups(monkeypatch):
+    """Skip the rescoring and snapshot steps that follow a sync."""
+    async def refresh_fund_scores():
+        return {}
+
+    monkeypatch.setattr(nav_scheduler, "refresh_fund_scores", refresh_fund_scores)
+    monkeypatch.setattr(nav_scheduler, "take_portfolio_snapshot", lambda db: {})
+
+
+def run_workers(url, workers, interval):
+    """Run one scheduler tick per worker, one after another as the lock serializes them."""
+    async def ticks():
+        results = [await nav_scheduler.run_nav_refresh(url, min_interval_seconds=interval) for _ in range(workers)]
+        await nav_ingestion.market_data_client.aclose()
+        return results
+    return asyncio.run(ticks())
+
+
+def test_workers_skip_a_refresh_that_ran_within_the_interval(feed_server, http_client, no_followups, monkeypatch):
+    url, hits = feed_server
+    states = {}
+    ingested = []
+
+    class FakeSession:
+        def close(self):
+            pass
+
+    async def acquire():
+        return object()
+
+    async def release(conn):
+        pass
+
+    def load_state(db, state_url):
+        return states.get(state_url) or nav_ingestion.NavFeedState(url=state_url)
+
+    def save_state(db, state):
+        states[state.url] = state
+
+    def ingest(db, body):
+        records = list(nav_ingestion.iter_nav_records(line.decode() for line in body))
+        ingested.append({record["scheme_code"]: record["nav"] for record in records})
+        return {"inserted": len(records)}
+
+    monkeypatch.setattr(nav_scheduler, "acquire_refresh_lock", acquire)
+    monkeypatch.setattr(nav_scheduler, "release_refresh_lock", release)
+    monkeypatch.setattr(nav_scheduler, "SessionLocal", FakeSession)
+    monkeypatch.setattr(nav_scheduler.crud.fund_score, "get_ranked", lambda db, limit: [object()])
+    monkeypatch.setattr(nav_scheduler.crud.portfolio_snapshot, "exists_for", lambda db, snapshot_date: False)
+    monkeypatch.setattr(nav_ingestion, "_load_feed_state", load_state)
+    monkeypatch.setattr(nav_ingestion, "_save_feed_state", save_state)
+    monkeypatch.setattr(nav_ingestion, "_ingest_feed_body", ingest)
+
+    first, *others = run_workers(url, workers=3, interval=3600)
+
+    assert first["status"] == "synced"
+    assert others == [None, None]
+    assert len(hits) == 1
+    assert ingested == [{"120465": 58.42, "120466": 22.15, "120716": 152.3301}]
+
+    # Once the interval has passed the next tick refreshes again.
+    states[url].checked_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    again, = run_workers(url, workers=1, interval=3600)
+    assert again["status"] == "unchanged"
+    assert len(hits) == 2
+
+
+def test_refresh_spacing_is_shared_through_the_database(db, feed_server, http_client, no_followups, monkeypatch):
+    url, hits = feed_server
+    engine = db.get_bind()
+    monkeypatch.setattr(nav_scheduler, "engine", engine)
+    monkeypatch.setattr(nav_scheduler, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+
+    first, second = run_workers(url, workers=2, interval=3600)
+
+    assert first["status"] == "synced"
+    assert first["inserted"] == 3
+    assert second is None
+    assert len(hits) == 1
+    assert nav_ingestion.feed_checked_at(db, url) is not None
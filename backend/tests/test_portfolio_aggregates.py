@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from app import crud
+from app.schemas.models import InvestmentCreate
+
+
+def holding(investment_type, invested, current, fund_name="Test Holding"):
+    return InvestmentCreate(
+        investment_type=investment_type, fund_name=fund_name,
+        invested_amount=Decimal(invested), current_value=Decimal(current),
+    )
+
+
+def totals(db, owner_id):
+    return {
+        row.investment_type: (row.holding_count, row.total_invested, row.total_current)
+        for row in crud.portfolio_aggregate.get_by_owner(db, owner_id=owner_id)
+    }
+
+
+def assert_matches_recompute(db, owner_id):
+    assert crud.portfolio_aggregate.find_drift(db, owner_id=owner_id) == []
+    incremental = totals(db, owner_id)
+    crud.portfolio_aggregate.rebuild(db, owner_id=owner_id)
+    assert totals(db, owner_id) == incremental
+    db.rollback()
+
+
+def test_aggregates_follow_create_update_and_remove(db, owner):
+    stock = crud.investment.create_with_owner(db, obj_in=holding("stock", "1000", "1100"), owner_id=owner.id)
+    fund = crud.investment.create_with_owner(db, obj_in=holding("mutual_fund", "5000", "5200"), owner_id=owner.id)
+    crud.investment.create_with_owner(db, obj_in=holding("stock", "300.50", "290.25"), owner_id=owner.id)
+    assert totals(db, owner.id) == {
+        "mutual_fund": (1, Decimal("5000.00"), Decimal("5200.00")),
+        "stock": (2, Decimal("1300.50"), Decimal("1390.25")),
+    }
+    assert_matches_recompute(db, owner.id)
+
+    crud.investment.update(db, db_obj=stock, obj_in={"current_value": Decimal("1250")})
+    assert_matches_recompute(db, owner.id)
+
+    # A type change moves the holding's figures between two aggregate rows.
+    crud.investment.update(db, db_obj=fund, obj_in={"investment_type": "fixed_deposit", "invested_amount": Decimal("4000")})
+    assert totals(db, owner.id)["fixed_deposit"] == (1, Decimal("4000.00"), Decimal("5200.00"))
+    assert "mutual_fund" not in totals(db, owner.id)
+    assert_matches_recompute(db, owner.id)
+
+    crud.investment.remove(db, id=stock.id)
+    assert totals(db, owner.id)["stock"] == (1, Decimal("300.50"), Decimal("290.25"))
+    assert_matches_recompute(db, owner.id)
+
+    crud.investment.remove(db, id=fund.id)
+    assert "fixed_deposit" not in totals(db, owner.id)
+    assert_matches_recompute(db, owner.id)
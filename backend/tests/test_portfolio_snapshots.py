@@ -0,0 +1,19 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from app import crud
+from app.schemas.models import InvestmentCreate
+from app.services.portfolio_history import snapshot_date_today, take_portfolio_snapshot
+
+
+def test_exists_for_checks_only_the_given_day(db, owner):
+    crud.investment.create_with_owner(db, obj_in=InvestmentCreate(
+        investment_type="stock", fund_name="Test Ltd", invested_amount=Decimal("100"), current_value=Decimal("110"),
+    ), owner_id=owner.id)
+    today = snapshot_date_today()
+    assert not crud.portfolio_snapshot.exists_for(db, snapshot_date=today)
+
+    take_portfolio_snapshot(db)
+
+    assert crud.portfolio_snapshot.exists_for(db, snapshot_date=today)
+    assert not crud.portfolio_snapshot.exists_for(db, snapshot_date=today - timedelta(days=1))
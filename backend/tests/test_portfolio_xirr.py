@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.models import InvestmentTransactionCreate
+from app.services.portfolio_xirr import compute_portfolio_xirr
+from app.services.xirr import xirr
+
+AS_OF = date(2024, 12, 31)
+
+HOLDINGS = [
+    (1, "mutual_fund", 13000.0),
+    (2, "mutual_fund", 5200.0),
+    (3, "stock", 0.0),
+    (4, "stock", 9000.0),
+]
+CASH_FLOWS = [
+    (1, date(2023, 1, 10), -5000.0),
+    (1, date(2023, 7, 10), -5000.0),
+    (1, date(2024, 2, 1), 1500.0),
+    (2, date(2024, 3, 5), -3000.0),
+    (2, date(2024, 3, 5), -2000.0),
+    (2, AS_OF, -500.0),
+    # Fully sold: bought, then redeemed everything.
+    (3, date(2023, 5, 2), -4000.0),
+    (3, date(2024, 8, 20), 4700.0),
+]
+
+
+def reference_pct(holding_ids):
+    """XIRR (%) of the ledger flows of `holding_ids` plus their current values on AS_OF."""
+    flows = [(d, a) for hid, d, a in CASH_FLOWS if hid in holding_ids]
+    flows += [(AS_OF, value) for hid, _, value in HOLDINGS if hid in holding_ids]
+    return xirr([d for d, _ in flows], [a for _, a in flows]) * 100
+
+
+def test_each_holding_matches_xirr_of_its_own_ledger():
+    result = compute_portfolio_xirr(HOLDINGS, CASH_FLOWS, AS_OF)
+    assert result["as_of"] == AS_OF
+    for holding_id in (1, 2, 3):
+        assert result["holdings"][holding_id] == pytest.approx(reference_pct({holding_id}), abs=1e-6)
+
+
+def test_types_and_portfolio_match_xirr_of_combined_ledgers():
+    result = compute_portfolio_xirr(HOLDINGS, CASH_FLOWS, AS_OF)
+    assert result["by_type"]["mutual_fund"] == pytest.approx(reference_pct({1, 2}), abs=1e-6)
+    assert result["by_type"]["stock"] == pytest.approx(reference_pct({3}), abs=1e-6)
+    assert result["portfolio"] == pytest.approx(reference_pct({1, 2, 3}), abs=1e-6)
+
+
+def test_same_day_flows_are_netted():
+    split = compute_portfolio_xirr(HOLDINGS, CASH_FLOWS, AS_OF)
+    merged_flows = [f for f in CASH_FLOWS if not (f[0] == 2 and f[1] == date(2024, 3, 5))]
+    merged_flows.append((2, date(2024, 3, 5), -5000.0))
+    merged = compute_portfolio_xirr(HOLDINGS, merged_flows, AS_OF)
+    assert split["holdings"][2] == pytest.approx(merged["holdings"][2], abs=1e-9)
+
+
+def test_flow_dated_on_as_of_nets_with_the_current_value():
+    # Holding 2 tops up 500 on AS_OF: the valuation that day is effectively 4700.
+    result = compute_portfolio_xirr(HOLDINGS, CASH_FLOWS, AS_OF)
+    expected = xirr([date(2024, 3, 5), AS_OF], [-5000.0, 4700.0]) * 100
+    assert result["holdings"][2] == pytest.approx(expected, abs=1e-6)
+
+
+def test_fully_sold_holding_uses_its_realised_flows():
+    result = compute_portfolio_xirr(HOLDINGS, CASH_FLOWS, AS_OF)
+    expected = xirr([date(2023, 5, 2), date(2024, 8, 20)], [-4000.0, 4700.0]) * 100
+    assert result["holdings"][3] == pytest.approx(expected, abs=1e-6)
+
+
+def test_holdings_without_ledger_entries_are_left_out():
+    result = compute_portfolio_xirr(HOLDINGS, CASH_FLOWS, AS_OF)
+    assert 4 not in result["holdings"]
+    # Holding 4's 9000 valuation would otherwise inflate the stock and portfolio returns.
+    assert result["by_type"]["stock"] == pytest.approx(reference_pct({3}), abs=1e-6)
+
+
+def test_empty_ledger_has_no_xirr():
+    assert compute_portfolio_xirr(HOLDINGS, [], AS_OF) == {
+        "as_of": AS_OF, "portfolio": None, "by_type": {}, "holdings": {},
+    }
+
+
+def test_transaction_date_cannot_be_in_the_future():
+    with pytest.raises(ValidationError):
+        InvestmentTransactionCreate(
+            transaction_type="buy", transaction_date=date.today() + timedelta(days=2), amount=1000,
+        )
+    created = InvestmentTransactionCreate(transaction_type="buy", transaction_date=date.today(), amount=1000)
+    assert created.transaction_date == date.today()
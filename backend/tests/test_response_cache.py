@@ -0,0 +1,22 @@
+import os
+import time
+
+from app.services.response_cache import CacheEntry, TieredCache
+
+
+def entry(value):
+    now = time.time()
+    return CacheEntry(value, 0, now, now + 60, now + 120)
+
+
+def disk_usage(directory):
+    return sum(e.stat().st_size for e in os.scandir(directory) if e.name.endswith(".json"))
+
+
+def test_overwriting_a_key_does_not_double_count_disk_usage(tmp_path):
+    cache = TieredCache(str(tmp_path), max_memory_bytes=1 << 20, max_disk_bytes=1 << 20)
+    cache._write_disk("a", entry("x" * 1000))
+    cache._write_disk("b", entry("y" * 10))
+    for size in (2000, 500, 500):
+        cache._write_disk("a", entry("x" * size))
+        assert cache._disk_bytes == disk_usage(tmp_path)
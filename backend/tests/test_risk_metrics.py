@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.services.nav_series import NavSeries
+from app.services.risk_metrics import (
+    MIN_OBSERVATIONS, TRADING_DAYS_PER_YEAR, build_nav_matrix, compute_risk_metrics, risk_metric_rows,
+)
+
+START_DAY = 19000
+
+
+def series_from_returns(code, returns, start_nav=100.0):
+    navs = start_nav * np.cumprod(np.concatenate(([1.0], 1 + returns)))
+    return NavSeries(np.arange(START_DAY, START_DAY + len(navs), dtype=np.int32), navs, code)
+
+
+@pytest.fixture
+def benchmark_returns():
+    return np.random.default_rng(3).normal(0.0004, 0.01, 300)
+
+
+def test_volatility_and_return_match_a_scalar_computation(benchmark_returns):
+    fund = series_from_returns("A", benchmark_returns)
+    [row] = risk_metric_rows([fund], lookback_years=5, risk_free_rate=0.05)
+
+    returns = fund.navs[1:] / fund.navs[:-1] - 1
+    annual = returns.mean() * TRADING_DAYS_PER_YEAR
+    volatility = returns.std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+    assert row["annualized_return"] == pytest.approx(annual * 100)
+    assert row["volatility"] == pytest.approx(volatility * 100)
+    assert row["sharpe_ratio"] == pytest.approx((annual - 0.05) / volatility)
+    assert row["beta"] is None and row["benchmark_code"] is None
+
+
+def test_leveraged_fund_has_beta_two_against_its_benchmark(benchmark_returns):
+    benchmark = series_from_returns("BENCH", benchmark_returns)
+    index_fund = series_from_returns("INDEX", benchmark_returns)
+    leveraged = series_from_returns("LEV", 2 * benchmark_returns)
+
+    rows = risk_metric_rows([index_fund, leveraged], benchmark=benchmark, lookback_years=5, risk_free_rate=0.05)
+
+    assert rows[0]["beta"] == pytest.approx(1.0)
+    assert rows[0]["alpha"] == pytest.approx(0.0, abs=1e-9)
+    assert rows[0]["tracking_error"] == pytest.approx(0.0, abs=1e-9)
+    assert rows[1]["beta"] == pytest.approx(2.0)
+    assert rows[1]["benchmark_code"] == "BENCH"
+
+
+def test_max_drawdown_and_recovery():
+    # Climb to 120, fall to 90 (-25%), then regain 120 forty days after the trough.
+    navs = np.concatenate([np.linspace(100, 120, 40), np.linspace(119, 90, 30), np.linspace(91, 130, 50)])
+    grid = np.arange(START_DAY, START_DAY + len(navs))
+    metrics = compute_risk_metrics(navs[:, None], grid)
+
+    trough = int(np.argmin(navs))
+    recovered = trough + int(np.argmax(navs[trough:] >= 120))
+    assert metrics["max_drawdown"][0] == pytest.approx(-25.0)
+    assert metrics["max_drawdown_recovery_days"][0] == recovered - trough
+
+
+def test_too_few_observations_report_nothing(benchmark_returns):
+    short = series_from_returns("NEW", benchmark_returns[:MIN_OBSERVATIONS - 2])
+    [row] = risk_metric_rows([short], lookback_years=5)
+    assert all(row[name] is None for name in ("volatility", "sharpe_ratio", "max_drawdown"))
+
+
+def test_nav_matrix_carries_forward_and_leaves_leading_gaps():
+    early = NavSeries(np.asarray([10, 12, 15], dtype=np.int32), np.asarray([1.0, 2.0, 3.0]), "E")
+    late = NavSeries(np.asarray([13, 14], dtype=np.int32), np.asarray([5.0, 6.0]), "L")
+    matrix = build_nav_matrix([early, late], np.arange(10, 16))
+    np.testing.assert_array_equal(matrix[:, 0], [1, 1, 2, 2, 2, 3])
+    np.testing.assert_array_equal(matrix[:, 1], [np.nan, np.nan, np.nan, 5, 6, 6])
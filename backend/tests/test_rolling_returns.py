@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmark_rolling_returns import legacy_rolling_returns, synthetic_history
+from app.services.nav_series import TRAILING_PERIODS, NavSeries
+from app.services.rolling_returns import ROLLING_WINDOWS_YEARS, parse_mfapi_series, rolling_return_stats
+
+
+def legacy_trailing_return(nav_data, period):
+    """The removed recommendations.calculate_trailing_return: a linear scan for the closest NAV."""
+    def parse(entry):
+        return datetime.strptime(entry["date"], "%d-%m-%Y")
+
+    sorted_data = sorted(nav_data, key=parse)
+    latest_date, latest_nav = parse(sorted_data[-1]), float(sorted_data[-1]["nav"])
+    first_date = parse(sorted_data[0])
+    lookback = TRAILING_PERIODS[period]
+    target_date = first_date if lookback is None else latest_date - timedelta(days=lookback)
+    if lookback is not None and (latest_date - first_date).days < lookback:
+        return None
+    closest, min_diff = None, float("inf")
+    for entry in sorted_data:
+        diff = abs((parse(entry) - target_date).days)
+        if diff < min_diff:
+            closest, min_diff = entry, diff
+    start_nav = float(closest["nav"])
+    days_diff = (latest_date - parse(closest)).days
+    if days_diff == 0:
+        return 0.0
+    if days_diff >= 365:
+        return ((latest_nav / start_nav) ** (365 / days_diff) - 1) * 100
+    return (latest_nav - start_nav) / start_nav * 100
+
+
+@pytest.fixture(scope="module")
+def nav_data():
+    return synthetic_history(9, seed=11)
+
+
+def test_rolling_means_match_the_legacy_loop(nav_data):
+    stats = rolling_return_stats(*parse_mfapi_series(nav_data))
+    for years in ROLLING_WINDOWS_YEARS:
+        assert stats[f"{years}Y"]["mean"] == pytest.approx(legacy_rolling_returns(nav_data, years), rel=1e-9)
+
+
+def test_windows_longer_than_the_history_are_empty(nav_data):
+    stats = rolling_return_stats(*parse_mfapi_series(nav_data[:400]))
+    assert stats["1Y"] is not None
+    assert stats["3Y"] is None and legacy_rolling_returns(nav_data[:400], 3) == 0.0
+
+
+def test_rolling_stats_are_consistent(nav_data):
+    stats = rolling_return_stats(*parse_mfapi_series(nav_data))["3Y"]
+    assert stats["min"] <= stats["p5"] <= stats["p25"] <= stats["median"] <= stats["p75"] <= stats["p95"] <= stats["max"]
+    assert 0 <= stats["share_above"]["15"] <= stats["share_above"]["0"] <= 100
+
+
+def test_trailing_returns_match_the_legacy_loop(nav_data):
+    returns = NavSeries.from_mfapi(nav_data).trailing_returns()
+    for period in TRAILING_PERIODS:
+        expected = legacy_trailing_return(nav_data, period)
+        assert returns[period] == pytest.approx(expected, rel=1e-9), period
+
+
+def test_trailing_returns_on_a_short_history(nav_data):
+    short = nav_data[:30]
+    returns = NavSeries.from_mfapi(short).trailing_returns()
+    for period in TRAILING_PERIODS:
+        assert returns[period] == pytest.approx(legacy_trailing_return(short, period)), period
+    assert returns["1Y"] is None
+    assert NavSeries.from_mfapi([]).trailing_returns() == {period: None for period in TRAILING_PERIODS}
@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.nav_series import NavSeries, to_day_number
+from app.services.sip_backtest import backtest_sip, rolling_sip_backtest
+from app.services.xirr import xirr, xirr_batch
+
+
+def reference_xirr(dates, amounts, low=-0.99, high=10.0):
+    """Spreadsheet XIRR (actual/365 from the first flow), solved by plain bisection."""
+    def xnpv(rate):
+        return sum(amount / (1 + rate) ** ((d - dates[0]).days / 365.0) for d, amount in zip(dates, amounts))
+
+    for _ in range(200):
+        mid = (low + high) / 2
+        if (xnpv(mid) > 0) == (xnpv(low) > 0):
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def weekday_series(start, end, nav_for):
+    """Weekday-only NAV series (no NAVs on weekends) with nav_for(date) as the NAV."""
+    dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    dates = [d for d in dates if d.weekday() < 5]
+    days = np.asarray([to_day_number(d) for d in dates], dtype=np.int32)
+    return NavSeries(days, np.asarray([nav_for(d) for d in dates], dtype=np.float64), "TEST")
+
+
+def test_xirr_matches_spreadsheet_example():
+    dates = [date(2008, 1, 1), date(2008, 3, 1), date(2008, 10, 30), date(2009, 2, 15), date(2009, 4, 1)]
+    amounts = [-10000, 2750, 4250, 3250, 2750]
+    assert xirr(dates, amounts) == pytest.approx(0.373362535, abs=1e-8)
+    assert xirr(dates, amounts) == pytest.approx(reference_xirr(dates, amounts), abs=1e-8)
+
+
+def test_xirr_batch_matches_reference_on_irregular_schedules():
+    rng = np.random.default_rng(7)
+    schedules = []
+    for growth in (-0.3, -0.05, 0.0, 0.08, 0.25, 1.5):
+        gaps = rng.integers(20, 45, size=11)
+        dates = [date(2020, 1, 1)]
+        for gap in gaps:
+            dates.append(dates[-1] + timedelta(days=int(gap)))
+        amounts = [-1000.0] * 11 + [11000.0 * (1 + growth)]
+        schedules.append((dates, amounts))
+
+    years = np.asarray([[(d - dates[0]).days / 365.0 for d in dates] for dates, _ in schedules])
+    amounts = np.asarray([amounts for _, amounts in schedules])
+    rates = xirr_batch(amounts, years)
+
+    for rate, (dates, flows) in zip(rates, schedules):
+        assert rate == pytest.approx(reference_xirr(dates, flows), abs=1e-7)
+
+
+def test_xirr_without_sign_change_has_no_solution():
+    assert xirr([date(2024, 1, 1), date(2024, 6, 1)], [-100, -100]) is None
+
+
+def test_backtest_sip_hand_computed_schedule():
+    month_nav = {1: 10.0, 2: 12.5, 3: 8.0, 4: 10.0}
+    series = weekday_series(date(2024, 1, 1), date(2024, 4, 30), lambda d: month_nav[d.month])
+
+    # The 3rd of Feb and Mar 2024 fall on weekends, so those instalments buy on the Monday after.
+    result = backtest_sip(series, 1000, start=date(2024, 1, 1), end=date(2024, 4, 10), sip_day=3)
+
+    assert [row["date"] for row in result["schedule"]] == [
+        date(2024, 1, 3), date(2024, 2, 5), date(2024, 3, 4), date(2024, 4, 3)
+    ]
+    assert [row["units"] for row in result["schedule"]] == pytest.approx([100, 80, 125, 100])
+    assert result["instalments"] == 4
+    assert result["total_invested"] == 4000
+    assert result["total_units"] == pytest.approx(405)
+    assert result["valuation_date"] == date(2024, 4, 10)
+    assert result["final_value"] == pytest.approx(4050)
+    assert result["absolute_return"] == pytest.approx(1.25)
+
+    flow_dates = [row["date"] for row in result["schedule"]] + [date(2024, 4, 10)]
+    expected = reference_xirr(flow_dates, [-1000] * 4 + [4050]) * 100
+    assert result["xirr"] == pytest.approx(expected, abs=1e-6)
+
+
+def test_quarterly_backtest_skips_the_months_in_between():
+    series = weekday_series(date(2024, 1, 1), date(2024, 12, 31), lambda d: 10.0 + d.month)
+    result = backtest_sip(series, 3000, frequency="quarterly", start=date(2024, 1, 1), end=date(2024, 12, 31))
+    assert [row["date"] for row in result["schedule"]] == [
+        date(2024, 1, 1), date(2024, 4, 1), date(2024, 7, 1), date(2024, 10, 1)
+    ]
+    assert result["total_units"] == pytest.approx(3000 / 11 + 3000 / 14 + 3000 / 17 + 3000 / 20)
+
+
+def test_rolling_sip_matches_hand_computed_starts():
+    def month_index(d):
+        return (d.year - 2023) * 12 + d.month - 1
+
+    navs = 10 * 1.01 ** np.arange(15) * (1 + 0.05 * np.sin(np.arange(15)))
+    series = weekday_series(date(2023, 1, 2), date(2024, 3, 29), lambda d: navs[month_index(d)])
+
+    [result] = rolling_sip_backtest([series], 1000, duration_years=1, include_points=True)
+
+    # Starts run from the first full month (Feb 2023) while 12 instalments
+    # plus the valuation month still fit: Feb and Mar 2023.
+    assert result["start_dates"] == 2
+    for point, first_month in zip(result["points"], (1, 2)):
+        purchases = []
+        for m in range(first_month, first_month + 12):
+            day = date(2023 + m // 12, m % 12 + 1, 1)
+            while day.weekday() >= 5:
+                day += timedelta(days=1)
+            purchases.append(day)
+        valuation = date(2023 + (first_month + 12) // 12, (first_month + 12) % 12 + 1, 1)
+        while valuation.weekday() >= 5:
+            valuation -= timedelta(days=1)
+        units = sum(1000 / navs[month_index(d)] for d in purchases)
+        final_value = units * navs[month_index(valuation)]
+
+        assert point["start_date"] == purchases[0]
+        assert point["final_value"] == pytest.approx(final_value)
+        expected = reference_xirr(purchases + [valuation], [-1000] * 12 + [final_value]) * 100
+        assert point["xirr"] == pytest.approx(expected, abs=1e-6)
+    assert result["total_invested"] == 12000
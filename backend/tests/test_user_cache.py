@@ -0,0 +1,44 @@
+from datetime import date
+from decimal import Decimal
+
+from app import crud
+from app.schemas.models import InvestmentCreate, InvestmentTransactionCreate
+from app.services.user_cache import UserResultCache
+
+
+def test_newer_version_misses_without_local_invalidation():
+    # Two workers' caches: only the one that handled the write was invalidated.
+    cache = UserResultCache(ttl_seconds=300, max_users=10)
+    computed = []
+
+    def compute():
+        computed.append(len(computed))
+        return {"call": len(computed)}
+
+    assert cache.get_or_compute(1, compute, version=3) == {"call": 1}
+    assert cache.get_or_compute(1, compute, version=3) == {"call": 1}
+    assert cache.get_or_compute(1, compute, version=4) == {"call": 2}
+    assert cache.get(1, version=3) is None
+    assert len(computed) == 2
+
+
+def test_writes_bump_the_owner_data_version(db, owner):
+    version = lambda: crud.user_data_version.get_version(db, owner_id=owner.id)  # noqa: E731
+    assert version() == 0
+
+    holding = crud.investment.create_with_owner(db, obj_in=InvestmentCreate(
+        investment_type="stock", fund_name="Test Ltd", invested_amount=Decimal("100"), current_value=Decimal("110"),
+    ), owner_id=owner.id)
+    assert version() == 1
+
+    crud.investment.update(db, db_obj=holding, obj_in={"current_value": Decimal("120")})
+    assert version() == 2
+
+    transaction = crud.investment_transaction.create_for_investment(db, obj_in=InvestmentTransactionCreate(
+        transaction_type="buy", transaction_date=date(2024, 1, 5), amount=Decimal("100"),
+    ), investment=holding)
+    assert version() == 3
+
+    crud.investment_transaction.remove(db, id=transaction.id)
+    crud.investment.remove(db, id=holding.id)
+    assert version() == 5
@@ -23,6 +23,14 @@ export class RecommendationsService {
         return this.apiService.get<any>(`${this.BASE_URL}/search?query=${query}&limit=${limit}&offset=${offset}`);
     }
 
+    compareFunds(schemeCodes: string[], startDate?: string, endDate?: string): Observable<any> {
+        return this.apiService.post<any>(`${this.BASE_URL}/compare`, {
+            scheme_codes: schemeCodes,
+            start_date: startDate ?? null,
+            end_date: endDate ?? null
+        });
+    }
+
     getMultipleFundDetails(schemeCodes: string[]): Observable<any[]> {
         const requests = schemeCodes.map(code => this.getFundDetails(code));
         return forkJoin(requests);